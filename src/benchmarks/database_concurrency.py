@@ -0,0 +1,127 @@
+"""
+Performance Sheet Repository Concurrency Benchmark
+
+Runs many concurrent readers and writers against PerformanceSheetRepository on
+a local SQLite file standing in for the postgres server, and against the old
+design of one Session shared by every caller (serialized with a lock, since a
+Session is not thread-safe). SQLite answers in-process, so --latency-ms adds a
+sleep per statement for the network round trip to the server.
+
+Run from src:
+    python -m benchmarks.database_concurrency
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import event
+
+from utils.database import PerformanceSheet, PerformanceSheetRepository
+
+class SharedSessionRepository(PerformanceSheetRepository):
+    """The previous repository: every operation goes through one long-lived Session."""
+    def __init__(self, url):
+        super().__init__(url=url)
+        self.session = self.Session()
+        self.lock = threading.Lock()
+
+    def get(self, reference_number):
+        with self.lock:
+            record = self.session.query(PerformanceSheet).filter_by(referenceNumber=reference_number).first()
+            return self._to_dict(record) if record else None
+
+    def upsert(self, reference_number, data):
+        with self.lock:
+            try:
+                record = self.session.query(PerformanceSheet).filter_by(referenceNumber=reference_number).first()
+                if record:
+                    record.data = {**record.data, **data}
+                else:
+                    record = PerformanceSheet(referenceNumber=reference_number, data=data)
+                    self.session.add(record)
+                self.session.commit()
+            except Exception:
+                self.session.rollback()
+                raise
+            return self._to_dict(record)
+
+def add_latency(engine, latency):
+    """Sleep before every statement, as a round trip to a remote server would."""
+    @event.listens_for(engine, "before_cursor_execute")
+    def wait(*args):
+        time.sleep(latency)
+
+    # WAL lets readers proceed while a writer holds the file, as postgres does
+    @event.listens_for(engine, "connect")
+    def set_wal(dbapi_connection, connection_record):
+        dbapi_connection.execute("PRAGMA journal_mode=WAL")
+
+def get_reference_number(i):
+    return f"BENCH-{i:06d}"
+
+def seed(repo, sheets):
+    for i in range(sheets):
+        repo.upsert(get_reference_number(i), {"index": i, "fpm": 0})
+
+def run_worker(repo, operations, sheets, write_fraction, seed_value):
+    """Run a mix of get and upsert calls; returns (operations, errors)."""
+    rng = random.Random(seed_value)
+    errors = 0
+    for _ in range(operations):
+        reference_number = get_reference_number(rng.randrange(sheets))
+        try:
+            if rng.random() < write_fraction:
+                repo.upsert(reference_number, {"fpm": rng.random()})
+            else:
+                repo.get(reference_number)
+        except Exception:
+            errors += 1
+    return operations, errors
+
+def run(repo, threads, operations, sheets, write_fraction):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        results = list(executor.map(
+            lambda i: run_worker(repo, operations, sheets, write_fraction, i), range(threads)
+        ))
+    elapsed = time.perf_counter() - start
+    total = sum(count for count, _ in results)
+    return total / elapsed, sum(errors for _, errors in results)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4, 16, 32])
+    parser.add_argument("--operations", type=int, default=200, help="operations per thread")
+    parser.add_argument("--sheets", type=int, default=500)
+    parser.add_argument("--write-fraction", type=float, default=0.2)
+    parser.add_argument("--latency-ms", type=float, default=1.0, help="simulated round trip per statement")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite:///{os.path.join(directory, 'sheets.db')}"
+        repo = PerformanceSheetRepository(url=url)
+        repo.create_schema()
+        seed(repo, args.sheets)
+        shared = SharedSessionRepository(url)
+        for engine in (repo.engine, shared.engine):
+            add_latency(engine, args.latency_ms / 1000)
+
+        print(f"{args.sheets} sheets, {args.operations} operations per thread, {args.write_fraction:.0%} writes, "
+              f"{args.latency_ms} ms per statement")
+        print(f"{'threads':>8} {'pooled ops/s':>14} {'errors':>7} {'shared ops/s':>14} {'errors':>7}")
+        for threads in args.threads:
+            pooled_rate, pooled_errors = run(repo, threads, args.operations, args.sheets, args.write_fraction)
+            shared_rate, shared_errors = run(shared, threads, args.operations, args.sheets, args.write_fraction)
+            print(f"{threads:>8} {pooled_rate:>14.0f} {pooled_errors:>7} {shared_rate:>14.0f} {shared_errors:>7}")
+
+        shared.session.close()
+        shared.dispose()
+        repo.dispose()
+
+if __name__ == "__main__":
+    main()
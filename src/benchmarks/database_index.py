@@ -0,0 +1,90 @@
+"""
+Reference Number Index Benchmark
+
+Loads a performance_sheets table without the referenceNumber index (as tables
+created before it were), times get, create and delete, migrates the table with
+migrate_reference_number_index, then times them again. Runs on a local SQLite
+file standing in for the postgres server.
+
+Run from src:
+    python -m benchmarks.database_index
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import uuid
+from datetime import datetime
+
+from sqlalchemy import text
+
+from utils.database import PerformanceSheet, PerformanceSheetRepository, REFERENCE_NUMBER_INDEX
+
+LOAD_BATCH_SIZE = 50000
+
+def get_reference_number(i):
+    return f"SHEET-{i:07d}"
+
+def load_legacy_table(repo, rows):
+    """Create the table, drop the index and bulk load rows sheets."""
+    repo.create_schema()
+    table = PerformanceSheet.__table__
+    now = datetime.now()
+    with repo.engine.begin() as connection:
+        connection.execute(text(f'DROP INDEX "{REFERENCE_NUMBER_INDEX}"'))
+        for start in range(0, rows, LOAD_BATCH_SIZE):
+            connection.execute(table.insert(), [
+                {"id": str(uuid.uuid4()), "referenceNumber": get_reference_number(i), "data": {"index": i},
+                 "createdAt": now, "updatedAt": now}
+                for i in range(start, min(start + LOAD_BATCH_SIZE, rows))
+            ])
+
+def time_operations(repo, rows, lookups, label):
+    """Average get, create and delete times in ms; the created sheets are deleted again."""
+    step = max(rows // lookups, 1)
+    timings = {}
+
+    start = time.perf_counter()
+    for i in range(0, rows, step)[:lookups]:
+        repo.get(get_reference_number(i))
+    timings["get"] = (time.perf_counter() - start) / lookups
+
+    new_numbers = [f"NEW-{label}-{i}" for i in range(lookups)]
+    start = time.perf_counter()
+    for reference_number in new_numbers:
+        repo.create(reference_number, {"new": True})
+    timings["create"] = (time.perf_counter() - start) / lookups
+
+    start = time.perf_counter()
+    for reference_number in new_numbers:
+        repo.delete(reference_number)
+    timings["delete"] = (time.perf_counter() - start) / lookups
+    return {operation: seconds * 1000 for operation, seconds in timings.items()}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--lookups", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        repo = PerformanceSheetRepository(url=f"sqlite:///{os.path.join(directory, 'sheets.db')}")
+        start = time.perf_counter()
+        load_legacy_table(repo, args.rows)
+        print(f"loaded {args.rows} sheets in {time.perf_counter() - start:.1f} s")
+
+        before = time_operations(repo, args.rows, args.lookups, "before")
+        start = time.perf_counter()
+        repo.migrate()
+        print(f"migrated in {time.perf_counter() - start:.1f} s")
+        after = time_operations(repo, args.rows, args.lookups, "after")
+
+        print(f"{'operation':>10} {'no index ms':>12} {'index ms':>10} {'speedup':>8}")
+        for operation in before:
+            print(f"{operation:>10} {before[operation]:>12.3f} {after[operation]:>10.3f} "
+                  f"{before[operation] / after[operation]:>7.0f}x")
+        repo.dispose()
+
+if __name__ == "__main__":
+    main()
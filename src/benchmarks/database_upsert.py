@@ -0,0 +1,66 @@
+"""
+Performance Sheet Bulk Upsert Benchmark
+
+Times a nightly-import style load of sheets, first as inserts and then as
+updates, through one upsert call per sheet and through upsert_many, on a local
+SQLite file (which takes the merge fallback). --latency-ms adds a sleep per
+statement for the round trip to a remote server.
+
+Run from src:
+    python -m benchmarks.database_upsert
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.database_concurrency import add_latency
+from utils.database import UPSERT_BATCH_SIZE, PerformanceSheetRepository
+
+def get_records(sheets, revision):
+    return [
+        (f"IMPORT-{i:06d}", {"revision": revision, "customer": f"Customer {i % 97}", "fpm": i * 0.5})
+        for i in range(sheets)
+    ]
+
+def time_load(load, records):
+    start = time.perf_counter()
+    load(records)
+    return len(records) / (time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sheets", type=int, default=5000)
+    parser.add_argument("--batch-size", type=int, default=UPSERT_BATCH_SIZE)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="simulated round trip per statement")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        single = PerformanceSheetRepository(url=f"sqlite:///{os.path.join(directory, 'single.db')}")
+        bulk = PerformanceSheetRepository(url=f"sqlite:///{os.path.join(directory, 'bulk.db')}")
+        for repo in (single, bulk):
+            repo.create_schema()
+            if args.latency_ms:
+                add_latency(repo.engine, args.latency_ms / 1000)
+
+        def upsert_each(records):
+            for reference_number, data in records:
+                single.upsert(reference_number, data)
+
+        def upsert_many(records):
+            bulk.upsert_many(records, batch_size=args.batch_size)
+
+        print(f"{args.sheets} sheets, batches of {args.batch_size}, {args.latency_ms} ms per statement")
+        print(f"{'load':>8} {'upsert sheets/s':>16} {'upsert_many sheets/s':>21} {'speedup':>8}")
+        for load, revision in (("insert", 1), ("update", 2)):
+            records = get_records(args.sheets, revision)
+            each_rate = time_load(upsert_each, records)
+            many_rate = time_load(upsert_many, records)
+            print(f"{load:>8} {each_rate:>16.0f} {many_rate:>21.0f} {many_rate / each_rate:>7.1f}x")
+
+        single.dispose()
+        bulk.dispose()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Hydraulic Shear Sweep Benchmark
+
+Times calculate_hyd_shear_grid over a bore x rod x pressure x stroke x rake x
+down stroke time grid for single rake and bow tie shears, and checks sampled
+points against calculate_hyd_shear.
+
+Run from src:
+    python -m benchmarks.hyd_shear_sweep
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from models import hyd_shear_input
+from services.hyd_shear_calculations import calculate_hyd_shear
+from services.hyd_shear_vectorized import SPEC_TYPES, calculate_hyd_shear_grid
+
+BASE_INPUT = hyd_shear_input(
+    max_material_thickness=0.25,
+    material_thickness=0.25,
+    coil_width=48,
+    material_tensile=60000,
+    rake_of_blade=0.5,
+    overlap=0.06,
+    blade_opening=0.5,
+    percent_of_penetration=0.38,
+    bore_size=5,
+    rod_dia=2,
+    stroke=4,
+    pressure=2500,
+    time_for_down_stroke=0.5,
+    dwell_time=0.5,
+)
+
+def get_axes(points):
+    """Six grid axes of points values each."""
+    return (
+        np.linspace(2, 12, points),        # bore size
+        np.linspace(0.5, 4, points),       # rod diameter
+        np.linspace(1000, 3000, points),   # pressure
+        np.linspace(2, 10, points),        # stroke
+        np.linspace(0.25, 1.5, points),    # rake of blade
+        np.linspace(0.2, 2, points),       # time for down stroke
+    )
+
+def count_mismatches(spec_type, axes, results, samples, rng):
+    """Compare randomly sampled grid points to calculate_hyd_shear."""
+    mismatches = 0
+    for _ in range(samples):
+        index = tuple(rng.integers(len(axis)) for axis in axes)
+        bore_size, rod_dia, pressure, stroke, rake_of_blade, time_for_down_stroke = (float(axis[i]) for axis, i in zip(axes, index))
+        if bore_size <= rod_dia:
+            continue
+        expected = calculate_hyd_shear(BASE_INPUT.copy(update={
+            "bore_size": bore_size, "rod_dia": rod_dia, "pressure": pressure, "stroke": stroke,
+            "rake_of_blade": rake_of_blade, "time_for_down_stroke": time_for_down_stroke,
+        }), spec_type)
+        for key, value in expected.items():
+            actual = results[key] if np.ndim(results[key]) == 0 else results[key][index]
+            if key == "force_req_to_shear_check":
+                mismatches += (value == "OK") != bool(actual)
+            else:
+                mismatches += value != actual
+    return mismatches
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--points", type=int, default=10, help="values per axis (grid size is points ** 6)")
+    parser.add_argument("--samples", type=int, default=1000)
+    args = parser.parse_args()
+
+    axes = get_axes(args.points)
+    rng = np.random.default_rng(0)
+    for spec_type in SPEC_TYPES:
+        start = time.perf_counter()
+        results = calculate_hyd_shear_grid(BASE_INPUT, spec_type, *axes)
+        elapsed = time.perf_counter() - start
+
+        size = results["force_req_to_shear_check"].size
+        passing = int(np.count_nonzero(results["force_req_to_shear_check"]))
+        mismatches = count_mismatches(spec_type, axes, results, args.samples, rng)
+        print(f"{spec_type}:")
+        print(f"  combinations: {size} ({passing} pass force_req_to_shear_check)")
+        print(f"  grid:         {elapsed * 1000:9.1f} ms  ({elapsed / size * 1e9:.1f} ns/combination)")
+        print(f"  mismatches:   {mismatches} in {args.samples} sampled points")
+
+if __name__ == "__main__":
+    main()
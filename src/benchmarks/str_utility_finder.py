@@ -0,0 +1,72 @@
+"""
+Straightener Utility Finder Benchmark
+
+Times get_min_str_utility_inputs against the exhaustive reference search over a
+fixed set of user entries and checks that both return the same configuration.
+
+Run from src:
+    python -m benchmarks.str_utility_finder
+"""
+
+import argparse
+import itertools
+import time
+
+from utils.initial.str_utility_finder import get_min_str_utility_inputs, get_str_utility_inputs_exhaustive
+
+BASE_ENTRIES = {
+    "max_coil_weight": 20000,
+    "coil_id": 20,
+    "coil_od": 72,
+    "material_type": "COLD ROLLED STEEL",
+    "yield_met": "OK",
+    "auto_brake_compensation": "No",
+    "acceleration": 2,
+    "num_str_rolls": 7,
+}
+
+def get_cases():
+    """User entries spanning easy (early match) and hard (late or no match) searches."""
+    cases = []
+    for coil_width, thickness, yield_strength, max_feed_rate in itertools.product(
+        (24, 48, 60), (0.06, 0.19, 0.375), (30000, 80000), (50, 100, 160)
+    ):
+        entries = dict(BASE_ENTRIES)
+        entries.update({
+            "coil_width": coil_width,
+            "material_thickness": thickness,
+            "yield_strength": yield_strength,
+            "max_feed_rate": max_feed_rate,
+        })
+        cases.append(entries)
+    return cases
+
+def time_search(search, cases, repeat):
+    """Best of repeat wall times for running search over every case, with its results."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = [search(entries) for entries in cases]
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    cases = get_cases()
+    naive_time, naive_results = time_search(get_str_utility_inputs_exhaustive, cases, args.repeat)
+    pruned_time, pruned_results = time_search(get_min_str_utility_inputs, cases, args.repeat)
+
+    mismatches = sum(a != b for a, b in zip(naive_results, pruned_results))
+    found = sum(result is not None for result in pruned_results)
+    print(f"cases:      {len(cases)} ({found} with a passing configuration)")
+    print(f"exhaustive: {naive_time * 1000:9.1f} ms  ({naive_time / len(cases) * 1000:.2f} ms/case)")
+    print(f"pruned:     {pruned_time * 1000:9.1f} ms  ({pruned_time / len(cases) * 1000:.2f} ms/case)")
+    print(f"speedup:    {naive_time / pruned_time:9.1f}x")
+    print(f"mismatches: {mismatches}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Zig Zag Sweep Benchmark
+
+Times calculate_zig_zag_grid over a pivot to screw x feed angle x lead screw
+diameter x lead screw length grid against calling calculate_zig_zag for every
+design, and checks sampled points against it.
+
+Run from src:
+    python -m benchmarks.zig_zag_sweep
+"""
+
+import argparse
+import math
+import time
+
+import numpy as np
+
+from models import zig_zag_input
+from calculations.zig_zag import calculate_zig_zag
+from calculations.zig_zag_vectorized import calculate_zig_zag_grid
+
+BASE_INPUT = zig_zag_input(
+    material_width=30,
+    material_thickness=0.1,
+    material_length_flat=40,
+    material_density=0.283,
+    pivot_to_screw=0,
+    total_load=750,
+    efficiency=0.85,
+    feed_angle=180,
+    misc_friction_at_motor=15,
+    lead_screw_o_dia=2.25,
+    lead_screw_i_dia=0,
+    lead_screw_length=27,
+    lead_screw_density=0.283,
+    lead_screw_qty=1,
+    min_length=1,
+    incriment=1,
+)
+
+SCALAR_KEYS = ("match", "peak_torque", "rms_torque", "accel_torque", "refl_inertia")
+
+def get_axes(points):
+    """Four grid axes of points values each."""
+    return (
+        np.concatenate(([0], np.linspace(5, 60, points - 1))),  # pivot to screw (0 is a slide)
+        np.linspace(10, 360, points),                           # feed angle
+        np.linspace(1, 4, points),                              # lead screw outer diameter
+        np.linspace(12, 60, points),                            # lead screw length
+    )
+
+def get_design(axes, index):
+    pivot_to_screw, feed_angle, lead_screw_o_dia, lead_screw_length = (float(axis[i]) for axis, i in zip(axes, index))
+    return BASE_INPUT.copy(update={
+        "pivot_to_screw": pivot_to_screw, "feed_angle": feed_angle,
+        "lead_screw_o_dia": lead_screw_o_dia, "lead_screw_length": lead_screw_length,
+    })
+
+def count_mismatches(axes, results, samples, rng):
+    """
+    Compare randomly sampled grid points to calculate_zig_zag. Degrees of
+    rotation may differ by an ulp (np.arctan), so they are compared to 4 ulps.
+    """
+    mismatches = 0
+    for _ in range(samples):
+        index = tuple(rng.integers(len(axis)) for axis in axes)
+        expected = calculate_zig_zag(get_design(axes, index))
+        mismatches += sum(expected[key] != results[key][index] for key in SCALAR_KEYS)
+        for row, values in enumerate(expected["table_values"]):
+            mismatches += values["rms_torque"] != results["table_rms_torque"][index + (row,)]
+            degrees = float(results["deg_of_rotation"][index + (row,)])
+            mismatches += abs(values["deg_of_rotation"] - degrees) > 4 * math.ulp(degrees)
+    return mismatches
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--points", type=int, default=20, help="values per axis (grid size is points ** 4)")
+    parser.add_argument("--samples", type=int, default=500)
+    args = parser.parse_args()
+
+    axes = get_axes(args.points)
+    start = time.perf_counter()
+    results = calculate_zig_zag_grid(BASE_INPUT, *axes)
+    elapsed = time.perf_counter() - start
+    size = results["match"].size
+
+    # The scalar loop is timed on the sampled designs and scaled to the grid
+    rng = np.random.default_rng(0)
+    indexes = [tuple(rng.integers(len(axis)) for axis in axes) for _ in range(args.samples)]
+    start = time.perf_counter()
+    for index in indexes:
+        calculate_zig_zag(get_design(axes, index))
+    scalar = (time.perf_counter() - start) / args.samples
+
+    mismatches = count_mismatches(axes, results, args.samples, rng)
+    print(f"designs:      {size}")
+    print(f"grid:         {elapsed * 1000:9.1f} ms  ({elapsed / size * 1e6:.2f} us/design)")
+    print(f"scalar:       {scalar * size * 1000:9.1f} ms  ({scalar * 1e6:.2f} us/design, estimated)")
+    print(f"mismatches:   {mismatches} in {args.samples} sampled designs")
+
+if __name__ == "__main__":
+    main()
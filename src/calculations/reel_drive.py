@@ -5,6 +5,7 @@ Reel Drive Calculation Module
 from models import reel_drive_input
 from math import pi
 from typing import Tuple, Dict, Any
+from dataclasses import dataclass
 
 from utils.shared import (
     CHAIN_RATIO, CHAIN_SPRKT_OD, CHAIN_SPRKT_THICKNESS, MOTOR_RPM,
@@ -28,29 +29,36 @@ def get_lookup_data(data: reel_drive_input):
     fpm_buffer = get_fpm_buffer("DEFAULT")
     return reel, material, motor_inertia, reel_type, fpm_buffer
 
-def calc_mandrel_specs(reel, reel_width, brg_dist, total_ratio):
+# Helpers taking power default to Python's pow; reel_drive_vectorized passes
+# utils.vectorized.power so they give the same results over arrays.
+def calc_mandrel_specs(reel, reel_width, brg_dist, total_ratio, power=pow):
     """Calculate mandrel (central shaft) specifications."""
     mandrel_dia = reel["mandrel_dia"]
     mandrel_length = reel_width + 17 + brg_dist
-    mandrel_weight = ((mandrel_dia/2)**2) * pi * mandrel_length * 0.283
-    mandrel_inertia = mandrel_weight / 32.3 / 2 * ((mandrel_dia/2)**2 / 144) * 12
+    mandrel_weight = power(mandrel_dia/2, 2) * pi * mandrel_length * 0.283
+    mandrel_inertia = mandrel_weight / 32.3 / 2 * (power(mandrel_dia/2, 2) / 144) * 12
     mandrel_refl = mandrel_inertia / total_ratio**2 if total_ratio else 0
     return mandrel_dia, mandrel_length, mandrel_weight, mandrel_inertia, mandrel_refl
 
-def calc_backplate_specs(backplate_diameter, total_ratio, mandrel_dia):
+def calc_backplate_specs(backplate_diameter, total_ratio, mandrel_dia, power=pow):
     """Calculate backplate specifications."""
     backplate_weight = ((backplate_diameter/2)**2) * pi * 0.283
-    backplate_inertia = backplate_weight / 32.3 / 2 * ((mandrel_dia/2)**2 / 144) * 12
+    backplate_inertia = backplate_weight / 32.3 / 2 * (power(mandrel_dia/2, 2) / 144) * 12
     backplate_refl = backplate_inertia / total_ratio**2 if total_ratio else 0
     return backplate_weight, backplate_inertia, backplate_refl
 
+def calc_coil_inertia(coil_weight, coil_dia, coil_id, total_ratio, power=pow):
+    """Inertia and reflected inertia of coil_weight wound from coil_id out to coil_dia."""
+    coil_inertia = coil_weight / 32.3 / 2 * (power(coil_dia/2, 2) + (coil_id/2)**2) / 144 * 12
+    coil_refl = coil_inertia / total_ratio**2 if total_ratio else 0
+    return coil_inertia, coil_refl
+
 def calc_coil_specs(reel_size, coil_od, coil_id, coil_density, total_ratio, density):
     """Calculate coil specifications."""
     try:
         coil_density = density
         coil_width = reel_size / coil_density / ((coil_od**2 - coil_id**2) / 4) / pi
-        coil_inertia = reel_size / 32.3 / 2 * ((coil_od/2)**2 + (coil_id/2)**2) / 144 * 12
-        coil_refl = coil_inertia / total_ratio**2 if total_ratio else 0
+        coil_inertia, coil_refl = calc_coil_inertia(reel_size, coil_od, coil_id, total_ratio)
         return coil_density, coil_width, coil_inertia, coil_refl
     except ZeroDivisionError:
         return 0, 0, 0, 0
@@ -90,22 +98,35 @@ def calc_friction_forces(mandrel_weight, reel_size, reel_width, brg_dist, f_brg_
 def calc_friction_reflected(friction_total, total_ratio, reducer_driving):
     return friction_total / total_ratio / reducer_driving if total_ratio and reducer_driving else 0
 
+def calc_torque_value(total_refl, motor_rpm, accel_time, reducer_driving, motor_inertia, friction_refl):
+    """Torque to accelerate the reel and motor; calc_torque guards the zero cases."""
+    inertia_torque = ((total_refl * motor_rpm) / (9.55 * accel_time)) / reducer_driving
+    motor_inertia_torque = (motor_inertia * motor_rpm) / (9.55 * accel_time)
+    return inertia_torque + motor_inertia_torque + friction_refl
+
 def calc_torque(total_refl, motor_rpm, accel_time, reducer_driving, motor_inertia, friction_refl):
     if total_refl and motor_rpm and accel_time and reducer_driving:
-        inertia_torque = ((total_refl * motor_rpm) / (9.55 * accel_time)) / reducer_driving
-        motor_inertia_torque = (motor_inertia * motor_rpm) / (9.55 * accel_time)
-        return inertia_torque + motor_inertia_torque + friction_refl
+        return calc_torque_value(total_refl, motor_rpm, accel_time, reducer_driving, motor_inertia, friction_refl)
     return 0
 
+def calc_hp_req_value(torque, motor_base_rpm):
+    return torque * motor_base_rpm / 63000
+
 def calc_hp_req(torque, motor_base_rpm):
-    return torque * motor_base_rpm / 63000 if torque and motor_base_rpm else 0
+    return calc_hp_req_value(torque, motor_base_rpm) if torque and motor_base_rpm else 0
+
+def calc_regen_power_value(total_refl, motor_rpm, accel_time, friction_total, total_ratio, reducer_backdriving, motor_inertia):
+    """Regenerated power while decelerating; calc_regen_power guards the zero cases."""
+    inertia_power = (total_refl * motor_rpm) / (9.55 * accel_time)
+    motor_inertia_power = (motor_inertia * motor_rpm) / (9.55 * accel_time)
+    friction_power = friction_total / total_ratio / reducer_backdriving
+    return (inertia_power + motor_inertia_power - friction_power) * motor_rpm / 63000 * 746
 
 def calc_regen_power(total_refl, motor_rpm, accel_time, friction_total, total_ratio, reducer_backdriving, motor_inertia):
     if total_refl and motor_rpm and accel_time and total_ratio and reducer_backdriving:
-        inertia_power = (total_refl * motor_rpm) / (9.55 * accel_time)
-        motor_inertia_power = (motor_inertia * motor_rpm) / (9.55 * accel_time)
-        friction_power = friction_total / total_ratio / reducer_backdriving
-        return (inertia_power + motor_inertia_power - friction_power) * motor_rpm / 63000 * 746
+        return calc_regen_power_value(
+            total_refl, motor_rpm, accel_time, friction_total, total_ratio, reducer_backdriving, motor_inertia
+        )
     return 0
 
 def validate_motor(motor_hp, hp_req):
@@ -116,7 +137,172 @@ def pulloff_recommendation(reel_type, motor_hp, hp_req_empty, hp_req_full):
         return "OK" if motor_hp > hp_req_empty and motor_hp > hp_req_full else "NOT OK"
     return "USE PULLOFF"
 
-def calculate_reeldrive(data: reel_drive_input) -> Dict[str, Any]:
+# --- Result ---
+@dataclass(frozen=True)
+class reel_drive_output:
+    """Flat reel drive results; to_dict() gives the nested JSON output."""
+    __slots__ = (
+        "reel_size", "reel_width", "brg_dist", "f_brg_dia", "r_brg_dia",
+        "mandrel_dia", "mandrel_length", "mandrel_max_rpm", "mandrel_rpm_full", "mandrel_weight",
+        "mandrel_inertia", "mandrel_refl",
+        "backplate_diameter", "backplate_thickness", "backplate_weight", "backplate_inertia", "backplate_refl",
+        "coil_density", "coil_od", "coil_id", "coil_width", "coil_inertia", "coil_refl",
+        "reducer_ratio", "chain_weight", "chain_inertia", "chain_refl",
+        "total_ratio", "total_refl_inert_empty", "total_refl_inert_full",
+        "motor_hp", "motor_inertia", "motor_rpm_full",
+        "r_brg_mand", "f_brg_mand", "r_brg_coil", "f_brg_coil",
+        "friction_total_empty", "friction_total_full", "friction_refl_empty", "friction_refl_full",
+        "speed", "accel_time", "torque_empty", "torque_full",
+        "hp_req_empty", "hp_req_full", "status_empty", "status_full",
+        "regen_empty", "regen_full", "use_pulloff"
+    )
+    reel_size: float
+    reel_width: float
+    brg_dist: float
+    f_brg_dia: float
+    r_brg_dia: float
+    mandrel_dia: float
+    mandrel_length: float
+    mandrel_max_rpm: float
+    mandrel_rpm_full: float
+    mandrel_weight: float
+    mandrel_inertia: float
+    mandrel_refl: float
+    backplate_diameter: float
+    backplate_thickness: float
+    backplate_weight: float
+    backplate_inertia: float
+    backplate_refl: float
+    coil_density: float
+    coil_od: float
+    coil_id: float
+    coil_width: float
+    coil_inertia: float
+    coil_refl: float
+    reducer_ratio: float
+    chain_weight: float
+    chain_inertia: float
+    chain_refl: float
+    total_ratio: float
+    total_refl_inert_empty: float
+    total_refl_inert_full: float
+    motor_hp: float
+    motor_inertia: float
+    motor_rpm_full: float
+    r_brg_mand: float
+    f_brg_mand: float
+    r_brg_coil: float
+    f_brg_coil: float
+    friction_total_empty: float
+    friction_total_full: float
+    friction_refl_empty: float
+    friction_refl_full: float
+    speed: float
+    accel_time: float
+    torque_empty: float
+    torque_full: float
+    hp_req_empty: float
+    hp_req_full: float
+    status_empty: str
+    status_full: str
+    regen_empty: float
+    regen_full: float
+    use_pulloff: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "reel": {
+                "size": self.reel_size,
+                "max_width": self.reel_width,
+                "brg_dist": self.brg_dist,
+                "f_brg_dia": self.f_brg_dia,
+                "r_brg_dia": self.r_brg_dia
+            },
+            "mandrel": {
+                "diameter": self.mandrel_dia,
+                "length": self.mandrel_length,
+                "max_rpm": self.mandrel_max_rpm,
+                "rpm_full": self.mandrel_rpm_full,
+                "weight": self.mandrel_weight,
+                "inertia": self.mandrel_inertia,
+                "refl_inert": self.mandrel_refl
+            },
+            "backplate": {
+                "diameter": self.backplate_diameter,
+                "thickness": self.backplate_thickness,
+                "weight": self.backplate_weight,
+                "inertia": self.backplate_inertia,
+                "refl_inert": self.backplate_refl
+            },
+            "coil": {
+                "density": self.coil_density,
+                "od": self.coil_od,
+                "id": self.coil_id,
+                "width": self.coil_width,
+                "weight": self.reel_size,
+                "inertia": self.coil_inertia,
+                "refl_inert": self.coil_refl
+            },
+            "reducer": {
+                "ratio": self.reducer_ratio,
+                "driving": REDUCER_DRIVING,
+                "backdriving": REDUCER_BACKDRIVING,
+                "inertia": REDUCER_INERTIA,
+                "refl_inert": REDUCER_INERTIA
+            },
+            "chain": {
+                "ratio": CHAIN_RATIO,
+                "sprkt_od": CHAIN_SPRKT_OD,
+                "sprkt_thk": CHAIN_SPRKT_THICKNESS,
+                "weight": self.chain_weight,
+                "inertia": self.chain_inertia,
+                "refl_inert": self.chain_refl
+            },
+            "total": {
+                "ratio": self.total_ratio,
+                "total_refl_inert_empty": self.total_refl_inert_empty,
+                "total_refl_inert_full": self.total_refl_inert_full
+            },
+            "motor": {
+                "hp": self.motor_hp,
+                "inertia": self.motor_inertia,
+                "base_rpm": MOTOR_RPM,
+                "rpm_full": self.motor_rpm_full
+            },
+            "friction": {
+                "r_brg_mand": self.r_brg_mand,
+                "f_brg_mand": self.f_brg_mand,
+                "r_brg_coil": self.r_brg_coil,
+                "f_brg_coil": self.f_brg_coil,
+                "total_empty": self.friction_total_empty,
+                "total_full": self.friction_total_full,
+                "refl_empty": self.friction_refl_empty,
+                "refl_full": self.friction_refl_full
+            },
+            "speed": {
+                "speed": self.speed,
+                "accel_rate": ACCEL_RATE,
+                "accel_time": self.accel_time
+            },
+            "torque": {
+                "empty": self.torque_empty,
+                "full": self.torque_full
+            },
+            "hp_req": {
+                "empty": self.hp_req_empty,
+                "full": self.hp_req_full,
+                "status_empty": self.status_empty,
+                "status_full": self.status_full
+            },
+            "regen": {
+                "empty": self.regen_empty,
+                "full": self.regen_full
+            },
+            "use_pulloff": self.use_pulloff
+        }
+
+# --- Main Calculation ---
+def calculate_reeldrive(data: reel_drive_input) -> reel_drive_output:
     try:
         reel, material, motor_inertia, reel_type, fpm_buffer = get_lookup_data(data)
     except Exception:
@@ -168,95 +354,17 @@ def calculate_reeldrive(data: reel_drive_input) -> Dict[str, Any]:
 
     pulloff = pulloff_recommendation(reel_type, data.motor_hp, hp_req_empty, hp_req_full)
 
-    results = {
-        "reel": {
-            "size": reel_size,
-            "max_width": data.reel_width,
-            "brg_dist": brg_dist,
-            "f_brg_dia": f_brg_dia,
-            "r_brg_dia": r_brg_dia
-        },
-        "mandrel": {
-            "diameter": mandrel_dia,
-            "length": mandrel_length,
-            "max_rpm": mandrel_max_rpm,
-            "rpm_full": mandrel_full_rpm,
-            "weight": mandrel_weight,
-            "inertia": mandrel_inertia,
-            "refl_inert": mandrel_refl
-        },
-        "backplate": {
-            "diameter": data.backplate_diameter,
-            "thickness": reel["backplate_thickness"],
-            "weight": backplate_weight,
-            "inertia": backplate_inertia,
-            "refl_inert": backplate_refl
-        },
-        "coil": {
-            "density": coil_density,
-            "od": data.coil_od,
-            "id": data.coil_id,
-            "width": coil_width,
-            "weight": reel_size,
-            "inertia": coil_inertia,
-            "refl_inert": coil_refl
-        },
-        "reducer": {
-            "ratio": reducer_ratio,
-            "driving": REDUCER_DRIVING,
-            "backdriving": REDUCER_BACKDRIVING,
-            "inertia": REDUCER_INERTIA,
-            "refl_inert": REDUCER_INERTIA
-        },
-        "chain": {
-            "ratio": CHAIN_RATIO,
-            "sprkt_od": CHAIN_SPRKT_OD,
-            "sprkt_thk": CHAIN_SPRKT_THICKNESS,
-            "weight": chain_weight,
-            "inertia": chain_inertia,
-            "refl_inert": chain_refl
-        },
-        "total": {
-            "ratio": total_ratio,
-            "total_refl_inert_empty": total_refl_empty,
-            "total_refl_inert_full": total_refl_full
-        },
-        "motor": {
-            "hp": data.motor_hp,
-            "inertia": motor_inertia,
-            "base_rpm": MOTOR_RPM,
-            "rpm_full": motor_rpm_full
-        },
-        "friction": {
-            "r_brg_mand": r_brg_mand,
-            "f_brg_mand": f_brg_mand,
-            "r_brg_coil": r_brg_coil,
-            "f_brg_coil": f_brg_coil,
-            "total_empty": friction_total_empty,
-            "total_full": friction_total_full,
-            "refl_empty": friction_refl_empty,
-            "refl_full": friction_refl_full
-        },
-        "speed": {
-            "speed": speed,
-            "accel_rate": ACCEL_RATE,
-            "accel_time": accel_time
-        },
-        "torque": {
-            "empty": torque_empty,
-            "full": torque_full
-        },
-        "hp_req": {
-            "empty": hp_req_empty,
-            "full": hp_req_full,
-            "status_empty": status_empty,
-            "status_full": status_full
-        },
-        "regen": {
-            "empty": regen_empty,
-            "full": regen_full
-        },
-        "use_pulloff": pulloff
-    }
-
-    return results
\ No newline at end of file
+    return reel_drive_output(
+        reel_size, data.reel_width, brg_dist, f_brg_dia, r_brg_dia,
+        mandrel_dia, mandrel_length, mandrel_max_rpm, mandrel_full_rpm, mandrel_weight, mandrel_inertia, mandrel_refl,
+        data.backplate_diameter, reel["backplate_thickness"], backplate_weight, backplate_inertia, backplate_refl,
+        coil_density, data.coil_od, data.coil_id, coil_width, coil_inertia, coil_refl,
+        reducer_ratio, chain_weight, chain_inertia, chain_refl,
+        total_ratio, total_refl_empty, total_refl_full,
+        data.motor_hp, motor_inertia, motor_rpm_full,
+        r_brg_mand, f_brg_mand, r_brg_coil, f_brg_coil,
+        friction_total_empty, friction_total_full, friction_refl_empty, friction_refl_full,
+        speed, accel_time, torque_empty, torque_full,
+        hp_req_empty, hp_req_full, status_empty, status_full,
+        regen_empty, regen_full, pulloff
+    )
@@ -0,0 +1,307 @@
+"""
+Vectorized Reel Drive Calculation Module
+
+Array versions of the reel drive calculations: an unwind sweep over the coil
+OD, motor sizing across every motor and a batch across reel models.
+"""
+
+import numpy as np
+from math import pi
+
+from models import reel_drive_input
+from utils.vectorized import power
+from utils.shared import (
+    REEL_MODEL_OPTIONS, CHAIN_SPRKT_OD, CHAIN_SPRKT_THICKNESS, MOTOR_RPM,
+    REDUCER_DRIVING, REDUCER_BACKDRIVING, REDUCER_INERTIA, ACCEL_RATE
+)
+from utils.lookup_tables import (
+    lookup_motor_inertia, get_reel_dimensions, get_material, get_motor_inertia, get_type_of_line, get_fpm_buffer
+)
+from calculations.reel_drive import (
+    get_lookup_data, calc_mandrel_specs, calc_backplate_specs, calc_coil_specs, calc_coil_inertia, calc_speed_params,
+    calc_mandrel_rpm, calc_total_ratio, calc_chain_specs, calc_friction_forces, calc_friction_reflected,
+    calc_torque_value, calc_hp_req_value, calc_regen_power_value, validate_motor, pulloff_recommendation
+)
+
+# --- Calculations ---
+# The scalar helpers from reel_drive run on arrays (given power where they
+# square one); these add the guards reel_drive writes as truth tests on scalars.
+def calc_full_coil_refl(reel_size, coil_od, coil_id, density, total_ratio):
+    """Reflected inertia of a full coil; reel_size may be an array over reel models."""
+    if not (density and (coil_od**2 - coil_id**2)):
+        return np.zeros_like(reel_size, dtype=float)
+    _, _, _, coil_refl = calc_coil_specs(reel_size, coil_od, coil_id, density, total_ratio, density)
+    return coil_refl
+
+def calc_coil_weight(reel_size, coil_dia, coil_od, coil_id):
+    """Weight left on the mandrel at coil_dia, for a full coil of reel_size at coil_od."""
+    full_area = power(coil_od, 2) - power(coil_id, 2)
+    if not full_area:
+        return np.zeros_like(coil_dia)
+    return reel_size * ((power(coil_dia, 2) - power(coil_id, 2)) / full_area)
+
+def calc_motor_rpm(speed, coil_dia, total_ratio):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        motor_rpm = speed * 12 / coil_dia / pi * total_ratio
+    return np.where((coil_dia != 0) & bool(total_ratio), motor_rpm, 0.0)
+
+def calc_torque_masked(total_refl, motor_rpm, accel_time, reducer_driving, motor_inertia, friction_refl):
+    """calc_torque over arrays: zero wherever its check skips the formula."""
+    if not (accel_time and reducer_driving):
+        return np.zeros(np.broadcast(total_refl, motor_rpm, motor_inertia, friction_refl).shape)
+    torque = calc_torque_value(total_refl, motor_rpm, accel_time, reducer_driving, motor_inertia, friction_refl)
+    return np.where((np.asarray(total_refl) != 0) & (np.asarray(motor_rpm) != 0), torque, 0.0)
+
+def calc_hp_req_masked(torque, motor_base_rpm):
+    """calc_hp_req over arrays."""
+    if not motor_base_rpm:
+        return np.zeros_like(torque)
+    return np.where(torque != 0, calc_hp_req_value(torque, motor_base_rpm), 0.0)
+
+def calc_regen_power_masked(total_refl, motor_rpm, accel_time, friction_total, total_ratio, reducer_backdriving,
+                            motor_inertia):
+    """calc_regen_power over arrays: zero wherever its check skips the formula."""
+    if not (accel_time and total_ratio and reducer_backdriving):
+        return np.zeros(np.broadcast(total_refl, motor_rpm, motor_inertia, friction_total).shape)
+    regen = calc_regen_power_value(
+        total_refl, motor_rpm, accel_time, friction_total, total_ratio, reducer_backdriving, motor_inertia
+    )
+    return np.where((np.asarray(total_refl) != 0) & (np.asarray(motor_rpm) != 0), regen, 0.0)
+
+def get_peak(values, coil_dia):
+    """Largest value in a sweep, with the coil diameter and index where it occurs."""
+    index = int(np.argmax(values))
+    return {"value": float(values[index]), "coil_od": float(coil_dia[index]), "index": index}
+
+# --- Shared Terms ---
+def calc_drive_terms(data: reel_drive_input, reel, density, fpm_buffer):
+    """
+    Evaluate the calculate_reeldrive terms that do not depend on the motor:
+    speed, ratios, reflected inertia and friction for the empty and full reel.
+    The reel values may be arrays over reel models; the speed and ratio terms
+    only depend on the coil and line speed, so they stay scalars.
+    """
+    speed, accel_time = calc_speed_params(data.required_max_fpm, fpm_buffer, ACCEL_RATE)
+    mandrel_max_rpm, mandrel_full_rpm = calc_mandrel_rpm(speed, data.coil_id, data.coil_od)
+    total_ratio = calc_total_ratio(MOTOR_RPM, mandrel_max_rpm)
+
+    reel_size = reel["coil_weight"]
+    brg_dist = reel["bearing_dist"]
+
+    mandrel_dia, _, mandrel_weight, _, mandrel_refl = calc_mandrel_specs(reel, data.reel_width, brg_dist, total_ratio, power=power)
+    _, _, backplate_refl = calc_backplate_specs(data.backplate_diameter, total_ratio, mandrel_dia, power=power)
+    _, _, chain_refl = calc_chain_specs(CHAIN_SPRKT_OD, CHAIN_SPRKT_THICKNESS, total_ratio)
+    # The reflected terms are a plain 0 when total_ratio is; zeros keep them in the reel values' shape
+    total_refl_empty = mandrel_refl + backplate_refl + REDUCER_INERTIA + chain_refl + np.zeros_like(mandrel_weight)
+
+    coil_refl = calc_full_coil_refl(reel_size, data.coil_od, data.coil_id, density, total_ratio)
+    total_refl_full = total_refl_empty + coil_refl
+    motor_rpm_full = speed * 12 / data.coil_od / pi * total_ratio if total_ratio else 0
+
+    r_brg_mand, f_brg_mand, r_brg_coil, f_brg_coil, friction_total_empty, friction_total_full = calc_friction_forces(
+        mandrel_weight, reel_size, data.reel_width, brg_dist, reel["fbearing_dia"], reel["rbearing_dia"]
+    )
+    return {
+        "speed": speed,
+        "accel_time": accel_time,
+        "total_ratio": total_ratio,
+        "reel_size": reel_size,
+        "mandrel_weight": mandrel_weight,
+        "total_refl_empty": total_refl_empty,
+        "total_refl_full": total_refl_full,
+        "motor_rpm_full": motor_rpm_full,
+        "friction_total_empty": friction_total_empty,
+        "friction_total_full": friction_total_full,
+        "friction_refl_empty": calc_friction_reflected(friction_total_empty, total_ratio, REDUCER_DRIVING),
+        "friction_refl_full": calc_friction_reflected(friction_total_full, total_ratio, REDUCER_DRIVING),
+        "r_brg_coil": r_brg_coil,
+        "f_brg_coil": f_brg_coil,
+    }
+
+# --- Unwind Sweep ---
+def calculate_reeldrive_unwind(data: reel_drive_input, num_points: int = 100):
+    """
+    Evaluate the reel drive over num_points coil diameters from data.coil_od
+    (full, matching calculate_reeldrive's "full" values) down to data.coil_id
+    (empty coil on the mandrel). Coil weight and the coil bearing friction scale
+    with the material left on the mandrel.
+
+    Returns arrays of coil diameter, coil weight, coil inertia, reflected
+    inertia, motor rpm, torque, HP required and regen, plus the peak torque,
+    HP and regen and the diameters where they occur.
+    """
+    try:
+        reel, material, motor_inertia, reel_type, fpm_buffer = get_lookup_data(data)
+    except Exception:
+        return "ERROR: Reel Drive lookup failed."
+
+    terms = calc_drive_terms(data, reel, material["density"], fpm_buffer)
+    reel_size = terms["reel_size"]
+    total_ratio = terms["total_ratio"]
+
+    # Sweep
+    coil_dia = np.linspace(data.coil_od, data.coil_id, num_points)
+    coil_weight = calc_coil_weight(reel_size, coil_dia, data.coil_od, data.coil_id)
+    coil_inertia, coil_refl = calc_coil_inertia(coil_weight, coil_dia, data.coil_id, total_ratio, power=power)
+    # coil_refl is a scalar 0 when there is no drive ratio, so fill the sweep shape first
+    total_refl = np.full_like(coil_dia, terms["total_refl_empty"]) + coil_refl
+    motor_rpm = calc_motor_rpm(terms["speed"], coil_dia, total_ratio)
+
+    # Coil bearing friction is linear in the coil weight
+    weight_fraction = coil_weight / reel_size if reel_size else np.zeros_like(coil_weight)
+    friction_total = terms["friction_total_empty"] + terms["r_brg_coil"] * weight_fraction + terms["f_brg_coil"] * weight_fraction
+    friction_refl = calc_friction_reflected(friction_total, total_ratio, REDUCER_DRIVING)
+
+    accel_time = terms["accel_time"]
+    torque = calc_torque_masked(total_refl, motor_rpm, accel_time, REDUCER_DRIVING, motor_inertia, friction_refl)
+    hp_req = calc_hp_req_masked(torque, MOTOR_RPM)
+    regen = calc_regen_power_masked(total_refl, motor_rpm, accel_time, friction_total, total_ratio, REDUCER_BACKDRIVING, motor_inertia)
+
+    return {
+        "coil_od": coil_dia,
+        "coil_weight": coil_weight,
+        "coil_inertia": coil_inertia,
+        "refl_inert": total_refl,
+        "motor_rpm": motor_rpm,
+        "torque": torque,
+        "hp_req": hp_req,
+        "regen": regen,
+        "peak": {
+            "torque": get_peak(torque, coil_dia),
+            "hp_req": get_peak(hp_req, coil_dia),
+            "regen": get_peak(regen, coil_dia),
+        },
+    }
+
+# --- Motor Sizing ---
+def get_motor_options():
+    """
+    Every current motor in the motor inertia lookup as (key, hp, inertia),
+    smallest HP first. "_old" motors are left out, as calculate_reeldrive looks
+    motors up by HP alone and cannot select them.
+    """
+    motors = [
+        (key, float(key), value["motor_inertia"]) for key, value in lookup_motor_inertia.items() if "_" not in key
+    ]
+    return sorted(motors, key=lambda motor: motor[1])
+
+def calculate_reeldrive_motor_sizing(data: reel_drive_input):
+    """
+    Evaluate calculate_reeldrive's empty and full HP checks for every motor from
+    get_motor_options in one pass; data.motor_hp is ignored. Motor inertia feeds
+    back into the torque, so each motor gets its own HP requirement.
+
+    Returns the smallest motor passing both checks (None if no motor does) and
+    a table of every motor with its HP requirements and pass flags.
+    """
+    try:
+        reel = get_reel_dimensions(data.model)
+        material = get_material(data.material_type)
+        reel_type = get_type_of_line(data.type_of_line)
+        fpm_buffer = get_fpm_buffer("DEFAULT")
+    except Exception:
+        return "ERROR: Reel Drive lookup failed."
+
+    terms = calc_drive_terms(data, reel, material["density"], fpm_buffer)
+    motors = get_motor_options()
+    motor_hp = np.array([motor[1] for motor in motors])
+    motor_inertia = np.array([motor[2] for motor in motors])
+
+    accel_time = terms["accel_time"]
+    torque_empty = calc_torque_masked(
+        terms["total_refl_empty"], MOTOR_RPM, accel_time, REDUCER_DRIVING, motor_inertia, terms["friction_refl_empty"]
+    )
+    torque_full = calc_torque_masked(
+        terms["total_refl_full"], terms["motor_rpm_full"], accel_time, REDUCER_DRIVING, motor_inertia, terms["friction_refl_full"]
+    )
+    hp_req_empty = calc_hp_req_masked(torque_empty, MOTOR_RPM)
+    hp_req_full = calc_hp_req_masked(torque_full, MOTOR_RPM)
+    passes = (motor_hp > hp_req_empty) & (motor_hp > hp_req_full)
+
+    selected = None
+    if passes.any():
+        index = int(np.argmax(passes))
+        selected = {
+            "key": motors[index][0],
+            "hp": motors[index][1],
+            "inertia": motors[index][2],
+            "hp_req_empty": float(hp_req_empty[index]),
+            "hp_req_full": float(hp_req_full[index]),
+        }
+
+    return {
+        "reel_type": reel_type,
+        "motor": selected,
+        "motors": {
+            "key": [motor[0] for motor in motors],
+            "hp": motor_hp,
+            "inertia": motor_inertia,
+            "hp_req_empty": hp_req_empty,
+            "hp_req_full": hp_req_full,
+            "passes": passes,
+        },
+    }
+
+# --- Reel Model Batch ---
+def get_reel_arrays(models):
+    """Reel dimension lookups for each model, as one array per field."""
+    reels = [get_reel_dimensions(model) for model in models]
+    return {field: np.array([reel[field] for reel in reels], dtype=float) for field in reels[0]}
+
+def calculate_reeldrive_models(data: reel_drive_input, models=REEL_MODEL_OPTIONS):
+    """
+    Evaluate calculate_reeldrive for every reel model at once; data.model is
+    ignored. Material, motor, speed, ratio and chain terms are computed once and
+    the reel dimension terms are broadcast across the models.
+
+    Returns one row per model with the reel size, reflected inertia, torque,
+    HP required, motor status, regen and pulloff recommendation.
+    """
+    models = list(models)
+    try:
+        reel = get_reel_arrays(models)
+        material = get_material(data.material_type)
+        motor_inertia = get_motor_inertia(str(int(data.motor_hp)) if data.motor_hp != 7.5 else str(data.motor_hp))
+        reel_type = get_type_of_line(data.type_of_line)
+        fpm_buffer = get_fpm_buffer("DEFAULT")
+    except Exception:
+        return "ERROR: Reel Drive lookup failed."
+
+    terms = calc_drive_terms(data, reel, material["density"], fpm_buffer)
+    accel_time = terms["accel_time"]
+    total_ratio = terms["total_ratio"]
+
+    torque_empty = calc_torque_masked(
+        terms["total_refl_empty"], MOTOR_RPM, accel_time, REDUCER_DRIVING, motor_inertia, terms["friction_refl_empty"]
+    )
+    torque_full = calc_torque_masked(
+        terms["total_refl_full"], terms["motor_rpm_full"], accel_time, REDUCER_DRIVING, motor_inertia, terms["friction_refl_full"]
+    )
+    hp_req_empty = calc_hp_req_masked(torque_empty, MOTOR_RPM)
+    hp_req_full = calc_hp_req_masked(torque_full, MOTOR_RPM)
+    regen_empty = calc_regen_power_masked(
+        terms["total_refl_empty"], MOTOR_RPM, accel_time, terms["friction_total_empty"], total_ratio, REDUCER_BACKDRIVING, motor_inertia
+    )
+    regen_full = calc_regen_power_masked(
+        terms["total_refl_full"], terms["motor_rpm_full"], accel_time, terms["friction_total_full"], total_ratio, REDUCER_BACKDRIVING, motor_inertia
+    )
+
+    rows = []
+    for i, model in enumerate(models):
+        rows.append({
+            "model": model,
+            "reel_size": float(terms["reel_size"][i]),
+            "mandrel_weight": float(terms["mandrel_weight"][i]),
+            "total_refl_inert_empty": float(terms["total_refl_empty"][i]),
+            "total_refl_inert_full": float(terms["total_refl_full"][i]),
+            "torque_empty": float(torque_empty[i]),
+            "torque_full": float(torque_full[i]),
+            "hp_req_empty": float(hp_req_empty[i]),
+            "hp_req_full": float(hp_req_full[i]),
+            "status_empty": validate_motor(data.motor_hp, hp_req_empty[i]),
+            "status_full": validate_motor(data.motor_hp, hp_req_full[i]),
+            "regen_empty": float(regen_empty[i]),
+            "regen_full": float(regen_full[i]),
+            "use_pulloff": pulloff_recommendation(reel_type, data.motor_hp, hp_req_empty[i], hp_req_full[i]),
+        })
+    return rows
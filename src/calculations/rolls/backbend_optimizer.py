@@ -0,0 +1,213 @@
+"""
+Backbend Roll Height Optimizer
+
+Solves the roll heights of a backbend straightener instead of taking them from
+the hidden constant: the first-up height is set so the first pass yields a
+target fraction of the material, and the last height is set so the strip
+leaves the final roll flat. 7, 9 and 11 roll straighteners are tried in turn
+and the fewest rolls that flatten the strip within the jack force wins.
+"""
+
+from models import roll_str_backbend_input
+from utils.shared import CREEP_FACTOR, RADIUS_OFF_COIL, BACKBEND_CONFIRM, ROLL_COUNTS
+from calculations.rolls.roll_str_backbend import (
+    get_str_model_lookups, get_material_modulus_lookup, get_num_mid_rolls,
+    calc_curve_at_yield, calc_bending_moment_to_yield, calc_radius_off_coil_after_springback,
+    calc_max_roll_depth_with_material, calc_roll_height_last, calc_mid_heights, calc_res_rad, calc_res_rad_outer,
+    compute_stage_values, calc_percent_yield, calc_force_required, check_force_required
+)
+
+# Roll heights are scanned over this many points to bracket a root before bisecting
+BRACKET_POINTS = 64
+
+# The search stops this fraction of the center distance short of the material
+# thickness, clear of the res rad singularity at thickness - 1e-8
+HEIGHT_MARGIN = 1e-6
+
+# --- Root finding ---
+def find_bracket(f, lo, hi, points=BRACKET_POINTS):
+    """
+    Scan from hi down to lo and return the first (a, b) interval where f changes
+    sign, or None. Starting from hi finds the shallowest roll height.
+    """
+    step = (hi - lo) / points
+    b, fb = hi, f(hi)
+    for i in range(1, points + 1):
+        a = hi - i * step
+        fa = f(a)
+        if fa == 0:
+            return a, a
+        if (fa < 0) != (fb < 0):
+            return a, b
+        b, fb = a, fa
+    return None
+
+def solve_bracketed(f, lo, hi, tolerance=1e-9, max_iterations=200):
+    """Bisect f over a bracketing interval [lo, hi] to within tolerance."""
+    f_lo = f(lo)
+    for _ in range(max_iterations):
+        if hi - lo <= tolerance:
+            break
+        mid = (lo + hi) / 2
+        f_mid = f(mid)
+        if f_mid == 0:
+            return mid
+        if (f_mid < 0) == (f_lo < 0):
+            lo, f_lo = mid, f_mid
+        else:
+            hi = mid
+    return (lo + hi) / 2
+
+def find_root(f, lo, hi):
+    """Shallowest root of f in [lo, hi], or None when none is bracketed."""
+    bracket = find_bracket(f, lo, hi)
+    if bracket is None:
+        return None
+    return solve_bracketed(f, *bracket)
+
+# --- Stage chain ---
+def get_backbend_terms(data: roll_str_backbend_input):
+    """Resolve the lookups and the yield terms once for every height evaluated."""
+    str_model = get_str_model_lookups(data.str_model)
+    modules = get_material_modulus_lookup(data.material_type)
+    curve_at_yield = calc_curve_at_yield(data.yield_strength, data.thickness, modules)
+    return {
+        "str_model": str_model,
+        "modules": modules,
+        "curve_at_yield": curve_at_yield,
+        "bending_moment_to_yield": calc_bending_moment_to_yield(data.width, data.yield_strength, data.thickness),
+        "radius_off_coil_after_springback": calc_radius_off_coil_after_springback(RADIUS_OFF_COIL, curve_at_yield, CREEP_FACTOR),
+    }
+
+def get_percent_yield_value(r_ri, curve_at_yield):
+    """calc_percent_yield as a number, with no yield ("NONE") as 0."""
+    percent_yield, _ = calc_percent_yield(r_ri, curve_at_yield)
+    return 0 if percent_yield == "NONE" else percent_yield
+
+def run_stage(data, terms, res_rad, prev_radius):
+    return compute_stage_values(
+        res_rad, prev_radius, terms["modules"], data.width, data.thickness,
+        terms["curve_at_yield"], terms["bending_moment_to_yield"]
+    )
+
+def calc_first_up_yield(data: roll_str_backbend_input, terms, roll_height):
+    """Percent yield of the first-up pass at roll_height."""
+    str_model = terms["str_model"]
+    res_rad = calc_res_rad_outer(str_model["center_dist"], roll_height, data.thickness, str_model["top"], str_model["bottom"])
+    r_ri = 1 / res_rad - (1 / terms["radius_off_coil_after_springback"])
+    return get_percent_yield_value(r_ri, terms["curve_at_yield"])
+
+def evaluate_stage_chain(data: roll_str_backbend_input, terms, roll_height_first_up, mid_heights, roll_height_last):
+    """
+    Run the up/down stage chain as calculate_roll_str_backbend does for the
+    given heights. Returns the up-roll heights, their percent yield and force
+    required, and the strip curvature after springback off the last roll.
+    """
+    str_model = terms["str_model"]
+    center_dist = str_model["center_dist"]
+    up_heights, up_mbs, up_r_ris = [], [], []
+
+    res_rad = calc_res_rad_outer(center_dist, roll_height_first_up, data.thickness, str_model["top"], str_model["bottom"])
+    r_ri, mb, _, _, radius_after_springback = run_stage(data, terms, res_rad, terms["radius_off_coil_after_springback"])
+    up_heights.append(roll_height_first_up)
+    up_mbs.append(mb)
+    up_r_ris.append(r_ri)
+    _, _, _, _, radius_after_springback = run_stage(data, terms, -res_rad, radius_after_springback)
+
+    for roll_height_mid in mid_heights:
+        res_rad = calc_res_rad(center_dist, roll_height_mid, data.thickness)
+        r_ri, mb, _, _, radius_after_springback = run_stage(data, terms, res_rad, radius_after_springback)
+        up_heights.append(roll_height_mid)
+        up_mbs.append(mb)
+        up_r_ris.append(r_ri)
+        _, _, _, _, radius_after_springback = run_stage(data, terms, -res_rad, radius_after_springback)
+
+    res_rad = calc_res_rad_outer(center_dist, roll_height_last, data.thickness, str_model["top"], str_model["bottom"])
+    r_ri, mb, _, springback, _ = run_stage(data, terms, res_rad, radius_after_springback)
+    up_heights.append(roll_height_last)
+    up_mbs.append(mb)
+    up_r_ris.append(r_ri)
+
+    forces = [calc_force_required(mb, center_dist) for mb in up_mbs]
+    return {
+        "roll_heights": up_heights,
+        "percent_yields": [get_percent_yield_value(r_ri, terms["curve_at_yield"]) for r_ri in up_r_ris],
+        "forces_required": forces,
+        "force_checks": [check_force_required(force, str_model["jack_force_available"]) for force in forces],
+        "exit_curvature": (1 / res_rad) + springback,
+    }
+
+# --- Main Calculation ---
+def optimize_backbend_roll_heights(data: roll_str_backbend_input, target_yield=BACKBEND_CONFIRM, roll_counts=ROLL_COUNTS):
+    """
+    Solve the backbend roll heights for the material in data; data.num_str_rolls
+    is ignored in favour of roll_counts.
+
+    The first-up height is the shallowest one whose first pass yields
+    target_yield. For each roll count the mid heights halve toward the last
+    roll (calc_mid_heights) and the last height is solved so the strip exits
+    flat. Returns a dict with the solved first-up height, one entry per roll
+    count, and "num_str_rolls": the fewest rolls that exit flat with every
+    force check OK and every height within the straightener's max roll depth
+    with material (None if no count does).
+    """
+    if not 0 < target_yield < 1:
+        return "ERROR: Target yield must be between 0 and 1."
+    try:
+        terms = get_backbend_terms(data)
+    except Exception:
+        return "ERROR: Roll Str Backbend lookup failed."
+
+    str_model = terms["str_model"]
+    center_dist = str_model["center_dist"]
+    # Roll heights run from the deepest the rollers reach (at most half the center
+    # distance of penetration) up to the material thickness, where they stop bending the strip.
+    max_roll_depth = calc_max_roll_depth_with_material(
+        str_model["str_roll_dia"], data.thickness, center_dist, str_model["max_roll_depth_without_material"]
+    )
+    lo = max(data.thickness - center_dist / 2, max_roll_depth)
+    hi = data.thickness - HEIGHT_MARGIN * center_dist
+
+    try:
+        roll_height_first_up = find_root(lambda h: calc_first_up_yield(data, terms, h) - target_yield, lo, hi)
+        if roll_height_first_up is None:
+            return f"ERROR: No roll height within the max roll depth reaches {target_yield:.0%} yield on the first roll."
+
+        configurations = []
+        for num_str_rolls in roll_counts:
+            num_mid_rolls = get_num_mid_rolls(num_str_rolls)
+            if num_mid_rolls is None:
+                return "ERROR: Invalid number of rolls for backbend."
+
+            def exit_curvature(roll_height_last):
+                mid_heights = calc_mid_heights(num_mid_rolls, roll_height_first_up, roll_height_last)
+                chain = evaluate_stage_chain(data, terms, roll_height_first_up, mid_heights, roll_height_last)
+                return chain["exit_curvature"]
+
+            roll_height_last = find_root(exit_curvature, lo, hi)
+            flat = roll_height_last is not None
+            if not flat:
+                roll_height_last = calc_roll_height_last(data.thickness)
+            mid_heights = calc_mid_heights(num_mid_rolls, roll_height_first_up, roll_height_last)
+            chain = evaluate_stage_chain(data, terms, roll_height_first_up, mid_heights, roll_height_last)
+            chain.update({
+                "num_str_rolls": num_str_rolls,
+                "flat": flat,
+                "feasible": (
+                    flat and all(check == "OK" for check in chain["force_checks"])
+                    and all(height >= max_roll_depth for height in chain["roll_heights"])
+                ),
+            })
+            configurations.append(chain)
+    except Exception as e:
+        return f"ERROR: Calculation failed: {str(e)}"
+
+    best = next((config["num_str_rolls"] for config in configurations if config["feasible"]), None)
+    return {
+        "target_yield": target_yield,
+        "max_roll_depth_with_material": max_roll_depth,
+        "roll_height_first_up": roll_height_first_up,
+        "percent_yield_first_up": calc_first_up_yield(data, terms, roll_height_first_up),
+        "num_str_rolls": best,
+        "configurations": configurations,
+    }
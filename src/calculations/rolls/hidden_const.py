@@ -5,17 +5,20 @@ Hidden Constant Calculation for Roll Str Backbend
 from models import hidden_const_input
 from math import sqrt
 
-def calculate_hidden_const(input: hidden_const_input) -> float:
-    hidden_const = 10000  # Default value for hidden constant
-
+def calc_hidden_const(center_distance, radius_at_yield, thickness, sqrt=sqrt, power=pow):
+    """
+    Hidden constant from plain values; pass np.sqrt and utils.vectorized.power
+    to evaluate it over arrays.
+    """
     # Calculate needed values
-    radius = input.radius_at_yield / 2.49
-    c4 = input.center_distance / 3
-    radius_compared = sqrt((radius ** 2) - (c4 ** 2))
+    radius = radius_at_yield / 2.49
+    c4 = center_distance / 3
+    radius_compared = sqrt(power(radius, 2) - (c4 ** 2))
     engage = (radius - radius_compared) * 1.3
-    diff = input.thickness - engage
+    diff = thickness - engage
 
-    hidden_const = 10000 + (diff * 1000)
+    return 10000 + (diff * 1000)
 
-    return hidden_const
+def calculate_hidden_const(input: hidden_const_input) -> float:
+    return calc_hidden_const(input.center_distance, input.radius_at_yield, input.thickness)
 
@@ -5,9 +5,11 @@ Roll Str Backbend Calculation Module
 from models import roll_str_backbend_input, hidden_const_input
 from calculations.rolls.hidden_const import calculate_hidden_const
 from math import sqrt
+from dataclasses import dataclass
+from typing import Tuple
 
 from utils.shared import (
-    CREEP_FACTOR, RADIUS_OFF_COIL, roll_str_backbend_state
+    CREEP_FACTOR, RADIUS_OFF_COIL, EvaluationContext
 )
 
 from utils.lookup_tables import (
@@ -38,23 +40,31 @@ def get_num_mid_rolls(num_str_rolls):
     else:
         return None
 
+# Helpers taking power default to Python's pow; the batch module passes
+# utils.vectorized.power so they give the same results over arrays.
 def calc_curve_at_yield(yield_strength, thickness, modules):
     return 2 * yield_strength / (thickness * modules)
 
 def calc_radius_at_yield(curve_at_yield):
     return 1 / curve_at_yield
 
-def calc_bending_moment_to_yield(width, yield_strength, thickness):
-    return width * yield_strength * (thickness ** 2) / 6
+def calc_bending_moment_to_yield(width, yield_strength, thickness, power=pow):
+    return width * yield_strength * power(thickness, 2) / 6
+
+def calc_radius_off_coil_plastic(radius_off_coil, curve_at_yield, creep_factor, power=pow):
+    return 1 / ((1 / radius_off_coil) - ((abs(radius_off_coil) / radius_off_coil) * (1.5 * (1 - creep_factor)) * curve_at_yield * (1 - ((1/3) * power(curve_at_yield / (1 / radius_off_coil), 2)))))
+
+def calc_radius_off_coil_elastic(radius_off_coil, creep_factor):
+    if creep_factor == 0:
+        return abs(radius_off_coil) / radius_off_coil * 99999
+    else:
+        return radius_off_coil / creep_factor
 
 def calc_radius_off_coil_after_springback(radius_off_coil, curve_at_yield, creep_factor):
     if abs(1 / radius_off_coil) > curve_at_yield:
-        return 1 / ((1 / radius_off_coil) - ((abs(radius_off_coil) / radius_off_coil) * (1.5 * (1 - creep_factor)) * curve_at_yield * (1 - ((1/3) * (curve_at_yield / (1 / radius_off_coil)) ** 2))))
+        return calc_radius_off_coil_plastic(radius_off_coil, curve_at_yield, creep_factor)
     else:
-        if creep_factor == 0:
-            return abs(radius_off_coil) / radius_off_coil * 99999
-        else:
-            return radius_off_coil / creep_factor
+        return calc_radius_off_coil_elastic(radius_off_coil, creep_factor)
 
 def calc_one_radius_off_coil(radius_off_coil_after_springback):
     return 1 / radius_off_coil_after_springback
@@ -110,15 +120,43 @@ def calc_mid_heights(num_mid_rolls, roll_height_first_up, roll_height_last):
         prev_height = mid_height
     return mid_heights
 
+def calc_res_rad(center_dist, roll_height, thickness, power=pow):
+    """Resulting radius under a middle roller."""
+    numerator = (-0.25 * center_dist ** 2) - power(roll_height, 2) + (2 * roll_height * thickness) - power(thickness, 2)
+    denominator = 4 * (roll_height + 1e-8) - 4 * thickness
+    return numerator / denominator
+
+def calc_res_rad_outer(center_dist, roll_height, thickness, top, bottom, power=pow):
+    """Resulting radius under the first and last rollers, scaled by the model's top/bottom factors."""
+    numerator = (-0.25 * center_dist ** 2) - power(roll_height, 2) + (2 * roll_height * thickness) - power(thickness, 2)
+    denominator = 4 * (roll_height + 1e-8) - 4 * thickness
+    return (1.314 - top * thickness + bottom * roll_height) * numerator / denominator
+
+def calc_r_ri(res_rad, prev_radius_after_springback):
+    return 1 / res_rad - (1 / prev_radius_after_springback)
+
+def calc_mb_elastic(r_ri, modules, width, thickness, power=pow):
+    return (modules * width * power(thickness, 3)) / 12 * r_ri
+
+def calc_mb_plastic(r_ri, curve_at_yield, bending_moment_to_yield, power=pow):
+    return (abs(r_ri) / r_ri) * 1.5 * bending_moment_to_yield * (1 - (1/3) * power(curve_at_yield / r_ri, 2))
+
+def calc_springback_values(mb, res_rad, curve_at_yield, bending_moment_to_yield):
+    """Moment ratio, springback and radius after springback for a pass with moment mb."""
+    mb_my = mb / bending_moment_to_yield
+    springback = -curve_at_yield * mb_my
+    radius_after_springback = 1 / ((1 / res_rad) + springback)
+    return mb_my, springback, radius_after_springback
+
 def compute_stage_values(res_rad, prev_radius_after_springback, modules, width, thickness, curve_at_yield, bending_moment_to_yield):
-    r_ri_val = 1 / res_rad - (1 / prev_radius_after_springback)
+    r_ri_val = calc_r_ri(res_rad, prev_radius_after_springback)
     if abs(r_ri_val) < curve_at_yield:
-        mb_val = (modules * width * thickness ** 3) / 12 * r_ri_val
+        mb_val = calc_mb_elastic(r_ri_val, modules, width, thickness)
     else:
-        mb_val = (abs(r_ri_val) / r_ri_val) * 1.5 * bending_moment_to_yield * (1 - (1/3) * ((curve_at_yield / r_ri_val) ** 2))
-    mb_my_val = mb_val / bending_moment_to_yield
-    springback_val = -curve_at_yield * mb_my_val
-    radius_after_springback_val = 1 / ((1 / res_rad) + springback_val)
+        mb_val = calc_mb_plastic(r_ri_val, curve_at_yield, bending_moment_to_yield)
+    mb_my_val, springback_val, radius_after_springback_val = calc_springback_values(
+        mb_val, res_rad, curve_at_yield, bending_moment_to_yield
+    )
     return r_ri_val, mb_val, mb_my_val, springback_val, radius_after_springback_val
 
 def calc_percent_yield(r_ri, curve_at_yield):
@@ -155,7 +193,124 @@ def calc_radius_after_springback_last(res_rad_last, springback_last):
     else:
         return 1 / ((1 / res_rad_last) + springback_last)
 
-def calculate_roll_str_backbend(data: roll_str_backbend_input):
+# --- Result ---
+@dataclass(frozen=True)
+class backbend_stage:
+    """
+    One roller pass. Down passes carry no roll height, force or yield strain
+    count; those fields are None.
+    """
+    __slots__ = (
+        "roll_height", "res_rad", "r_ri", "mb", "mb_my", "springback", "radius_after_springback",
+        "force_required", "force_required_check", "percent_yield", "number_of_yield_strains"
+    )
+    roll_height: float
+    res_rad: float
+    r_ri: float
+    mb: float
+    mb_my: float
+    springback: float
+    radius_after_springback: float
+    force_required: float
+    force_required_check: str
+    percent_yield: float
+    number_of_yield_strains: float
+
+    def to_dict(self, suffix):
+        """Rounded output keyed as "<field>_<suffix>", e.g. "mb_first_up"."""
+        last = suffix == "last"
+        res_rad_digits, r_ri_digits, mb_my_digits = (4, 3, 3) if last else (3, 4, 4)
+        result = {}
+        if self.roll_height is not None:
+            result["roll_height"] = self.roll_height if suffix == "first_up" else round(self.roll_height, 3)
+        result["res_rad"] = round(self.res_rad, res_rad_digits)
+        result["r_ri"] = round(self.r_ri, r_ri_digits)
+        result["mb"] = round(self.mb, 3)
+        result["mb_my"] = round(self.mb_my, mb_my_digits)
+        result["springback"] = round(self.springback, 4)
+        result["radius_after_springback"] = (
+            self.radius_after_springback if isinstance(self.radius_after_springback, str)
+            else round(self.radius_after_springback, 3)
+        )
+        if self.force_required is not None:
+            result["force_required"] = round(self.force_required, 3)
+            result["force_required_check"] = self.force_required_check
+        result["percent_yield"] = self.percent_yield
+        if self.number_of_yield_strains is not None:
+            result["number_of_yield_strains"] = self.number_of_yield_strains
+        return {f"{key}_{suffix}": value for key, value in result.items()}
+
+@dataclass(frozen=True)
+class roll_str_backbend_output:
+    """Unrounded backbend results; to_dict() gives the rounded JSON output."""
+    __slots__ = (
+        "num_str_rolls", "roll_diameter", "center_distance", "modules", "jack_force_available",
+        "max_roll_depth_without_material", "max_roll_depth_with_material", "radius_off_coil",
+        "radius_off_coil_after_springback", "one_radius_off_coil", "curve_at_yield", "radius_at_yield",
+        "bending_moment_to_yield", "hidden_const", "roller_depth_required", "roller_depth_required_check",
+        "roller_force_required", "roller_force_required_check", "percent_yield_check",
+        "first_up", "first_down", "mid", "last"
+    )
+    num_str_rolls: int
+    roll_diameter: float
+    center_distance: float
+    modules: float
+    jack_force_available: float
+    max_roll_depth_without_material: float
+    max_roll_depth_with_material: float
+    radius_off_coil: float
+    radius_off_coil_after_springback: float
+    one_radius_off_coil: float
+    curve_at_yield: float
+    radius_at_yield: float
+    bending_moment_to_yield: float
+    hidden_const: float
+    roller_depth_required: float
+    roller_depth_required_check: str
+    roller_force_required: float
+    roller_force_required_check: str
+    percent_yield_check: str
+    first_up: backbend_stage
+    first_down: backbend_stage
+    mid: Tuple[Tuple[backbend_stage, backbend_stage], ...]
+    last: backbend_stage
+
+    def to_dict(self):
+        result = {
+            "num_str_rolls": self.num_str_rolls,
+            "roll_diameter": round(self.roll_diameter, 4),
+            "center_distance": round(self.center_distance, 4),
+            "modules": self.modules,
+            "jack_force_available": self.jack_force_available,
+            "max_roll_depth_without_material": round(self.max_roll_depth_without_material, 3),
+            "max_roll_depth_with_material": round(self.max_roll_depth_with_material, 3),
+            "radius_off_coil": round(self.radius_off_coil, 3),
+            "radius_off_coil_after_springback": round(self.radius_off_coil_after_springback, 3),
+            "one_radius_off_coil": round(self.one_radius_off_coil, 3),
+            "curve_at_yield": round(self.curve_at_yield, 4),
+            "radius_at_yield": round(self.radius_at_yield, 4),
+            "bending_moment_to_yield": round(self.bending_moment_to_yield, 4),
+            "hidden_const": self.hidden_const,
+            "roller_depth_required": round(self.roller_depth_required, 3),
+            "roller_depth_required_check": self.roller_depth_required_check,
+            "roller_force_required": round(self.roller_force_required, 3),
+            "roller_force_required_check": self.roller_force_required_check,
+            "percent_yield_check": self.percent_yield_check,
+            "first_up": self.first_up.to_dict("first_up"),
+            "first_down": self.first_down.to_dict("first_down"),
+        }
+        for idx, (mid_up, mid_down) in enumerate(self.mid, start=1):
+            result[f"mid_up_{idx}"] = mid_up.to_dict("mid_up")
+            result[f"mid_down_{idx}"] = mid_down.to_dict("mid_down")
+        result["last"] = self.last.to_dict("last")
+        return result
+
+# --- Main Calculation ---
+def calculate_roll_str_backbend(data: roll_str_backbend_input, context: EvaluationContext = None):
+    """
+    Backbend stages for the configuration in data. The first-up percent yield
+    is recorded in context.roll_str_backbend when a context is given.
+    """
     try:
         str_model = get_str_model_lookups(data.str_model)
         modules = get_material_modulus_lookup(data.material_type)
@@ -186,9 +341,9 @@ def calculate_roll_str_backbend(data: roll_str_backbend_input):
     mid_heights = calc_mid_heights(num_mid_rolls, roll_height_first_up, roll_height_last)
 
     # First roller (up and down)
-    numerator_first = (-0.25 * str_model["center_dist"] ** 2) - (roll_height_first_up ** 2) + (2 * roll_height_first_up * data.thickness) - data.thickness ** 2
-    denominator_first = 4 * (roll_height_first_up + 1e-8) - 4 * data.thickness
-    res_rad_first_up = (1.314 - str_model["top"] * data.thickness + str_model["bottom"] * roll_height_first_up) * numerator_first / denominator_first
+    res_rad_first_up = calc_res_rad_outer(
+        str_model["center_dist"], roll_height_first_up, data.thickness, str_model["top"], str_model["bottom"]
+    )
     res_rad_first_down = -res_rad_first_up
 
     r_ri_first_up, mb_first_up, mb_my_first_up, springback_first_up, radius_after_springback_first_up = compute_stage_values(
@@ -200,12 +355,10 @@ def calculate_roll_str_backbend(data: roll_str_backbend_input):
     r_ri_first_up = 1 / res_rad_first_up - (1 / radius_off_coil_after_springback)
 
     # Mid rollers
-    mid_results = {}
+    mid_results = []
     prev_radius_after_springback_down = radius_after_springback_first_down
     for idx, roll_height_mid in enumerate(mid_heights, start=1):
-        numerator_mid = (-0.25 * str_model["center_dist"] ** 2) - (roll_height_mid ** 2) + (2 * roll_height_mid * data.thickness) - data.thickness ** 2
-        denominator_mid = 4 * (roll_height_mid + 1e-8) - 4 * data.thickness
-        res_rad_mid_up = numerator_mid / denominator_mid
+        res_rad_mid_up = calc_res_rad(str_model["center_dist"], roll_height_mid, data.thickness)
         res_rad_mid_down = -res_rad_mid_up
 
         r_ri_mid_up, mb_mid_up, mb_my_mid_up, springback_mid_up, radius_after_springback_mid_up = compute_stage_values(
@@ -220,35 +373,24 @@ def calculate_roll_str_backbend(data: roll_str_backbend_input):
         percent_yield_mid_down, _ = calc_percent_yield(r_ri_mid_down, curve_at_yield)
         force_required_check_mid = check_force_required(force_required_mid, str_model["jack_force_available"])
 
-        mid_results[f"mid_up_{idx}"] = {
-            "roll_height_mid_up": round(roll_height_mid, 3),
-            "res_rad_mid_up": round(res_rad_mid_up, 3),
-            "r_ri_mid_up": round(r_ri_mid_up, 4),
-            "mb_mid_up": round(mb_mid_up, 3),
-            "mb_my_mid_up": round(mb_my_mid_up, 4),
-            "springback_mid_up": round(springback_mid_up, 4),
-            "radius_after_springback_mid_up": round(radius_after_springback_mid_up, 3),
-            "force_required_mid_up": round(force_required_mid, 3),
-            "force_required_check_mid_up": force_required_check_mid,
-            "percent_yield_mid_up": percent_yield_mid_up,
-            "number_of_yield_strains_mid_up": number_of_yield_strains_mid,
-        }
-        mid_results[f"mid_down_{idx}"] = {
-            "res_rad_mid_down": round(res_rad_mid_down, 3),
-            "r_ri_mid_down": round(r_ri_mid_down, 4),
-            "mb_mid_down": round(mb_mid_down, 3),
-            "mb_my_mid_down": round(mb_my_mid_down, 4),
-            "springback_mid_down": round(springback_mid_down, 4),
-            "radius_after_springback_mid_down": round(radius_after_springback_mid_down, 3),
-            "percent_yield_mid_down": percent_yield_mid_down,
-        }
+        mid_results.append((
+            backbend_stage(
+                roll_height_mid, res_rad_mid_up, r_ri_mid_up, mb_mid_up, mb_my_mid_up, springback_mid_up,
+                radius_after_springback_mid_up, force_required_mid, force_required_check_mid,
+                percent_yield_mid_up, number_of_yield_strains_mid
+            ),
+            backbend_stage(
+                None, res_rad_mid_down, r_ri_mid_down, mb_mid_down, mb_my_mid_down, springback_mid_down,
+                radius_after_springback_mid_down, None, None, percent_yield_mid_down, None
+            ),
+        ))
 
         prev_radius_after_springback_down = radius_after_springback_mid_down
 
     # Last roller
-    numerator_last = (-0.25 * str_model["center_dist"] ** 2) - (roll_height_last ** 2) + (2 * roll_height_last * data.thickness) - data.thickness ** 2
-    denominator_last = 4 * (roll_height_last + 1e-8) - 4 * data.thickness
-    res_rad_last = (1.314 - str_model["top"] * data.thickness + str_model["bottom"] * roll_height_last) * numerator_last / denominator_last
+    res_rad_last = calc_res_rad_outer(
+        str_model["center_dist"], roll_height_last, data.thickness, str_model["top"], str_model["bottom"]
+    )
 
     r_ri_last, mb_last, mb_my_last, springback_last, radius_after_springback_last_val = compute_stage_values(
         res_rad_last, prev_radius_after_springback_down, modules, data.width, data.thickness, curve_at_yield, bending_moment_to_yield
@@ -259,10 +401,11 @@ def calculate_roll_str_backbend(data: roll_str_backbend_input):
     percent_yield_first_up, number_of_yield_strains_first = calc_percent_yield(r_ri_first_up, curve_at_yield)
     percent_yield_first_down, _ = calc_percent_yield(r_ri_first_down, curve_at_yield)
 
-    if percent_yield_first_up == "NONE":
-        roll_str_backbend_state["percent_material_yielded"] = 0
-    else:
-        roll_str_backbend_state["percent_material_yielded"] = percent_yield_first_up
+    if context is not None:
+        if percent_yield_first_up == "NONE":
+            context.roll_str_backbend.percent_material_yielded = 0
+        else:
+            context.roll_str_backbend.percent_material_yielded = percent_yield_first_up
 
     percent_yield_last, number_of_yield_strains_last = calc_percent_yield(r_ri_last, curve_at_yield)
     force_required_first = calc_force_required(mb_first_up, str_model["center_dist"])
@@ -271,63 +414,26 @@ def calculate_roll_str_backbend(data: roll_str_backbend_input):
     force_required_check_first = check_force_required(force_required_first, str_model["jack_force_available"])
     force_required_check_last = check_force_required(force_required_last, str_model["jack_force_available"])
 
-    result = {
-        "num_str_rolls": data.num_str_rolls,
-        "roll_diameter": round(str_model["str_roll_dia"], 4),
-        "center_distance": round(str_model["center_dist"], 4),
-        "modules": modules,
-        "jack_force_available": str_model["jack_force_available"],
-        "max_roll_depth_without_material": round(str_model["max_roll_depth_without_material"], 3),
-        "max_roll_depth_with_material": round(max_roll_depth_with_material, 3),
-        "radius_off_coil": round(radius_off_coil, 3),
-        "radius_off_coil_after_springback": round(radius_off_coil_after_springback, 3),
-        "one_radius_off_coil": round(one_radius_off_coil, 3),
-        "curve_at_yield": round(curve_at_yield, 4),
-        "radius_at_yield": round(radius_at_yield, 4),
-        "bending_moment_to_yield": round(bending_moment_to_yield, 4),
-        "hidden_const": main_value,
-        "roller_depth_required": round(roller_depth_required, 3),
-        "roller_depth_required_check": roller_depth_required_check,
-        "roller_force_required": round(roller_force_required, 3),
-        "roller_force_required_check": roller_force_required_check,
-        "percent_yield_check": percent_yield_check,
-    }
-    result["first_up"] = {
-        "roll_height_first_up": roll_height_first_up,
-        "res_rad_first_up": round(res_rad_first_up, 3),
-        "r_ri_first_up": round(r_ri_first_up, 4),
-        "mb_first_up": round(mb_first_up, 3),
-        "mb_my_first_up": round(mb_my_first_up, 4),
-        "springback_first_up": round(springback_first_up, 4),
-        "radius_after_springback_first_up": round(radius_after_springback_first_up, 3),
-        "force_required_first_up": round(force_required_first, 3),
-        "force_required_check_first_up": force_required_check_first,
-        "percent_yield_first_up": percent_yield_first_up,
-        "number_of_yield_strains_first_up": number_of_yield_strains_first,
-    }
-    result["first_down"] = {
-        "res_rad_first_down": round(res_rad_first_down, 3),
-        "r_ri_first_down": round(r_ri_first_down, 4),
-        "mb_first_down": round(mb_first_down, 3),
-        "mb_my_first_down": round(mb_my_first_down, 4),
-        "springback_first_down": round(springback_first_down, 4),
-        "radius_after_springback_first_down": round(radius_after_springback_first_down, 3),
-        "percent_yield_first_down": percent_yield_first_down,
-    }
-    for mid_key, mid_data in mid_results.items():
-        result[mid_key] = mid_data
-    result["last"] = {
-        "roll_height_last": round(roll_height_last, 3),
-        "res_rad_last": round(res_rad_last, 4),
-        "r_ri_last": round(r_ri_last, 3),
-        "mb_last": round(mb_last, 3),
-        "mb_my_last": round(mb_my_last, 3),
-        "springback_last": round(springback_last, 4),
-        "radius_after_springback_last": round(radius_after_springback_last, 3) if not isinstance(radius_after_springback_last, str) else radius_after_springback_last,
-        "force_required_last": round(force_required_last, 3),
-        "force_required_check_last": force_required_check_last,
-        "percent_yield_last": percent_yield_last,
-        "number_of_yield_strains_last": number_of_yield_strains_last,
-    }
+    first_up = backbend_stage(
+        roll_height_first_up, res_rad_first_up, r_ri_first_up, mb_first_up, mb_my_first_up, springback_first_up,
+        radius_after_springback_first_up, force_required_first, force_required_check_first,
+        percent_yield_first_up, number_of_yield_strains_first
+    )
+    first_down = backbend_stage(
+        None, res_rad_first_down, r_ri_first_down, mb_first_down, mb_my_first_down, springback_first_down,
+        radius_after_springback_first_down, None, None, percent_yield_first_down, None
+    )
+    last = backbend_stage(
+        roll_height_last, res_rad_last, r_ri_last, mb_last, mb_my_last, springback_last,
+        radius_after_springback_last, force_required_last, force_required_check_last,
+        percent_yield_last, number_of_yield_strains_last
+    )
 
-    return result
\ No newline at end of file
+    return roll_str_backbend_output(
+        data.num_str_rolls, str_model["str_roll_dia"], str_model["center_dist"], modules,
+        str_model["jack_force_available"], str_model["max_roll_depth_without_material"], max_roll_depth_with_material,
+        radius_off_coil, radius_off_coil_after_springback, one_radius_off_coil, curve_at_yield, radius_at_yield,
+        bending_moment_to_yield, main_value, roller_depth_required, roller_depth_required_check,
+        roller_force_required, roller_force_required_check, percent_yield_check,
+        first_up, first_down, tuple(mid_results), last
+    )
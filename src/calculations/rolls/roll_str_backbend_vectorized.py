@@ -0,0 +1,305 @@
+"""
+Batched Roll Str Backbend Calculation Module
+
+Array version of calculate_roll_str_backbend over many materials and the 7, 9
+and 11 roll straighteners at once. The straightener model lookups are resolved
+once; yield strength, thickness, width and material type may be arrays that
+broadcast together. Every roll count shares the first and mid passes of the
+longest chain (calc_mid_heights does not depend on the roll count), so the
+stage recurrence runs once over the material axis and only the last roll is
+evaluated per roll count.
+
+calculate_roll_str_backbend_coil_profile uses the same chain to sweep the
+incoming coil set from the coil OD to the ID for one roll setting.
+"""
+
+import numpy as np
+
+from models import roll_str_backbend_input
+from utils.vectorized import power
+from utils.shared import CREEP_FACTOR, RADIUS_OFF_COIL, ROLL_COUNTS
+from utils.lookup_tables import get_material_modulus
+from calculations.rolls.hidden_const import calc_hidden_const
+from calculations.rolls.roll_str_backbend import (
+    get_str_model_lookups, get_num_mid_rolls,
+    calc_curve_at_yield, calc_radius_at_yield, calc_bending_moment_to_yield,
+    calc_radius_off_coil_plastic, calc_radius_off_coil_elastic, calc_roll_height_first_up, calc_roll_height_last,
+    calc_mid_heights, calc_res_rad, calc_res_rad_outer, calc_r_ri, calc_mb_elastic, calc_mb_plastic,
+    calc_springback_values, calc_force_required
+)
+
+# Exit curvature below which calc_radius_after_springback_last reports "FLAT"
+FLAT_CURVATURE = 1e-5
+
+STAGE_FIELDS = (
+    "roll_height", "res_rad", "r_ri", "mb", "mb_my", "springback", "radius_after_springback",
+    "force_required", "percent_yield", "number_of_yield_strains"
+)
+
+# --- Lookups ---
+def get_moduli(material_type):
+    """Modulus for each material type, looked up once per distinct value."""
+    material_type = np.asarray(material_type, dtype=object)
+    moduli = np.empty(material_type.shape)
+    for value in set(material_type.flat):
+        moduli[material_type == value] = get_material_modulus(value)
+    return moduli
+
+def get_stage_names(num_mid_rolls):
+    names = ["first_up", "first_down"]
+    for idx in range(1, num_mid_rolls + 1):
+        names += [f"mid_up_{idx}", f"mid_down_{idx}"]
+    return tuple(names + ["last"])
+
+# --- Calculations ---
+# The scalar formulas from roll_str_backbend run on arrays as they are; these
+# pick between their branches per element where the scalar code uses an if.
+def calc_radius_off_coil_after_springback_masked(radius_off_coil, curve_at_yield, creep_factor):
+    plastic = calc_radius_off_coil_plastic(radius_off_coil, curve_at_yield, creep_factor, power=power)
+    elastic = calc_radius_off_coil_elastic(radius_off_coil, creep_factor)
+    return np.where(np.abs(1 / radius_off_coil) > curve_at_yield, plastic, elastic)
+
+def calc_main_value_masked(center_dist, radius_at_yield, thickness):
+    """calc_main_value over arrays; NaN where the hidden constant's square root is negative."""
+    return calc_hidden_const(center_dist, radius_at_yield, thickness, sqrt=np.sqrt, power=power)
+
+def calc_roll_height_first_up_masked(main_value):
+    """calc_roll_height_first_up per element, NaN where it is "TOO DEEP!"."""
+    heights = [calc_roll_height_first_up(value) for value in main_value.flat]
+    return np.array([np.nan if height == "TOO DEEP!" else height for height in heights]).reshape(main_value.shape)
+
+def compute_stage_values_masked(res_rad, prev_radius_after_springback, modules, width, thickness, curve_at_yield,
+                                bending_moment_to_yield):
+    """compute_stage_values over arrays, choosing the elastic or plastic moment per element."""
+    r_ri = calc_r_ri(res_rad, prev_radius_after_springback)
+    mb = np.where(
+        np.abs(r_ri) < curve_at_yield,
+        calc_mb_elastic(r_ri, modules, width, thickness, power=power),
+        calc_mb_plastic(r_ri, curve_at_yield, bending_moment_to_yield, power=power),
+    )
+    mb_my, springback, radius_after_springback = calc_springback_values(mb, res_rad, curve_at_yield, bending_moment_to_yield)
+    return r_ri, mb, mb_my, springback, radius_after_springback
+
+def calc_percent_yield_masked(r_ri, curve_at_yield):
+    """Percent yield and yield strain count; 0 and NaN where the material does not yield."""
+    yielded = np.abs(r_ri) > curve_at_yield
+    percent_yield = np.where(yielded, 1 - np.abs(curve_at_yield / r_ri), 0.0)
+    number_of_yield_strains = np.where(yielded, 1 / (1 - percent_yield), np.nan)
+    return percent_yield, number_of_yield_strains, yielded
+
+def check_percent_yield(percent_yield, yielded):
+    """True where calc_percent_yield_check gives "OK"."""
+    return yielded & (percent_yield >= 0.47) & (percent_yield <= 0.7)
+
+def run_stage(res_rad, prev_radius, terms, roll_height=None):
+    """
+    One pass as a dict of STAGE_FIELDS arrays shaped like prev_radius. Down
+    passes (no roll height) carry NaN height, force and yield strain count.
+    """
+    r_ri, mb, mb_my, springback, radius_after_springback = compute_stage_values_masked(
+        res_rad, prev_radius, terms["modules"], terms["width"], terms["thickness"],
+        terms["curve_at_yield"], terms["bending_moment_to_yield"]
+    )
+    percent_yield, number_of_yield_strains, yielded = calc_percent_yield_masked(r_ri, terms["curve_at_yield"])
+    up = roll_height is not None
+    missing = np.full(r_ri.shape, np.nan)
+    return {
+        "roll_height": np.broadcast_to(roll_height, r_ri.shape) if up else missing,
+        "res_rad": np.broadcast_to(res_rad, r_ri.shape),
+        "r_ri": r_ri,
+        "mb": mb,
+        "mb_my": mb_my,
+        "springback": springback,
+        "radius_after_springback": radius_after_springback,
+        "force_required": calc_force_required(mb, terms["center_dist"]) if up else missing,
+        "percent_yield": percent_yield,
+        "number_of_yield_strains": number_of_yield_strains if up else missing,
+        "yielded": yielded,
+    }
+
+# --- Main Calculation ---
+def calculate_roll_str_backbend_batch(data: roll_str_backbend_input, yield_strength=None, thickness=None, width=None,
+                                      material_type=None, roll_counts=ROLL_COUNTS, radius_off_coil=RADIUS_OFF_COIL):
+    """
+    Evaluate calculate_roll_str_backbend for every material and roll count.
+
+    Any of yield_strength, thickness, width and material_type left as None falls
+    back to data; the arrays, and radius_off_coil (the incoming coil set radius),
+    broadcast to the material shape and data.num_str_rolls is ignored in favour
+    of roll_counts. Stage fields (STAGE_FIELDS) are
+    unrounded arrays shaped (roll counts, stages, *material shape) with the
+    stages ordered as in "stages": first up and down, the mid pairs of the
+    longest chain, then last. Stages a roll count does not have are NaN and
+    False in "stage_present". "force_required_check" is True where the scalar
+    check is "OK" and "flat" where the strip leaves the last roll "FLAT".
+    "valid" is False where the scalar function would fail (first-up height
+    "TOO DEEP!" or a failed hidden constant); "all_checks" adds the first-up
+    percent yield check and the force check of every stage the roll count has.
+    "exit_curvature" is the strip curvature after springback off the last roll,
+    shaped (roll counts, *material shape).
+    """
+    try:
+        str_model = get_str_model_lookups(data.str_model)
+        modules = get_moduli(data.material_type if material_type is None else material_type)
+    except Exception:
+        return "ERROR: Roll Str Backbend lookup failed."
+    if str_model["top"] is None or str_model["bottom"] is None:
+        return f"ERROR: Str model {data.str_model} has no backbend roll factors."
+
+    num_mid_rolls = [get_num_mid_rolls(num_str_rolls) for num_str_rolls in roll_counts]
+    if not roll_counts or None in num_mid_rolls:
+        return "ERROR: Invalid number of rolls for backbend."
+
+    yield_strength, thickness, width = (
+        np.asarray(data_value if value is None else value, dtype=float)
+        for value, data_value in (
+            (yield_strength, data.yield_strength), (thickness, data.thickness), (width, data.width),
+        )
+    )
+    yield_strength, thickness, width, modules, radius_off_coil = np.broadcast_arrays(
+        yield_strength, thickness, width, modules, np.asarray(radius_off_coil, dtype=float)
+    )
+    center_dist = str_model["center_dist"]
+    jack_force_available = str_model["jack_force_available"]
+    stages = get_stage_names(max(num_mid_rolls))
+    shape = (len(roll_counts), len(stages)) + thickness.shape
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        curve_at_yield = calc_curve_at_yield(yield_strength, thickness, modules)
+        radius_at_yield = calc_radius_at_yield(curve_at_yield)
+        terms = {
+            "modules": modules,
+            "width": width,
+            "thickness": thickness,
+            "center_dist": center_dist,
+            "curve_at_yield": curve_at_yield,
+            "bending_moment_to_yield": calc_bending_moment_to_yield(width, yield_strength, thickness, power=power),
+        }
+        radius_off_coil_after_springback = calc_radius_off_coil_after_springback_masked(
+            radius_off_coil, curve_at_yield, CREEP_FACTOR
+        )
+        main_value = calc_main_value_masked(center_dist, radius_at_yield, thickness)
+        roll_height_first_up = calc_roll_height_first_up_masked(main_value)
+        roll_height_last = calc_roll_height_last(thickness)
+
+        # Shared chain: first pass and the mid passes of the longest roll count
+        res_rad = calc_res_rad_outer(
+            center_dist, roll_height_first_up, thickness, str_model["top"], str_model["bottom"], power=power
+        )
+        chain = [run_stage(res_rad, radius_off_coil_after_springback, terms, roll_height_first_up)]
+        chain.append(run_stage(-res_rad, chain[-1]["radius_after_springback"], terms))
+        for roll_height_mid in calc_mid_heights(max(num_mid_rolls), roll_height_first_up, roll_height_last):
+            res_rad = calc_res_rad(center_dist, roll_height_mid, thickness, power=power)
+            chain.append(run_stage(res_rad, chain[-1]["radius_after_springback"], terms, roll_height_mid))
+            chain.append(run_stage(-res_rad, chain[-1]["radius_after_springback"], terms))
+
+        # Last roll, entered from the first-down or mid-down pass of each roll count
+        res_rad_last = calc_res_rad_outer(
+            center_dist, roll_height_last, thickness, str_model["top"], str_model["bottom"], power=power
+        )
+        prev_radius = np.stack([chain[1 + 2 * count]["radius_after_springback"] for count in num_mid_rolls])
+        last = run_stage(res_rad_last, prev_radius, terms, roll_height_last)
+        exit_curvature = (1 / res_rad_last) + last["springback"]
+        flat = np.abs(exit_curvature) < FLAT_CURVATURE
+
+    table = {field: np.full(shape, np.nan) for field in STAGE_FIELDS}
+    yielded = np.zeros(shape, dtype=bool)
+    stage_present = np.zeros(shape[:2], dtype=bool)
+    for i, count in enumerate(num_mid_rolls):
+        used = 2 + 2 * count
+        stage_present[i, :used] = True
+        stage_present[i, -1] = True
+        for j, stage in enumerate(chain[:used]):
+            for field in STAGE_FIELDS:
+                table[field][i, j] = stage[field]
+            yielded[i, j] = stage["yielded"]
+        for field in STAGE_FIELDS:
+            table[field][i, -1] = last[field][i]
+        yielded[i, -1] = last["yielded"][i]
+
+    valid = ~np.isnan(roll_height_first_up)
+    is_up = np.array(["down" not in stage for stage in stages]).reshape((1, len(stages)) + (1,) * thickness.ndim)
+    force_required_check = is_up & (table["force_required"] <= jack_force_available)
+    percent_yield_check = valid & check_percent_yield(chain[0]["percent_yield"], chain[0]["yielded"])
+    # Stages a roll count does not have are NaN padding, not failed checks
+    present = stage_present.reshape(stage_present.shape + (1,) * thickness.ndim)
+    force_checks = np.all(force_required_check | ~is_up | ~present, axis=1) & valid
+    all_checks = force_checks & percent_yield_check
+
+    result = {
+        "roll_counts": np.array(roll_counts),
+        "stages": stages,
+        "stage_present": stage_present,
+        "center_distance": center_dist,
+        "jack_force_available": jack_force_available,
+        "modules": modules,
+        "curve_at_yield": curve_at_yield,
+        "radius_at_yield": radius_at_yield,
+        "bending_moment_to_yield": terms["bending_moment_to_yield"],
+        "radius_off_coil": radius_off_coil,
+        "radius_off_coil_after_springback": radius_off_coil_after_springback,
+        "hidden_const": main_value,
+    }
+    result.update(table)
+    result.update({
+        "yielded": yielded,
+        "force_required_check": force_required_check,
+        "exit_curvature": exit_curvature,
+        "flat": flat & valid,
+        "valid": valid,
+        "percent_yield_check": percent_yield_check,
+        "all_checks": all_checks,
+    })
+    return result
+
+def calculate_roll_str_backbend_coil_profile(data: roll_str_backbend_input, coil_od, coil_id, num_points=50,
+                                             flat_curvature=FLAT_CURVATURE):
+    """
+    Sweep the incoming coil set radius from coil_od / 2 down to coil_id / 2
+    (signed like RADIUS_OFF_COIL) through the roll setting calculate_roll_str_backbend
+    picks for data, which does not change along the coil.
+
+    Returns unrounded arrays over the sweep: the final radius and exit curvature
+    after springback off the last roll, the first-up and last percent yield, and
+    masks for a flat exit (|exit curvature| < flat_curvature), the first-up
+    percent yield check and the force checks. "straightens_whole_coil" is True
+    when every point exits flat; "worst_coil_dia" is where the exit curvature is
+    largest.
+    """
+    if coil_id <= 0 or coil_od <= coil_id:
+        return "ERROR: Coil OD must be larger than a positive coil ID."
+    if num_points < 2:
+        return "ERROR: Coil profile needs at least two points."
+
+    coil_dia = np.linspace(coil_od, coil_id, num_points)
+    radius_off_coil = np.copysign(coil_dia / 2, RADIUS_OFF_COIL)
+    result = calculate_roll_str_backbend_batch(data, roll_counts=(data.num_str_rolls,), radius_off_coil=radius_off_coil)
+    if isinstance(result, str):
+        return result
+    if not result["valid"].all():
+        return "ERROR: Roll Str Backbend first up roll height is TOO DEEP!"
+
+    exit_curvature = result["exit_curvature"][0]
+    flat = np.abs(exit_curvature) < flat_curvature
+    force_checks = np.all(result["force_required_check"][0] | np.isnan(result["force_required"][0]), axis=0)
+    percent_yield_check = result["percent_yield_check"]
+    worst = int(np.argmax(np.abs(exit_curvature)))
+    return {
+        "num_str_rolls": data.num_str_rolls,
+        "coil_dia": coil_dia,
+        "radius_off_coil": radius_off_coil,
+        "radius_off_coil_after_springback": result["radius_off_coil_after_springback"],
+        "roll_height_first_up": float(result["roll_height"][0, 0, 0]),
+        "roll_height_last": float(result["roll_height"][0, -1, 0]),
+        "radius_after_springback_last": result["radius_after_springback"][0, -1],
+        "exit_curvature": exit_curvature,
+        "percent_yield_first_up": result["percent_yield"][0, 0],
+        "percent_yield_last": result["percent_yield"][0, -1],
+        "flat": flat,
+        "percent_yield_check": percent_yield_check,
+        "force_checks": force_checks,
+        "straightens_whole_coil": bool(flat.all()),
+        "yield_ok_whole_coil": bool(percent_yield_check.all()),
+        "worst_coil_dia": float(coil_dia[worst]),
+        "max_exit_curvature": float(np.abs(exit_curvature[worst])),
+    }
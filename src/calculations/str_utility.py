@@ -4,10 +4,11 @@ Straightener Utility Calculation Module
 
 from models import str_utility_input
 from math import pi, sqrt
+from dataclasses import dataclass
 
 from utils.shared import (
     MOTOR_RPM, EFFICIENCY, PINCH_ROLL_QTY, MAT_LENGTH, CONT_ANGLE, FEED_RATE_BUFFER,
-    LEWIS_FACTORS, roll_str_backbend_state, get_percent_material_yielded_check
+    LEWIS_FACTORS
 )
 
 from utils.lookup_tables import (
@@ -56,9 +57,11 @@ def calc_required_force(yield_strength, coil_width, thickness, center_dist):
     base = 16 * yield_strength * coil_width * (thickness ** 2) / (15 * center_dist)
     return base + base * 0.19
 
-def calc_coil_od(coil_id, max_coil_weight, density, coil_width, coil_od):
-    measured = sqrt((coil_id ** 2) + ((max_coil_weight * 4) / (pi * density * coil_width)))
-    return min(measured, coil_od)
+# Helpers taking power (and sqrt, minimum) also serve str_utility_vectorized; pass
+# utils.vectorized.power there to match ** over arrays.
+def calc_coil_od(coil_id, max_coil_weight, density, coil_width, coil_od, power=pow, sqrt=sqrt, minimum=min):
+    measured = sqrt(power(coil_id, 2) + ((max_coil_weight * 4) / (pi * density * coil_width)))
+    return minimum(measured, coil_od)
 
 def calc_roll_inertia(dia, length, qty):
     lbs = ((dia ** 2) / 4) * pi * length * qty * 0.283
@@ -68,17 +71,17 @@ def calc_roll_inertia(dia, length, qty):
 def calc_ratio(motor_rpm, feed_rate, dia):
     return motor_rpm / ((feed_rate * 12) / (dia * pi))
 
-def calc_refl_inertia(inertia, ratio):
-    return inertia / (ratio ** 2)
+def calc_refl_inertia(inertia, ratio, power=pow):
+    return inertia / power(ratio, 2)
 
 def calc_mat_length_inertia(thickness, coil_width, density, mat_length, pinch_roll_dia):
     lbs = thickness * coil_width * density * mat_length
     inertia = (lbs / 32.3) * (((pinch_roll_dia * 0.5) ** 2) / 144) * 12
     return lbs, inertia
 
-def calc_od_inertia(od, coil_width, density):
-    lbs = ((od ** 2) / 4) * pi * coil_width * density
-    inertia = (lbs / 32.3) * 0.5 * (((od * 0.5) ** 2) / 144) * 12
+def calc_od_inertia(od, coil_width, density, power=pow):
+    lbs = (power(od, 2) / 4) * pi * coil_width * density
+    inertia = (lbs / 32.3) * 0.5 * (power(od * 0.5, 2) / 144) * 12
     return lbs, inertia
 
 def calc_od_ratio(od, pinch_roll_dia, pinch_ratio):
@@ -91,19 +94,17 @@ def calc_str_torque(yield_strength, coil_width, thickness, center_dist, feed_rat
     torque = (((0.667 * yield_strength * coil_width * (thickness ** 2)) / center_dist) * 0.35 * feed_rate * k_cons / 33000 * 5250 / motor_rpm * 12) / eff
     return torque
 
-def calc_coil_brake_torque(coil_od, coil_width, density, feed_rate, accel_time):
+def calc_coil_brake_torque(coil_od, coil_width, density, feed_rate, accel_time, power=pow):
     inertia = (
         (
             (
                 (
-                    (coil_od ** 2)
+                    power(coil_od, 2)
                    / 4)
                * pi * coil_width * density)
            / 32.3)
        * 0.5 * (
-           (
-               (coil_od * 0.5)
-              ** 2)
+           power(coil_od * 0.5, 2)
           / 144)
        ) * 12
     rpm = (feed_rate * 12) / (coil_od * pi)
@@ -132,8 +133,11 @@ def calc_rated_torque(horsepower_rated, rpm):
 def calc_req_torque(str_torque, ratio, gear_torque, brake_torque, total_inertia, motor_rpm, accel_time, eff):
     return (str_torque * ratio / gear_torque) + brake_torque / 2 * ratio + (((total_inertia * motor_rpm) / (9.55 * accel_time)) * (1/eff)) * ratio / 2
 
-def calc_actual_coil_weight(coil_od, coil_id, coil_width, density):
-    return (((coil_od**2) - coil_id**2) / 4) * pi * coil_width * density
+def calc_str_roll_req_torque(str_torque, ratio, gear_torque, total_inertia, motor_rpm, accel_time, eff):
+    return (str_torque * ratio / gear_torque) + (((total_inertia * motor_rpm) / (9.55 * accel_time)) * (1 / eff)) * ratio / 2 * 7 / 11
+
+def calc_actual_coil_weight(coil_od, coil_id, coil_width, density, power=pow):
+    return ((power(coil_od, 2) - power(coil_id, 2)) / 4) * pi * coil_width * density
 
 def check_value(val, ref):
     return "OK" if val > ref else "NOT OK"
@@ -154,6 +158,84 @@ def check_feed_rate(fpm_check, required_force_check, pinch_roll_check, str_roll_
             return "OK"
     return "NOT OK"
 
+# --- Result ---
+@dataclass(frozen=True)
+class str_utility_output:
+    """Unrounded straightener utility results; to_dict() gives the rounded JSON output."""
+    __slots__ = (
+        "required_force", "pinch_roll_dia", "pinch_roll_req_torque", "pinch_roll_rated_torque", "str_roll_dia",
+        "str_roll_req_torque", "str_roll_rated_torque", "horsepower_required", "center_dist", "jack_force_available",
+        "max_roll_depth", "modulus", "pinch_roll_teeth", "pinch_roll_dp", "str_roll_teeth",
+        "str_roll_dp", "cont_angle", "face_width", "actual_coil_weight", "coil_od",
+        "str_torque", "acceleration_torque", "brake_torque", "backup_rolls_recommended", "required_force_check",
+        "pinch_roll_check", "str_roll_check", "horsepower_check", "fpm_check", "feed_rate_check"
+    )
+    required_force: float
+    pinch_roll_dia: float
+    pinch_roll_req_torque: float
+    pinch_roll_rated_torque: float
+    str_roll_dia: float
+    str_roll_req_torque: float
+    str_roll_rated_torque: float
+    horsepower_required: float
+    center_dist: float
+    jack_force_available: float
+    max_roll_depth: float
+    modulus: float
+    pinch_roll_teeth: float
+    pinch_roll_dp: float
+    str_roll_teeth: float
+    str_roll_dp: float
+    cont_angle: float
+    face_width: float
+    actual_coil_weight: float
+    coil_od: float
+    str_torque: float
+    acceleration_torque: float
+    brake_torque: float
+    backup_rolls_recommended: str
+    required_force_check: str
+    pinch_roll_check: str
+    str_roll_check: str
+    horsepower_check: str
+    fpm_check: str
+    feed_rate_check: str
+
+    def to_dict(self):
+        return {
+            "required_force": round(self.required_force, 3),
+            "pinch_roll_dia": round(self.pinch_roll_dia, 3),
+            "pinch_roll_req_torque": round(self.pinch_roll_req_torque, 3),
+            "pinch_roll_rated_torque": round(self.pinch_roll_rated_torque, 3),
+            "str_roll_dia": round(self.str_roll_dia, 3),
+            "str_roll_req_torque": round(self.str_roll_req_torque, 3),
+            "str_roll_rated_torque": round(self.str_roll_rated_torque, 3),
+            "horsepower_required": round(self.horsepower_required, 3),
+            "center_dist": round(self.center_dist, 3),
+            "jack_force_available": round(self.jack_force_available, 3),
+            "max_roll_depth": round(self.max_roll_depth, 3),
+            "modulus": round(self.modulus, 3),
+            "pinch_roll_teeth": round(self.pinch_roll_teeth, 3),
+            "pinch_roll_dp": round(self.pinch_roll_dp, 3),
+            "str_roll_teeth": round(self.str_roll_teeth, 3),
+            "str_roll_dp": round(self.str_roll_dp, 3),
+            "cont_angle": round(self.cont_angle, 3),
+            "face_width": round(self.face_width, 3),
+            "actual_coil_weight": round(self.actual_coil_weight, 3),
+            "coil_od": round(self.coil_od, 3),
+            "str_torque": round(self.str_torque, 3),
+            "acceleration_torque": round(self.acceleration_torque, 3),
+            "brake_torque": round(self.brake_torque, 3),
+            "backup_rolls_recommended": self.backup_rolls_recommended,
+            "required_force_check": self.required_force_check,
+            "pinch_roll_check": self.pinch_roll_check,
+            "str_roll_check": self.str_roll_check,
+            "horsepower_check": self.horsepower_check,
+            "fpm_check": self.fpm_check,
+            "feed_rate_check": self.feed_rate_check
+        }
+
+# --- Main Calculation ---
 def calculate_str_utility(data: str_utility_input):
     horsepower_string = get_horsepower_string(data.horsepower)
     try:
@@ -241,7 +323,7 @@ def calculate_str_utility(data: str_utility_input):
 
     pinch_roll_req_torque = calc_req_torque(str_torque, pinch_ratio, str_model["str_gear_torque"], min_od_brake_torque, max_od_total_inertia, motor_rpm, accel_time, eff)
     pinch_roll_rated_torque = calc_rated_torque(horsepower_rated_pinch, rpm_at_roller_pinch)
-    str_roll_req_torque = (str_torque * str_ratio / str_model["str_gear_torque"]) + (((max_od_total_inertia * motor_rpm) / (9.55 * accel_time)) * (1 / eff)) * str_ratio / 2 * 7 / 11
+    str_roll_req_torque = calc_str_roll_req_torque(str_torque, str_ratio, str_model["str_gear_torque"], max_od_total_inertia, motor_rpm, accel_time, eff)
     str_roll_rated_torque = calc_rated_torque(horsepower_rated_str, rpm_at_roller_str)
     actual_coil_weight = calc_actual_coil_weight(coil_od, data.coil_id, data.coil_width, material["density"])
 
@@ -253,35 +335,12 @@ def calculate_str_utility(data: str_utility_input):
     fpm_check = check_fpm(data.feed_rate, data.max_feed_rate, feed_rate_buffer)
     feed_rate_check = check_feed_rate(fpm_check, required_force_check, pinch_roll_check, str_roll_check, horsepower_check, data.yield_met)
 
-    return {
-        "required_force": round(required_force, 3), 
-        "pinch_roll_dia" : round(str_model["pinch_roll_dia"], 3),
-        "pinch_roll_req_torque" : round(pinch_roll_req_torque, 3),
-        "pinch_roll_rated_torque" : round(pinch_roll_rated_torque, 3),
-        "str_roll_dia": round(str_model["str_roll_dia"], 3),
-        "str_roll_req_torque" : round(str_roll_req_torque, 3),
-        "str_roll_rated_torque" : round(str_roll_rated_torque, 3),
-        "horsepower_required": round(horsepower_required, 3),
-        "center_dist" : round(str_model["center_dist"], 3),
-        "jack_force_available" : round(str_model["jack_force_available"], 3),
-        "max_roll_depth" : round(str_model["max_roll_depth"], 3),
-        "modulus" : round(material["modulus"], 3),
-        "pinch_roll_teeth" : round(str_model["pinch_roll_teeth"], 3),
-        "pinch_roll_dp" : round(str_model["pinch_roll_dp"], 3),
-        "str_roll_teeth" : round(str_model["str_roll_teeth"], 3),
-        "str_roll_dp" : round(str_model["str_roll_dp"], 3),
-        "cont_angle" : round(cont_angle, 3),
-        "face_width" : round(str_model["face_width"], 3),
-        "actual_coil_weight" : round(actual_coil_weight, 3),
-        "coil_od" : round(coil_od, 3),
-        "str_torque" : round(str_torque, 3),
-        "acceleration_torque" : round(accel_torque, 3),
-        "brake_torque" : round(brake_torque, 3),
-        "backup_rolls_recommended" : backup_rolls_reccomended,
-        "required_force_check" : required_force_check,
-        "pinch_roll_check" : pinch_roll_check,
-        "str_roll_check" : str_roll_check,
-        "horsepower_check" : horsepower_check,
-        "fpm_check" : fpm_check,
-        "feed_rate_check" : feed_rate_check
-    }
\ No newline at end of file
+    return str_utility_output(
+        required_force, str_model["pinch_roll_dia"], pinch_roll_req_torque, pinch_roll_rated_torque,
+        str_model["str_roll_dia"], str_roll_req_torque, str_roll_rated_torque, horsepower_required,
+        str_model["center_dist"], str_model["jack_force_available"], str_model["max_roll_depth"],
+        material["modulus"], str_model["pinch_roll_teeth"], str_model["pinch_roll_dp"],
+        str_model["str_roll_teeth"], str_model["str_roll_dp"], cont_angle, str_model["face_width"],
+        actual_coil_weight, coil_od, str_torque, accel_torque, brake_torque, backup_rolls_reccomended,
+        required_force_check, pinch_roll_check, str_roll_check, horsepower_check, fpm_check, feed_rate_check
+    )
@@ -0,0 +1,200 @@
+"""
+Vectorized Straightener Utility Calculation Module
+
+Array-in/array-out version of calculate_str_utility. The straightener model,
+material and LEWIS_FACTORS lookups are resolved once from the scalar input;
+feed rate, coil OD and horsepower may be NumPy arrays that broadcast together.
+"""
+
+import numpy as np
+from math import pi
+
+from models import str_utility_input
+from utils.vectorized import power
+from utils.shared import (
+    MOTOR_RPM, EFFICIENCY, PINCH_ROLL_QTY, MAT_LENGTH, CONT_ANGLE, FEED_RATE_BUFFER, LEWIS_FACTORS
+)
+from utils.lookup_tables import get_material_density, get_material_modulus, get_motor_inertia
+from calculations.str_utility import (
+    get_horsepower_string, get_str_model_lookups,
+    calc_k_cons, calc_ult_tensile_strength, calc_required_force, calc_coil_od, calc_roll_inertia, calc_ratio,
+    calc_refl_inertia, calc_mat_length_inertia, calc_od_inertia, calc_od_ratio, calc_coil_brake_torque,
+    calc_actual_coil_weight, calc_total_inertia, calc_str_torque, calc_brake_torque,
+    calc_accel_torque, calc_pk_torque, calc_gear_values, calc_rated_torque, calc_req_torque,
+    calc_str_roll_req_torque, check_backup_rolls
+)
+
+# --- Lookups ---
+def get_lookup_data(data: str_utility_input):
+    """Resolve the model, material and gear lookups calculate_str_utility needs."""
+    str_model = get_str_model_lookups(data.str_model)
+    return {
+        "str_model": str_model,
+        "density": get_material_density(data.material_type),
+        "modulus": get_material_modulus(data.material_type),
+        "lewis_factor_pinch": LEWIS_FACTORS[str_model["pinch_roll_teeth"]],
+        "lewis_factor_str": LEWIS_FACTORS[str_model["str_roll_teeth"]],
+    }
+
+def get_motor_inertias(horsepower):
+    """Motor inertia for each horsepower, looked up once per distinct value; NaN where unknown."""
+    inertias = np.full(horsepower.shape, np.nan)
+    for value in np.unique(horsepower):
+        try:
+            inertias[horsepower == value] = get_motor_inertia(get_horsepower_string(float(value)))
+        except ValueError:
+            continue
+    return inertias
+
+# --- Main Calculation ---
+def calculate_str_utility_vectorized(data: str_utility_input, feed_rate=None, coil_od=None, horsepower=None):
+    """
+    Evaluate calculate_str_utility over arrays of feed rate, coil OD and horsepower.
+
+    Any array left as None falls back to the scalar value in data. Returns a dict
+    of unrounded float arrays for the outputs (plus "peak_torque", the peak
+    torque for the selected brake compensation) and boolean masks for the
+    checks. "valid" is False where the scalar function would fail (zero feed
+    rate or coil OD, or a horsepower without a motor inertia), and "all_checks"
+    matches a feed_rate_check of "OK".
+    """
+    try:
+        lookups = get_lookup_data(data)
+    except Exception as e:
+        return f"ERROR: {e}"
+
+    brake_option = data.auto_brake_compensation.lower()
+    if brake_option not in ("yes", "no"):
+        return "ERROR: Str Utility brake quantity invalid."
+
+    feed_rate, coil_od, horsepower = np.broadcast_arrays(*(
+        np.asarray(data_value if value is None else value, dtype=float)
+        for value, data_value in (
+            (feed_rate, data.feed_rate), (coil_od, data.coil_od), (horsepower, data.horsepower),
+        )
+    ))
+
+    str_model = lookups["str_model"]
+    density = lookups["density"]
+    motor_inertia = get_motor_inertias(horsepower)
+    k_cons = calc_k_cons(data.num_str_rolls)
+    safe_working_stress = calc_ult_tensile_strength(data.str_model) / 3
+    pinch_roll_dia = str_model["pinch_roll_dia"]
+    str_roll_dia = str_model["str_roll_dia"]
+
+    # Terms that only depend on the model and material stay scalars
+    required_force = calc_required_force(data.yield_strength, data.coil_width, data.material_thickness, str_model["center_dist"])
+    _, pinch_roll_inertia = calc_roll_inertia(pinch_roll_dia, data.str_width + 2, PINCH_ROLL_QTY)
+    _, str_roll_inertia = calc_roll_inertia(str_roll_dia, data.str_width + 2, data.num_str_rolls)
+    _, mat_length_inertia = calc_mat_length_inertia(data.material_thickness, data.coil_width, density, MAT_LENGTH, pinch_roll_dia)
+    _, min_od_inertia = calc_od_inertia(data.coil_id, data.coil_width, density, power=power)
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        accel_time = (feed_rate / 60) / data.acceleration
+        coil_od = calc_coil_od(
+            data.coil_id, data.max_coil_weight, density, data.coil_width, coil_od, power=power, sqrt=np.sqrt, minimum=np.minimum
+        )
+
+        pinch_ratio = calc_ratio(MOTOR_RPM, feed_rate, pinch_roll_dia)
+        str_ratio = calc_ratio(MOTOR_RPM, feed_rate, str_roll_dia)
+        pinch_roll_refl_inertia = calc_refl_inertia(pinch_roll_inertia, pinch_ratio, power=power)
+        str_roll_refl_inertia = calc_refl_inertia(str_roll_inertia, str_ratio, power=power)
+        mat_length_refl_inertia = calc_refl_inertia(mat_length_inertia, pinch_ratio, power=power)
+
+        _, max_od_inertia = calc_od_inertia(coil_od, data.coil_width, density, power=power)
+        max_od_refl_inertia = calc_refl_inertia(max_od_inertia, calc_od_ratio(coil_od, pinch_roll_dia, pinch_ratio), power=power)
+        min_od_refl_inertia = calc_refl_inertia(min_od_inertia, calc_od_ratio(data.coil_id, pinch_roll_dia, pinch_ratio), power=power)
+        max_od_total_inertia = calc_total_inertia(pinch_roll_refl_inertia, str_roll_refl_inertia, mat_length_refl_inertia, max_od_refl_inertia)
+        min_od_total_inertia = calc_total_inertia(pinch_roll_refl_inertia, str_roll_refl_inertia, mat_length_refl_inertia, min_od_refl_inertia)
+
+        str_torque = calc_str_torque(
+            data.yield_strength, data.coil_width, data.material_thickness, str_model["center_dist"], feed_rate,
+            k_cons, MOTOR_RPM, EFFICIENCY
+        )
+        coil_brake_torque = calc_coil_brake_torque(coil_od, data.coil_width, density, feed_rate, accel_time, power=power)
+        max_od_brake_torque = calc_brake_torque(coil_brake_torque, coil_od, pinch_roll_dia, pinch_ratio, EFFICIENCY)
+        min_od_brake_torque = calc_brake_torque(coil_brake_torque, data.coil_id, pinch_roll_dia, pinch_ratio, EFFICIENCY)
+
+        if brake_option == "yes":
+            total_inertia, brake_torque = max_od_total_inertia, max_od_brake_torque
+        else:
+            total_inertia, brake_torque = min_od_total_inertia, min_od_brake_torque
+        accel_torque = calc_accel_torque(total_inertia, MOTOR_RPM, accel_time, EFFICIENCY, motor_inertia)
+        peak_torque = calc_pk_torque(str_torque, accel_torque, brake_torque)
+        horsepower_required = (peak_torque * MOTOR_RPM) / 63000
+
+        rpm_at_roller_pinch = (feed_rate * 12) / (pi * pinch_roll_dia)
+        _, _, _, horsepower_rated_pinch = calc_gear_values(
+            str_model["pinch_roll_teeth"], str_model["pinch_roll_dp"], str_model["face_width"],
+            safe_working_stress, lookups["lewis_factor_pinch"], rpm_at_roller_pinch, pinch_roll_dia
+        )
+        rpm_at_roller_str = (feed_rate * 12) / (pi * str_roll_dia)
+        _, _, _, horsepower_rated_str = calc_gear_values(
+            str_model["str_roll_teeth"], str_model["str_roll_dp"], str_model["face_width"],
+            safe_working_stress, lookups["lewis_factor_str"], rpm_at_roller_str, str_roll_dia
+        )
+        pinch_roll_req_torque = calc_req_torque(
+            str_torque, pinch_ratio, str_model["str_gear_torque"], min_od_brake_torque, max_od_total_inertia,
+            MOTOR_RPM, accel_time, EFFICIENCY
+        )
+        pinch_roll_rated_torque = calc_rated_torque(horsepower_rated_pinch, rpm_at_roller_pinch)
+        str_roll_req_torque = calc_str_roll_req_torque(
+            str_torque, str_ratio, str_model["str_gear_torque"], max_od_total_inertia, MOTOR_RPM, accel_time, EFFICIENCY
+        )
+        str_roll_rated_torque = calc_rated_torque(horsepower_rated_str, rpm_at_roller_str)
+        actual_coil_weight = calc_actual_coil_weight(coil_od, data.coil_id, data.coil_width, density, power=power)
+
+    # Points where the scalar calculation divides by zero or fails its motor lookup
+    valid = (feed_rate != 0) & (coil_od != 0) & np.isfinite(coil_od) & ~np.isnan(motor_inertia)
+
+    # Checks
+    required_force_check = valid & (str_model["jack_force_available"] > required_force)
+    pinch_roll_check = valid & (pinch_roll_rated_torque > pinch_roll_req_torque)
+    str_roll_check = valid & (str_roll_rated_torque > str_roll_req_torque)
+    horsepower_check = valid & (horsepower > horsepower_required)
+    fpm_check = valid & (feed_rate >= data.max_feed_rate * FEED_RATE_BUFFER)
+    all_checks = required_force_check & pinch_roll_check & str_roll_check & horsepower_check & fpm_check
+    feed_rate_check = all_checks & (data.yield_met == "OK")
+
+    return {
+        "required_force": required_force,
+        "pinch_roll_dia": pinch_roll_dia,
+        "pinch_roll_req_torque": pinch_roll_req_torque,
+        "pinch_roll_rated_torque": pinch_roll_rated_torque,
+        "str_roll_dia": str_roll_dia,
+        "str_roll_req_torque": str_roll_req_torque,
+        "str_roll_rated_torque": str_roll_rated_torque,
+        "horsepower_required": horsepower_required,
+        "center_dist": str_model["center_dist"],
+        "jack_force_available": str_model["jack_force_available"],
+        "max_roll_depth": str_model["max_roll_depth"],
+        "modulus": lookups["modulus"],
+        "cont_angle": CONT_ANGLE,
+        "actual_coil_weight": actual_coil_weight,
+        "coil_od": coil_od,
+        "motor_inertia": motor_inertia,
+        "str_torque": str_torque,
+        "acceleration_torque": accel_torque,
+        "brake_torque": brake_torque,
+        "peak_torque": peak_torque,
+        "backup_rolls_recommended": check_backup_rolls(required_force, str_model["jack_force_available"]),
+        "valid": valid,
+        "required_force_check": required_force_check,
+        "pinch_roll_check": pinch_roll_check,
+        "str_roll_check": str_roll_check,
+        "horsepower_check": horsepower_check,
+        "fpm_check": fpm_check,
+        "feed_rate_check": feed_rate_check,
+        "all_checks": all_checks,
+    }
+
+def calculate_str_utility_grid(data: str_utility_input, feed_rates, coil_ods, horsepowers):
+    """
+    Evaluate calculate_str_utility_vectorized over the feed rate x coil OD x
+    horsepower grid; output arrays are shaped (feed_rates, coil_ods, horsepowers).
+    """
+    feed_rate, coil_od, horsepower = np.meshgrid(
+        np.asarray(feed_rates, dtype=float), np.asarray(coil_ods, dtype=float), np.asarray(horsepowers, dtype=float),
+        indexing="ij"
+    )
+    return calculate_str_utility_vectorized(data, feed_rate=feed_rate, coil_od=coil_od, horsepower=horsepower)
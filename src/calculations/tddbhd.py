@@ -1,9 +1,10 @@
 from models import tddbhd_input
 from math import pi, sqrt
+from dataclasses import dataclass
 import re
 
 from utils.shared import (
-    NUM_BRAKEPADS, BRAKE_DISTANCE, CYLINDER_ROD, STATIC_FRICTION, rfq_state
+    NUM_BRAKEPADS, BRAKE_DISTANCE, CYLINDER_ROD, STATIC_FRICTION
 )
 from utils.lookup_tables import (
     get_cylinder_bore, get_hold_down_matrix_label, get_material_density, get_material_modulus, get_reel_max_weight, 
@@ -45,11 +46,13 @@ def lookup_drive_torque(drive_key):
     return get_drive_torque(drive_key)
 
 # --- Calculations ---
-def calc_M(modulus, width, thickness, coil_id):
-    return (modulus * width * thickness**3) / (12 * (coil_id/2))
+# Helpers taking power (and minimum, sqrt) also serve tddbhd_vectorized; pass
+# utils.vectorized.power there to match ** over arrays.
+def calc_M(modulus, width, thickness, coil_id, power=pow):
+    return (modulus * width * power(thickness, 3)) / (12 * (coil_id/2))
 
-def calc_My(width, thickness, yield_strength):
-    return (width * thickness**2 * yield_strength) / 6
+def calc_My(width, thickness, yield_strength, power=pow):
+    return (width * power(thickness, 2) * yield_strength) / 6
 
 def calc_y(thickness, coil_id, modulus, yield_strength):
     return (thickness * (coil_id/2)) / (2 * ((thickness * modulus) / (2 * yield_strength)))
@@ -60,16 +63,18 @@ def calc_web_tension_psi(yield_strength):
 def calc_web_tension_lbs(thickness, width, web_tension_psi):
     return thickness * width * web_tension_psi
 
-def calc_coil_weight(coil_od, coil_id, width, density, max_weight):
-    calculated_cw = (((coil_od**2) - coil_id**2) / 4) * pi * width * density
-    return min(calculated_cw, max_weight)
+def calc_coil_weight(coil_od, coil_id, width, density, max_weight, power=pow, minimum=min):
+    calculated_cw = (((power(coil_od, 2)) - power(coil_id, 2)) / 4) * pi * width * density
+    return minimum(calculated_cw, max_weight)
+
+def calc_coil_od_for_weight(coil_weight, density, width, coil_id, power=pow, sqrt=sqrt):
+    """OD of coil_weight on coil_id, before calc_coil_od's zero check and limit to the input OD."""
+    return sqrt(((4 * coil_weight) / (density * width * pi)) + (power(coil_id, 2)))
 
 def calc_coil_od(coil_weight, density, width, coil_id, input_coil_od):
-    od_denominator = density * width * pi
-    if od_denominator == 0:
+    if density * width * pi == 0:
         raise ZeroDivisionError("coilOD zero division.")
-    od_calc = sqrt(((4 * coil_weight) / od_denominator) + (coil_id**2))
-    return min(od_calc, input_coil_od)
+    return min(calc_coil_od_for_weight(coil_weight, density, width, coil_id), input_coil_od)
 
 def calc_disp_reel_mtr(hyd_threading_drive):
     if hyd_threading_drive != "None":
@@ -91,16 +96,24 @@ def calc_rewind_torque(web_tension_lbs, coil_od):
 def calc_hold_down_denominator(static_friction, coil_id):
     return static_friction * (coil_id / 2)
 
+def calc_hold_down_force_req_plastic(width, thickness, yield_strength, y, hold_down_denominator, power=pow):
+    """Hold down force required once the material yields (M >= My)."""
+    return (((width * power(thickness, 2)) / 4) * yield_strength * (1 - (1/3) * power(y / (thickness / 2), 2))) / hold_down_denominator
+
 def calc_hold_down_force_req(M, My, width, thickness, yield_strength, y, hold_down_denominator):
     if M < My:
         return M / hold_down_denominator
     else:
-        return (((width * thickness**2) / 4) * yield_strength * (1 - (1/3) * (y / (thickness / 2))**2)) / hold_down_denominator
+        return calc_hold_down_force_req_plastic(width, thickness, yield_strength, y, hold_down_denominator)
+
+def calc_decel_torque(decel, coil_weight, coil_od, coil_id, power=pow):
+    """Torque to stop the coil at decel, before calc_torque_required's zero check and rewind torque."""
+    return (3 * decel * coil_weight * (power(coil_od, 2) + power(coil_id, 2))) / (386 * coil_od)
 
 def calc_torque_required(decel, coil_weight, coil_od, coil_id, rewind_torque):
     if coil_od == 0:
         raise ZeroDivisionError("coilOD 0.")
-    return ((3 * decel * coil_weight * (coil_od**2 + coil_id**2)) / (386 * coil_od)) + rewind_torque
+    return calc_decel_torque(decel, coil_weight, coil_od, coil_id) + rewind_torque
 
 def calc_brake_press_required(torque_required, friction, brake_dist, num_brakepads, brake_model, cylinder_bore, cyl_rod, brake_qty):
     numerator = 4 * torque_required
@@ -127,38 +140,130 @@ def calc_failsafe_holding_force(brake_model, friction, num_brakepads, brake_dist
     return hold_force * friction * num_brakepads * brake_dist * brake_qty
 
 # --- Checks ---
+# The passes_* conditions work on scalars and arrays; the check_* functions
+# turn them into the PASS/FAIL strings.
+def passes_min_material_width(min_material_width, width):
+    return min_material_width <= width
+
+def passes_air_pressure(air_pressure):
+    return air_pressure <= 120
+
+def passes_rewind_torque(rewind_torque, torque_at_mandrel):
+    return rewind_torque < torque_at_mandrel
+
+def passes_hold_down_force(hold_down_force_req, hold_down_force_available):
+    return hold_down_force_req < hold_down_force_available
+
+def passes_brake_press(brake_press_required, air_pressure):
+    return brake_press_required < air_pressure
+
+def passes_torque_required(torque_required, failsafe_holding_force):
+    return (torque_required < failsafe_holding_force) | (failsafe_holding_force == 0)
+
+def passes_tddbhd(min_material_width_passes, confirmed_min_width, rewind_torque_passes, hold_down_force_passes,
+                  brake_press_passes, torque_required_passes, hold_down_force_available):
+    """Pull off reel condition for check_tddbhd "OK", from the pass results of the other checks."""
+    return (
+        (min_material_width_passes | (confirmed_min_width == True)) &
+        rewind_torque_passes &
+        hold_down_force_passes &
+        brake_press_passes &
+        (torque_required_passes | (hold_down_force_available == 0))
+    )
+
 def check_min_material_width(min_material_width, width):
-    return "PASS" if min_material_width <= width else "FAIL"
+    return "PASS" if passes_min_material_width(min_material_width, width) else "FAIL"
 
 def check_air_pressure(air_pressure):
-    return "PASS" if air_pressure <= 120 else "FAIL"
+    return "PASS" if passes_air_pressure(air_pressure) else "FAIL"
 
 def check_rewind_torque(rewind_torque, torque_at_mandrel):
-    return "PASS" if rewind_torque < torque_at_mandrel else "FAIL"
+    return "PASS" if passes_rewind_torque(rewind_torque, torque_at_mandrel) else "FAIL"
 
 def check_hold_down_force(hold_down_force_req, hold_down_force_available):
-    return "PASS" if hold_down_force_req < hold_down_force_available else "FAIL"
+    return "PASS" if passes_hold_down_force(hold_down_force_req, hold_down_force_available) else "FAIL"
 
 def check_brake_press(brake_press_required, air_pressure):
-    return "PASS" if brake_press_required < air_pressure else "FAIL"
+    return "PASS" if passes_brake_press(brake_press_required, air_pressure) else "FAIL"
 
 def check_torque_required(torque_required, failsafe_holding_force):
-    return "PASS" if torque_required < failsafe_holding_force or failsafe_holding_force == 0 else "FAIL"
+    return "PASS" if passes_torque_required(torque_required, failsafe_holding_force) else "FAIL"
 
 def check_tddbhd(reel_type, min_material_width_check, confirmed_min_width, rewind_torque_check, hold_down_force_check, brake_press_check, torque_required_check, hold_down_force_available):
     if reel_type.upper() == "PULLOFF":
-        if ((min_material_width_check == "PASS" or confirmed_min_width == True) and 
-            rewind_torque_check == "PASS" and
-            hold_down_force_check == "PASS" and
-            brake_press_check == "PASS" and
-            (torque_required_check == "PASS" or hold_down_force_available == 0)
-            ):
+        if passes_tddbhd(
+            min_material_width_check == "PASS", confirmed_min_width, rewind_torque_check == "PASS",
+            hold_down_force_check == "PASS", brake_press_check == "PASS", torque_required_check == "PASS",
+            hold_down_force_available
+        ):
             return "OK"
         else:
             return "NOT OK"
     else:
         return "USE MOTORIZED"
 
+# --- Result ---
+@dataclass(frozen=True)
+class tddbhd_output:
+    """Unrounded TDDBHD results; to_dict() gives the rounded JSON output."""
+    __slots__ = (
+        "friction", "web_tension_psi", "web_tension_lbs", "calculated_coil_weight", "coil_od", "disp_reel_mtr",
+        "cylinder_bore", "torque_at_mandrel", "rewind_torque", "holddown_pressure", "hold_down_force_available",
+        "hold_down_force_required", "min_material_width", "torque_required", "failsafe_required",
+        "failsafe_holding_force", "min_material_width_check", "air_pressure_check", "rewind_torque_check",
+        "hold_down_force_check", "brake_press_check", "torque_required_check", "tddbhd_check"
+    )
+    friction: float
+    web_tension_psi: float
+    web_tension_lbs: float
+    calculated_coil_weight: float
+    coil_od: float
+    disp_reel_mtr: float
+    cylinder_bore: float
+    torque_at_mandrel: float
+    rewind_torque: float
+    holddown_pressure: float
+    hold_down_force_available: float
+    hold_down_force_required: float
+    min_material_width: float
+    torque_required: float
+    failsafe_required: float
+    failsafe_holding_force: float
+    min_material_width_check: str
+    air_pressure_check: str
+    rewind_torque_check: str
+    hold_down_force_check: str
+    brake_press_check: str
+    torque_required_check: str
+    tddbhd_check: str
+
+    def to_dict(self):
+        return {
+            "friction": round(self.friction, 3),
+            "web_tension_psi": round(self.web_tension_psi, 3),
+            "web_tension_lbs": round(self.web_tension_lbs, 3),
+            "calculated_coil_weight": round(self.calculated_coil_weight, 3),
+            "coil_od": round(self.coil_od, 3),
+            "disp_reel_mtr": round(self.disp_reel_mtr),
+            "cylinder_bore": round(self.cylinder_bore, 3),
+            "torque_at_mandrel": round(self.torque_at_mandrel, 3) if self.torque_at_mandrel else None,
+            "rewind_torque": round(self.rewind_torque, 3),
+            "holddown_pressure": round(self.holddown_pressure, 3),
+            "hold_down_force_available": round(self.hold_down_force_available, 3),
+            "hold_down_force_required": round(self.hold_down_force_required, 3),
+            "min_material_width": round(self.min_material_width, 3),
+            "torque_required": round(self.torque_required, 3),
+            "failsafe_required": round(self.failsafe_required, 3),
+            "failsafe_holding_force": round(self.failsafe_holding_force, 3),
+            "min_material_width_check": self.min_material_width_check,
+            "air_pressure_check": self.air_pressure_check,
+            "rewind_torque_check": self.rewind_torque_check,
+            "hold_down_force_check": self.hold_down_force_check,
+            "brake_press_check": self.brake_press_check,
+            "torque_required_check": self.torque_required_check,
+            "tddbhd_check": self.tddbhd_check
+        }
+
 # --- Main Calculation ---
 def calculate_tbdbhd(data: tddbhd_input):
     try:
@@ -214,28 +319,10 @@ def calculate_tbdbhd(data: tddbhd_input):
         torque_required_check, hold_down_force_available
     )
 
-    return {
-        "friction": round(data.friction, 3),
-        "web_tension_psi": round(web_tension_psi, 3),
-        "web_tension_lbs": round(web_tension_lbs, 3),
-        "calculated_coil_weight": round(coil_weight, 3),
-        "coil_od": round(coil_od, 3),
-        "disp_reel_mtr": round(disp_reel_mtr),
-        "cylinder_bore": round(cylinder_bore, 3),
-        "torque_at_mandrel": round(torque_at_mandrel, 3) if torque_at_mandrel else None,
-        "rewind_torque": round(rewind_torque, 3),
-        "holddown_pressure": round(holddown_pressure, 3),
-        "hold_down_force_available": round(hold_down_force_available, 3),
-        "hold_down_force_required": round(hold_down_force_req, 3),
-        "min_material_width": round(min_material_width, 3),
-        "torque_required": round(torque_required, 3),
-        "failsafe_required": round(brake_press_required, 3),
-        "failsafe_holding_force": round(failsafe_holding_force, 3),
-        "min_material_width_check": min_material_width_check,
-        "air_pressure_check": air_pressure_check,
-        "rewind_torque_check": rewind_torque_check,
-        "hold_down_force_check": hold_down_force_check,
-        "brake_press_check": brake_press_check,
-        "torque_required_check": torque_required_check,
-        "tddbhd_check": tddbhd_check
-    }
\ No newline at end of file
+    return tddbhd_output(
+        data.friction, web_tension_psi, web_tension_lbs, coil_weight, coil_od, disp_reel_mtr, cylinder_bore,
+        torque_at_mandrel, rewind_torque, holddown_pressure, hold_down_force_available, hold_down_force_req,
+        min_material_width, torque_required, brake_press_required, failsafe_holding_force,
+        min_material_width_check, air_pressure_check, rewind_torque_check, hold_down_force_check,
+        brake_press_check, torque_required_check, tddbhd_check
+    )
@@ -0,0 +1,167 @@
+"""
+TDDBHD Check Bounds Module
+
+Closed-form inversions of the TDDBHD checks. Each function returns the bound on
+one input at which its check flips, so callers can read passing ranges off
+directly instead of searching for them. Bounds are exclusive unless noted: the
+check passes strictly below a "max" bound and strictly above a "min" bound.
+"""
+
+from math import sqrt, inf
+
+from models import tddbhd_input
+from utils.lookup_tables import lookup_holddown_matrix
+from utils.shared import NUM_BRAKEPADS, BRAKE_DISTANCE, CYLINDER_ROD, STATIC_FRICTION
+from calculations.tddbhd import (
+    lookup_density, lookup_max_weight, lookup_modulus, lookup_cylinder_bore, lookup_holddown_matrix_key,
+    lookup_holddown_pressure, lookup_hold_down_force, lookup_min_material_width, lookup_reel_type,
+    lookup_drive_key, lookup_drive_torque,
+    calc_M, calc_My, calc_y, calc_web_tension_psi, calc_web_tension_lbs, calc_coil_weight, calc_coil_od,
+    calc_torque_at_mandrel, calc_rewind_torque, calc_hold_down_denominator, calc_hold_down_force_req,
+    calc_torque_required, calc_brake_press_required
+)
+
+# --- Min Material Width ---
+def calc_min_width_holddown(min_material_width):
+    """Smallest width passing check_min_material_width (inclusive)."""
+    return min_material_width
+
+# --- Rewind Torque ---
+def calc_max_coil_od_rewind(web_tension_lbs, torque_at_mandrel):
+    """
+    Largest coil OD passing check_rewind_torque. Solves
+    web_tension_lbs * coil_od / 2 < torque_at_mandrel for coil_od.
+    """
+    if web_tension_lbs <= 0:
+        return inf if torque_at_mandrel > 0 else -inf
+    return 2 * torque_at_mandrel / web_tension_lbs
+
+def calc_max_input_coil_od_rewind(max_coil_od, coil_od_cap):
+    """
+    Largest coil_od input passing check_rewind_torque. The calculation uses
+    min(coil_od, coil_od_cap), so once the reel's max coil weight caps the OD
+    below the bound every input passes.
+    """
+    return inf if coil_od_cap < max_coil_od else max_coil_od
+
+# --- Brake Press ---
+def calc_min_air_pressure_brake_press(brake_press_required):
+    """Smallest air pressure passing check_brake_press. Solves brake_press_required < air_pressure."""
+    return brake_press_required
+
+# --- Hold Down Force ---
+def get_holddown_matrix_entry(holddown_matrix_key):
+    entry = next((entry for entry in lookup_holddown_matrix if entry["key"] == holddown_matrix_key), None)
+    if entry is None:
+        raise ValueError(f"Holddown matrix key {holddown_matrix_key} not found")
+    return entry
+
+def calc_min_air_pressure_hold_down(hold_down_force_req, holddown_matrix_key):
+    """
+    Smallest air pressure passing check_hold_down_force. Air holddowns give
+    ForceFactor * min(air_pressure, MaxPSI); other cylinders run at a fixed PSI,
+    so either every pressure passes (0) or none does (inf).
+    """
+    entry = get_holddown_matrix_entry(holddown_matrix_key)
+    force_factor = entry["ForceFactor"]
+    if "psi Air" not in entry["PressureLabel"]:
+        return 0 if hold_down_force_req < force_factor * entry["PSI"] else inf
+    if force_factor <= 0 or hold_down_force_req >= force_factor * entry["MaxPSI"]:
+        return inf
+    return hold_down_force_req / force_factor
+
+def calc_elastic_limit_thickness(coil_id, yield_strength, modulus):
+    """Thickness where M reaches My; thinner material wraps the coil ID elastically."""
+    return coil_id * yield_strength / modulus
+
+def calc_max_thickness_hold_down(hold_down_force_available, width, coil_id, yield_strength, modulus, static_friction=STATIC_FRICTION):
+    """
+    Largest thickness passing check_hold_down_force. The required force rises
+    monotonically with thickness: M / D = E*w*t^3 / (12*r*D) below the elastic
+    limit t_e, then (w*Y / (4*D)) * (t^2 - t_e^2 / 3) above it, so each branch
+    is inverted directly.
+    """
+    if hold_down_force_available <= 0:
+        return 0
+    radius = coil_id / 2
+    denominator = calc_hold_down_denominator(static_friction, coil_id)
+    elastic_limit = calc_elastic_limit_thickness(coil_id, yield_strength, modulus)
+    elastic = (12 * radius * denominator * hold_down_force_available / (modulus * width)) ** (1/3)
+    if elastic < elastic_limit:
+        return elastic
+    return sqrt(4 * denominator * hold_down_force_available / (width * yield_strength) + elastic_limit**2 / 3)
+
+def calc_max_width_hold_down(hold_down_force_available, hold_down_force_req, width):
+    """Largest width passing check_hold_down_force; the required force is linear in width."""
+    if hold_down_force_req <= 0:
+        return inf
+    return hold_down_force_available * width / hold_down_force_req
+
+def calc_hold_down_force_req_for(data: tddbhd_input, modulus):
+    """Hold down force required for data, as calculate_tbdbhd evaluates it."""
+    M = calc_M(modulus, data.width, data.thickness, data.coil_id)
+    My = calc_My(data.width, data.thickness, data.yield_strength)
+    y = calc_y(data.thickness, data.coil_id, modulus, data.yield_strength)
+    denominator = calc_hold_down_denominator(STATIC_FRICTION, data.coil_id)
+    return calc_hold_down_force_req(M, My, data.width, data.thickness, data.yield_strength, y, denominator)
+
+# --- Main Calculation ---
+def calculate_tddbhd_bounds(data: tddbhd_input):
+    """
+    Return the passing bound on each input for the configuration in data,
+    holding every other input fixed. Air pressure bounds are also limited by
+    check_air_pressure (120 psi); max_coil_od is None when the rewind torque
+    check has no torque to compare against.
+    """
+    try:
+        density = lookup_density(data.material_type)
+        max_weight = lookup_max_weight(data.reel_model)
+        modulus = lookup_modulus(data.material_type)
+        cylinder_bore = lookup_cylinder_bore(data.brake_model)
+        holddown_matrix_key = lookup_holddown_matrix_key(data.reel_model, data.hold_down_assy, data.cylinder)
+        holddown_pressure = lookup_holddown_pressure(holddown_matrix_key, data.air_pressure)
+        hold_down_force_available = lookup_hold_down_force(holddown_matrix_key, holddown_pressure)
+        min_material_width = lookup_min_material_width(holddown_matrix_key)
+        reel_type = lookup_reel_type(data.type_of_line)
+        air_clutch = "Yes" if data.air_clutch else "No"
+        drive_torque = lookup_drive_torque(lookup_drive_key(data.reel_model, air_clutch, data.hyd_threading_drive))
+    except Exception as e:
+        return f"ERROR: Lookup failed: {str(e)}"
+
+    try:
+        web_tension_lbs = calc_web_tension_lbs(data.thickness, data.width, calc_web_tension_psi(data.yield_strength))
+        coil_weight = calc_coil_weight(data.coil_od, data.coil_id, data.width, density, max_weight)
+        coil_od = calc_coil_od(coil_weight, density, data.width, data.coil_id, data.coil_od)
+        coil_od_cap = calc_coil_od(max_weight, density, data.width, data.coil_id, inf)
+        torque_at_mandrel = calc_torque_at_mandrel(reel_type, drive_torque, data.reel_drive_tqempty)
+        rewind_torque = calc_rewind_torque(web_tension_lbs, coil_od)
+        torque_required = calc_torque_required(data.decel, coil_weight, coil_od, data.coil_id, rewind_torque)
+        brake_press_required = calc_brake_press_required(
+            torque_required, data.friction, BRAKE_DISTANCE, NUM_BRAKEPADS,
+            data.brake_model, cylinder_bore, CYLINDER_ROD, data.brake_qty
+        )
+        max_thickness = calc_max_thickness_hold_down(
+            hold_down_force_available, data.width, data.coil_id, data.yield_strength, modulus
+        )
+        hold_down_force_req = calc_hold_down_force_req_for(data, modulus)
+        min_air_pressure_hold_down = calc_min_air_pressure_hold_down(hold_down_force_req, holddown_matrix_key)
+    except Exception as e:
+        return f"ERROR: Calculation failed: {str(e)}"
+
+    max_coil_od = None
+    if torque_at_mandrel is not None:
+        max_coil_od = calc_max_input_coil_od_rewind(
+            calc_max_coil_od_rewind(web_tension_lbs, torque_at_mandrel), coil_od_cap
+        )
+
+    min_air_pressure_brake_press = calc_min_air_pressure_brake_press(brake_press_required)
+    return {
+        "min_width": calc_min_width_holddown(min_material_width),
+        "max_width_hold_down": calc_max_width_hold_down(hold_down_force_available, hold_down_force_req, data.width),
+        "max_coil_od": max_coil_od,
+        "max_thickness": max_thickness,
+        "min_air_pressure_brake_press": min_air_pressure_brake_press,
+        "min_air_pressure_hold_down": min_air_pressure_hold_down,
+        "min_air_pressure": max(min_air_pressure_brake_press, min_air_pressure_hold_down),
+        "max_air_pressure": 120,
+    }
@@ -0,0 +1,173 @@
+"""
+Vectorized TDDBHD Calculation Module
+
+Array-in/array-out version of calculate_tbdbhd. The reel, holddown, brake and
+drive lookups are resolved once from the scalar input; width, thickness, yield,
+coil OD, coil ID and decel may be NumPy arrays that broadcast together.
+"""
+
+import numpy as np
+
+from models import tddbhd_input
+from utils.vectorized import power
+from utils.shared import NUM_BRAKEPADS, BRAKE_DISTANCE, CYLINDER_ROD, STATIC_FRICTION
+from calculations.tddbhd import (
+    lookup_density, lookup_max_weight, lookup_modulus, lookup_cylinder_bore, lookup_holddown_matrix_key,
+    lookup_holddown_pressure, lookup_hold_down_force, lookup_min_material_width, lookup_reel_type,
+    lookup_drive_key, lookup_drive_torque,
+    calc_M, calc_My, calc_y, calc_web_tension_psi, calc_web_tension_lbs, calc_coil_weight, calc_coil_od_for_weight,
+    calc_disp_reel_mtr, calc_torque_at_mandrel, calc_rewind_torque, calc_hold_down_denominator,
+    calc_hold_down_force_req_plastic, calc_decel_torque, calc_brake_press_required, calc_failsafe_holding_force,
+    passes_min_material_width, passes_air_pressure, passes_rewind_torque, passes_hold_down_force,
+    passes_brake_press, passes_torque_required, passes_tddbhd
+)
+
+# --- Lookups ---
+def get_lookup_data(data: tddbhd_input):
+    """Resolve every lookup calculate_tbdbhd needs for one configuration."""
+    holddown_matrix_key = lookup_holddown_matrix_key(data.reel_model, data.hold_down_assy, data.cylinder)
+    holddown_pressure = lookup_holddown_pressure(holddown_matrix_key, data.air_pressure)
+    air_clutch = "Yes" if data.air_clutch else "No"
+    return {
+        "density": lookup_density(data.material_type),
+        "max_weight": lookup_max_weight(data.reel_model),
+        "modulus": lookup_modulus(data.material_type),
+        "cylinder_bore": lookup_cylinder_bore(data.brake_model),
+        "holddown_matrix_key": holddown_matrix_key,
+        "holddown_pressure": holddown_pressure,
+        "hold_down_force_available": lookup_hold_down_force(holddown_matrix_key, holddown_pressure),
+        "min_material_width": lookup_min_material_width(holddown_matrix_key),
+        "reel_type": lookup_reel_type(data.type_of_line),
+        "drive_torque": lookup_drive_torque(lookup_drive_key(data.reel_model, air_clutch, data.hyd_threading_drive)),
+    }
+
+# --- Masked wrappers ---
+def calc_coil_od_masked(coil_weight, density, width, coil_id, input_coil_od):
+    return np.minimum(calc_coil_od_for_weight(coil_weight, density, width, coil_id, power=power, sqrt=np.sqrt), input_coil_od)
+
+def calc_hold_down_force_req_masked(M, My, width, thickness, yield_strength, y, hold_down_denominator):
+    plastic = calc_hold_down_force_req_plastic(width, thickness, yield_strength, y, hold_down_denominator, power=power)
+    return np.where(M < My, M / hold_down_denominator, plastic)
+
+def check_tddbhd_masked(reel_type, min_material_width_check, confirmed_min_width, rewind_torque_check,
+                        hold_down_force_check, brake_press_check, torque_required_check, hold_down_force_available):
+    """Mask of points where check_tddbhd returns "OK". Always False unless the reel is a pull off."""
+    if reel_type.upper() != "PULLOFF":
+        return np.zeros_like(min_material_width_check, dtype=bool)
+    return passes_tddbhd(
+        min_material_width_check, confirmed_min_width, rewind_torque_check, hold_down_force_check,
+        brake_press_check, torque_required_check, hold_down_force_available
+    )
+
+# --- Main Calculation ---
+def calculate_tbdbhd_vectorized(data: tddbhd_input, width=None, thickness=None, yield_strength=None,
+                                coil_od=None, coil_id=None, decel=None):
+    """
+    Evaluate calculate_tbdbhd over arrays of coil and material values.
+
+    Any array left as None falls back to the scalar value in data. Returns a dict
+    with the same keys as calculate_tbdbhd: unrounded float arrays for the outputs
+    and boolean masks for the checks. "valid" is False where the scalar function
+    would fail its calculations, and "all_checks" is the finder's pass criterion
+    (every check PASS and tddbhd_check "OK" or "USE MOTORIZED").
+    """
+    try:
+        lookups = get_lookup_data(data)
+    except Exception as e:
+        return f"ERROR: Lookup failed: {str(e)}"
+
+    width, thickness, yield_strength, coil_od, coil_id, decel = np.broadcast_arrays(*(
+        np.asarray(data_value if value is None else value, dtype=float)
+        for value, data_value in (
+            (width, data.width), (thickness, data.thickness), (yield_strength, data.yield_strength),
+            (coil_od, data.coil_od), (coil_id, data.coil_id), (decel, data.decel),
+        )
+    ))
+
+    density = lookups["density"]
+    modulus = lookups["modulus"]
+    reel_type = lookups["reel_type"]
+    hold_down_force_available = lookups["hold_down_force_available"]
+
+    try:
+        disp_reel_mtr = calc_disp_reel_mtr(data.hyd_threading_drive)
+        torque_at_mandrel = calc_torque_at_mandrel(reel_type, lookups["drive_torque"], data.reel_drive_tqempty)
+        failsafe_holding_force = calc_failsafe_holding_force(
+            data.brake_model, data.friction, NUM_BRAKEPADS, BRAKE_DISTANCE, data.brake_qty
+        )
+        # Scalar brake terms are validated once; the array call below cannot raise.
+        calc_brake_press_required(1, data.friction, BRAKE_DISTANCE, NUM_BRAKEPADS,
+                                  data.brake_model, lookups["cylinder_bore"], CYLINDER_ROD, data.brake_qty)
+    except Exception as e:
+        return f"ERROR: Calculation failed: {str(e)}"
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        M = calc_M(modulus, width, thickness, coil_id, power=power)
+        My = calc_My(width, thickness, yield_strength, power=power)
+        y = calc_y(thickness, coil_id, modulus, yield_strength)
+        web_tension_psi = calc_web_tension_psi(yield_strength)
+        web_tension_lbs = calc_web_tension_lbs(thickness, width, web_tension_psi)
+        coil_weight = calc_coil_weight(coil_od, coil_id, width, density, lookups["max_weight"], power=power, minimum=np.minimum)
+        coil_od = calc_coil_od_masked(coil_weight, density, width, coil_id, coil_od)
+        rewind_torque = calc_rewind_torque(web_tension_lbs, coil_od)
+        hold_down_denominator = calc_hold_down_denominator(STATIC_FRICTION, coil_id)
+        hold_down_force_req = calc_hold_down_force_req_masked(M, My, width, thickness, yield_strength, y, hold_down_denominator)
+        torque_required = calc_decel_torque(decel, coil_weight, coil_od, coil_id, power=power) + rewind_torque
+        brake_press_required = calc_brake_press_required(
+            torque_required, data.friction, BRAKE_DISTANCE, NUM_BRAKEPADS,
+            data.brake_model, lookups["cylinder_bore"], CYLINDER_ROD, data.brake_qty
+        )
+
+    # Points where the scalar calculations divide by zero or take a negative sqrt
+    valid = (
+        (coil_id != 0) & (thickness != 0) & (yield_strength != 0) & (width != 0) &
+        (coil_od != 0) & np.isfinite(coil_od)
+    )
+
+    # Checks
+    min_material_width_check = valid & passes_min_material_width(lookups["min_material_width"], width)
+    air_pressure_check = valid & passes_air_pressure(data.air_pressure)
+    rewind_torque_check = valid & passes_rewind_torque(rewind_torque, torque_at_mandrel)
+    hold_down_force_check = valid & passes_hold_down_force(hold_down_force_req, hold_down_force_available)
+    brake_press_check = valid & passes_brake_press(brake_press_required, data.air_pressure)
+    torque_required_check = valid & passes_torque_required(torque_required, failsafe_holding_force)
+    tddbhd_check = check_tddbhd_masked(
+        reel_type, min_material_width_check, data.confirmed_min_width,
+        rewind_torque_check, hold_down_force_check, brake_press_check,
+        torque_required_check, hold_down_force_available
+    )
+    all_checks = (
+        min_material_width_check & air_pressure_check & rewind_torque_check &
+        hold_down_force_check & brake_press_check & torque_required_check
+    )
+    if reel_type.upper() == "PULLOFF":
+        all_checks = all_checks & tddbhd_check
+
+    return {
+        "friction": data.friction,
+        "web_tension_psi": web_tension_psi,
+        "web_tension_lbs": web_tension_lbs,
+        "calculated_coil_weight": coil_weight,
+        "coil_od": coil_od,
+        "disp_reel_mtr": disp_reel_mtr,
+        "cylinder_bore": lookups["cylinder_bore"],
+        "torque_at_mandrel": torque_at_mandrel,
+        "rewind_torque": rewind_torque,
+        "holddown_pressure": lookups["holddown_pressure"],
+        "hold_down_force_available": hold_down_force_available,
+        "hold_down_force_required": hold_down_force_req,
+        "min_material_width": lookups["min_material_width"],
+        "torque_required": torque_required,
+        "failsafe_required": brake_press_required,
+        "failsafe_holding_force": failsafe_holding_force,
+        "reel_type": reel_type,
+        "valid": valid,
+        "min_material_width_check": min_material_width_check,
+        "air_pressure_check": air_pressure_check,
+        "rewind_torque_check": rewind_torque_check,
+        "hold_down_force_check": hold_down_force_check,
+        "brake_press_check": brake_press_check,
+        "torque_required_check": torque_required_check,
+        "tddbhd_check": tddbhd_check,
+        "all_checks": all_checks,
+    }
@@ -4,10 +4,16 @@ Zig Zag Calculation Module
 """
 from models import zig_zag_input
 from math import pi, sqrt, floor, atan
+from dataclasses import dataclass
 import json
 import os
 
 from utils.physics.time import calculate_feed_time
+from utils.shared import (
+    ZIG_ZAG_MAX_MOTOR_SPEED, ZIG_ZAG_MOTOR_INERTIA, ZIG_ZAG_MOTOR_PEAK_TORQUE, ZIG_ZAG_MOTOR_RMS_TORQUE,
+    ZIG_ZAG_MAX_ACCEL_RATE, ZIG_ZAG_SCREW_LEAD, ZIG_ZAG_BALL_SCREW, ZIG_ZAG_SETTLE_TORQUE, ZIG_ZAG_SETTLE_TIME,
+    ZIG_ZAG_WEIGHT_TO_ACCEL, ZIG_ZAG_COEF_OF_FRICTION
+)
 
 # Build path to the JSON file in utils
 json_file_path = os.path.join(os.path.dirname(__file__), '..', 'utils', 'zig_zag_lookups.json')
@@ -22,7 +28,7 @@ zz_42_tooth = zig_zag_data.get("42_tooth", {})
 zz_24_tooth = zig_zag_data.get("24_tooth", {})
 gear_box = zig_zag_data.get("g_box", {})
 
-def calculate_lbs_inertia(o_dia: float, i_dia: float, length: float, density: float) -> float:
+def calculate_lbs_inertia(o_dia: float, i_dia: float, length: float, density: float, power=pow) -> float:
     """
     Calculate the weight in pounds and inertia for a cylindrical object.
 
@@ -31,6 +37,7 @@ def calculate_lbs_inertia(o_dia: float, i_dia: float, length: float, density: fl
         i_dia (float): Inner diameter of the cylinder in inches (0 if solid).
         length (float): Length of the cylinder in inches.
         density (float): Density of the material in lb/in^3.
+        power: pow, or utils.vectorized.power when o_dia and length are arrays.
 
     Returns:
         tuple: A tuple containing:
@@ -39,16 +46,132 @@ def calculate_lbs_inertia(o_dia: float, i_dia: float, length: float, density: fl
             - refl_inertia (float): Reflected inertia in lb-in^2.
     """
     if i_dia == 0:
-        lbs = ((o_dia ** 2) / 4) * pi * length * density
-        inertia = ((lbs / 32.3) * 0.5 * (((o_dia * 0.5) ** 2) / 144)) * 12
+        lbs = (power(o_dia, 2) / 4) * pi * length * density
+        inertia = ((lbs / 32.3) * 0.5 * (power(o_dia * 0.5, 2) / 144)) * 12
     else:
-        lbs = (((o_dia ** 2) - (i_dia ** 2)) / 4) * pi * length * density
-        inertia = ((lbs / 32.3) * 0.5 * ((((o_dia * 0.5) ** 2) + ((i_dia * 0.5) ** 2)) / 144)) * 12
+        lbs = ((power(o_dia, 2) - (i_dia ** 2)) / 4) * pi * length * density
+        inertia = ((lbs / 32.3) * 0.5 * ((power(o_dia * 0.5, 2) + ((i_dia * 0.5) ** 2)) / 144)) * 12
     
     refl_inertia = inertia / (gear_box["ratio"] ** 2)
     
     return lbs, inertia, refl_inertia
 
+# --- Drivetrain ---
+@dataclass(frozen=True)
+class drivetrain_part:
+    """A sheave or bushing from zig_zag_lookups.json with its weight and inertia."""
+    __slots__ = ("lbs", "inertia", "refl_inertia", "o_dia", "i_dia", "length", "density")
+    lbs: float
+    inertia: float
+    refl_inertia: float
+    o_dia: float
+    i_dia: float
+    length: float
+    density: float
+
+    def to_dict(self):
+        return {field: getattr(self, field) for field in self.__slots__}
+
+@dataclass(frozen=True)
+class zig_zag_drivetrain:
+    """
+    Drivetrain terms that only depend on zig_zag_lookups.json. static_refl_inertia
+    is every reflected inertia except the lead screw's.
+    """
+    __slots__ = (
+        "ratio", "drive_42_sheave", "bush_1_42", "bush_2_42", "drive_24_sheave", "bush_1_24", "bush_2_24",
+        "g_box_refl_inertia", "static_refl_inertia"
+    )
+    ratio: float
+    drive_42_sheave: drivetrain_part
+    bush_1_42: drivetrain_part
+    bush_2_42: drivetrain_part
+    drive_24_sheave: drivetrain_part
+    bush_1_24: drivetrain_part
+    bush_2_24: drivetrain_part
+    g_box_refl_inertia: float
+    static_refl_inertia: float
+
+def get_drivetrain_part(part: dict) -> drivetrain_part:
+    lbs, inertia, refl_inertia = calculate_lbs_inertia(part["o_dia"], part["i_dia"], part["length"], part["density"])
+    return drivetrain_part(lbs, inertia, refl_inertia, part["o_dia"], part["i_dia"], part["length"], part["density"])
+
+def get_zig_zag_drivetrain() -> zig_zag_drivetrain:
+    """Resolve the sheave, bushing and gearbox terms from the loaded lookups."""
+    parts = [
+        get_drivetrain_part(zz_42_tooth["drive_sheave"]),
+        get_drivetrain_part(zz_42_tooth["bush_1"]),
+        get_drivetrain_part(zz_42_tooth["bush_2"]),
+        get_drivetrain_part(zz_24_tooth["drive_sheave"]),
+        get_drivetrain_part(zz_24_tooth["bush_1"]),
+        get_drivetrain_part(zz_24_tooth["bush_2"]),
+    ]
+    g_box_refl_inertia = gear_box["inertia"] * gear_box["qty"]
+    return zig_zag_drivetrain(
+        gear_box["ratio"] * zz_42_tooth["drive_sheave"]["o_dia"] / zz_24_tooth["drive_sheave"]["o_dia"],
+        *parts,
+        g_box_refl_inertia,
+        sum(part.refl_inertia for part in parts) + g_box_refl_inertia,
+    )
+
+# Computed once when the lookups load
+ZIG_ZAG_DRIVETRAIN = get_zig_zag_drivetrain()
+
+def calculate_move_time(accel_time: float, run_time: float, settle_time: float) -> float:
+    """
+    Total move time: accelerate, run, decelerate and settle. Works on arrays.
+
+    Returns:
+        float: Move time in seconds.
+    """
+    return (accel_time * 2) + run_time + settle_time
+
+def calculate_cycle_time(move_time: float, feed_angle: float) -> float:
+    """
+    Cycle time of one move. A feed angle over 20 is the move's share of a 360
+    degree cycle; a smaller one is added to the move time.
+
+    Returns:
+        float: Cycle time in seconds.
+    """
+    if feed_angle > 20:
+        return move_time * (360 / feed_angle)
+    return move_time + feed_angle
+
+def calculate_rms_torque(accel_time: float, run_time: float, settle_time: float, dwell_time: float,
+                         cycle_time: float, peak_torque: float, accel_torque: float, torque_to_accel_drag: float,
+                         friction_at_motor: float, loop_torque: float, setttle_torque: float,
+                         power=pow, sqrt=sqrt) -> float:
+    """
+    Root mean square torque over one cycle, weighting each torque by the time it is applied.
+
+    Args:
+        power, sqrt: pow and math.sqrt, or utils.vectorized.power and np.sqrt over arrays.
+
+    Returns:
+        float: RMS torque in lb-in.
+    """
+    return sqrt(
+        ((power(peak_torque, 2) * accel_time) +
+         (power(accel_torque, 2) * accel_time) +
+         (power(torque_to_accel_drag + friction_at_motor + loop_torque, 2) * run_time) +
+         (power(setttle_torque, 2) * settle_time) +
+         (power(loop_torque, 2) * dwell_time)) / cycle_time
+    )
+
+def calculate_deg_of_rotation(length: float, pivot_to_screw: float, atan=atan) -> float:
+    """
+    Degrees the feeder swings about its pivot for a move of length; only
+    meaningful with a pivot (pivot_to_screw > 0).
+
+    Args:
+        atan: math.atan, or np.arctan over arrays.
+
+    Returns:
+        float: Degrees of rotation.
+    """
+    return atan((length / 2) / pivot_to_screw) * 360 / 2 / pi * 2
+
 def calculate_common_values(accel_time: float, run_time: float, settle_time: float, feed_angle: float,
                            peak_torque: float, accel_torque: float, torque_to_accel_drag: float,
                            friction_at_motor: float, loop_torque: float, setttle_torque: float,
@@ -79,25 +202,18 @@ def calculate_common_values(accel_time: float, run_time: float, settle_time: flo
             - rms_torque (float): Root mean square torque in lb-in.
             - deg_of_rotation (float): Degrees of rotation.
     """
-    move_time = (accel_time * 2) + run_time + settle_time
-
-    if feed_angle > 20:
-        cycle_time = move_time * (360 / feed_angle)
-    else:
-        cycle_time = move_time + feed_angle
+    move_time = calculate_move_time(accel_time, run_time, settle_time)
+    cycle_time = calculate_cycle_time(move_time, feed_angle)
     strokes_per_minute = 60 / cycle_time
     dwell_time = cycle_time - move_time
 
-    rms_torque = sqrt(
-        (((peak_torque ** 2) * accel_time) +
-         ((accel_torque ** 2) * accel_time) +
-         (((torque_to_accel_drag + friction_at_motor + loop_torque) ** 2) * run_time) +
-         ((setttle_torque ** 2) * settle_time) +
-         ((loop_torque ** 2) * dwell_time)) / cycle_time
+    rms_torque = calculate_rms_torque(
+        accel_time, run_time, settle_time, dwell_time, cycle_time, peak_torque, accel_torque,
+        torque_to_accel_drag, friction_at_motor, loop_torque, setttle_torque
     )
 
     if pivot_to_screw > 0:
-        deg_of_rotation = atan((length / 2) / pivot_to_screw) * 360 / 2 / pi * 2
+        deg_of_rotation = calculate_deg_of_rotation(length, pivot_to_screw)
     else:
         deg_of_rotation = 0
 
@@ -156,6 +272,61 @@ def calculate_values(length: float, init_length: float, max_velocity: float,
 
     return accel_time, run_time
 
+def calculate_torque_values(init_accel_time: float, max_accel_rate: float, friction_at_motor: float, loop_torque: float,
+                            max_motor_speed: float, ball_screw: float, screw_lead: float, weight_drag: float, ratio: float,
+                            efficiency: float, refl_inertia: float, pivot_to_screw: float, weight_to_accel: float,
+                            motor_inertia: float):
+    """
+    Calculate the torque breakdown for accelerating the zig-zag drive, which is
+    the same for every table length.
+
+    Returns:
+        dict: The torque to accelerate the drag, reflected inertia, weight and
+        motor, their sum (accel_torque), the peak torque, the torque not used
+        accelerating the motor itself and the lead screw torque per lb of force.
+    """
+    if ball_screw == 0:
+        ln_lb_torque_force_out = screw_lead * 0.177
+    else:
+        ln_lb_torque_force_out = 0.3 * screw_lead
+    temp = (max_motor_speed / 60 * 2 * pi / init_accel_time)
+
+    # Torque to acceleration drag (accel F)
+    torque_to_accel_drag = weight_drag * ln_lb_torque_force_out / ratio / efficiency
+
+    # Torque to accel refl inertia (j-r)
+    torque_to_accel_refl_inertia = temp * refl_inertia / efficiency
+
+    # Torque to accel weight (accel #)
+    if pivot_to_screw == 0:
+        torque_to_accel_weight = ((weight_to_accel / 32.3 * max_accel_rate) * weight_to_accel) / ratio
+    else:
+        torque_to_accel_weight = weight_to_accel / ratio * ln_lb_torque_force_out
+    torque_to_accel_weight /= efficiency
+
+    # Torque to accel motor
+    torque_to_accel_motor = temp * motor_inertia
+
+    # Acceleration torque
+    accel_torque = torque_to_accel_drag + torque_to_accel_refl_inertia + torque_to_accel_weight + torque_to_accel_motor
+
+    # Peak torque
+    peak_torque = accel_torque + friction_at_motor + loop_torque
+
+    # Torque not used in accel
+    torque_not_used = accel_torque - torque_to_accel_motor
+
+    return {
+        "torque_to_accel_drag": torque_to_accel_drag,
+        "torque_to_accel_refl_inertia": torque_to_accel_refl_inertia,
+        "torque_to_accel_weight": torque_to_accel_weight,
+        "torque_to_accel_motor": torque_to_accel_motor,
+        "accel_torque": accel_torque,
+        "peak_torque": peak_torque,
+        "torque_not_used": torque_not_used,
+        "ln_lb_torque_force_out": ln_lb_torque_force_out
+    }
+
 def calculate_table_values(min_length: float, init_length: float, incriment: float, max_accel_rate: float, max_velocity: float,
                            motor_peak_torque: float, settle_time: float, feed_angle: float,
                            friction_at_motor: float, loop_torque: float, setttle_torque: float, max_motor_speed: float,
@@ -191,48 +362,22 @@ def calculate_table_values(min_length: float, init_length: float, incriment: flo
         dict: A dictionary containing the calculated table values and other parameters.
     """    
     table_values = []
-    
-    if ball_screw == 0:
-        ln_lb_torque_force_out = screw_lead * 0.177
-    else:
-        ln_lb_torque_force_out = 0.3 * screw_lead
-    ###############################
-    # Torque Calculations
-    ###############################
-    temp = (max_motor_speed / 60 * 2 * pi / init_accel_time)
 
-    # Torque to acceleration drag (accel F)
-    torque_to_accel_drag = weight_drag * ln_lb_torque_force_out / ratio / efficiency
-
-    # Torque to accel refl inertia (j-r)
-    torque_to_accel_refl_inertia = temp * refl_inertia / efficiency
-
-    # Torque to accel weight (accel #)
-    if pivot_to_screw == 0:
-        torque_to_accel_weight = ((weight_to_accel / 32.3 * max_accel_rate) * weight_to_accel) / ratio
-    else:
-        torque_to_accel_weight = weight_to_accel / ratio * ln_lb_torque_force_out
-    torque_to_accel_weight /= efficiency
-
-    # Torque to accel motor
-    torque_to_accel_motor = temp * motor_inertia
-
-    # Acceleration torque
-    accel_torque = torque_to_accel_drag + torque_to_accel_refl_inertia + torque_to_accel_weight + torque_to_accel_motor
-
-    # Peak torque
-    peak_torque = accel_torque + friction_at_motor + loop_torque
+    init_accel_time, init_run_time = calculate_init_values(
+        min_length, motor_peak_torque, max_accel_rate, max_velocity
+    )
 
-    # Torque not used in accel
-    torque_not_used = accel_torque - torque_to_accel_motor
+    torques = calculate_torque_values(
+        init_accel_time, max_accel_rate, friction_at_motor, loop_torque, max_motor_speed, ball_screw, screw_lead,
+        weight_drag, ratio, efficiency, refl_inertia, pivot_to_screw, weight_to_accel, motor_inertia
+    )
+    torque_to_accel_drag = torques["torque_to_accel_drag"]
+    accel_torque = torques["accel_torque"]
+    peak_torque = torques["peak_torque"]
 
     #######################
     # initial value calculations
     #######################
-    init_accel_time, init_run_time = calculate_init_values(
-        min_length, motor_peak_torque, max_accel_rate, max_velocity
-    )
-    
     init_move_time, init_cycle_time, init_strokes_per_minute, init_dwell_time, init_rms_torque, \
         init_deg_of_rotation = calculate_common_values(
             init_accel_time, init_run_time, settle_time, feed_angle,
@@ -289,16 +434,44 @@ def calculate_table_values(min_length: float, init_length: float, incriment: flo
     return {
         "table_values": table_values,
         "torque_to_accel_drag": torque_to_accel_drag,
-        "torque_to_accel_refl_inertia": torque_to_accel_refl_inertia,
-        "torque_to_accel_weight": torque_to_accel_weight,
-        "torque_to_accel_motor": torque_to_accel_motor,
+        "torque_to_accel_refl_inertia": torques["torque_to_accel_refl_inertia"],
+        "torque_to_accel_weight": torques["torque_to_accel_weight"],
+        "torque_to_accel_motor": torques["torque_to_accel_motor"],
         "accel_torque": accel_torque,
         "peak_torque": peak_torque,
         "rms_torque": rms_torque,
-        "torque_not_used": torque_not_used,
-        "ln_lb_torque_force_out": ln_lb_torque_force_out
+        "torque_not_used": torques["torque_not_used"],
+        "ln_lb_torque_force_out": torques["ln_lb_torque_force_out"]
     }
 
+def calculate_material_lbs(data: zig_zag_input) -> float:
+    """Weight of the material loop the feeder carries, in lbs."""
+    mystery_value = 0
+    # material loop
+    if mystery_value == 12:
+        material_loop = 80
+    elif mystery_value == 18:
+        material_loop = 60
+    elif mystery_value == 24:
+        material_loop = 40
+    else:
+        material_loop = 0
+
+    return data.material_width * data.material_thickness * data.material_density * material_loop
+
+def calculate_weight_drag(pivot_to_screw: float, total_load: float, weight_to_accel: float = ZIG_ZAG_WEIGHT_TO_ACCEL,
+                          coef_of_friction: float = ZIG_ZAG_COEF_OF_FRICTION) -> float:
+    """
+    Friction drag on the feeder: the weight to accelerate on a slide (no
+    pivot), or the total load on a pivot.
+
+    Returns:
+        float: Weight drag in lb.
+    """
+    if pivot_to_screw == 0:
+        return weight_to_accel * coef_of_friction
+    return coef_of_friction * total_load
+
 def calculate_zig_zag(data: zig_zag_input):
     """
     Calculate the zig-zag motion parameters based on the input data.
@@ -312,19 +485,19 @@ def calculate_zig_zag(data: zig_zag_input):
     #########################
     # Variables
     #########################
-    max_motor_speed = 2000
-    motor_inertia = 0.0062
-    motor_peak_torque = 240
-    motor_rms_torque = 87
-    max_accel_rate = 7
-    screw_lead = 1
-    ball_screw = 0
+    max_motor_speed = ZIG_ZAG_MAX_MOTOR_SPEED
+    motor_inertia = ZIG_ZAG_MOTOR_INERTIA
+    motor_peak_torque = ZIG_ZAG_MOTOR_PEAK_TORQUE
+    motor_rms_torque = ZIG_ZAG_MOTOR_RMS_TORQUE
+    max_accel_rate = ZIG_ZAG_MAX_ACCEL_RATE
+    screw_lead = ZIG_ZAG_SCREW_LEAD
+    ball_screw = ZIG_ZAG_BALL_SCREW
 
-    settle_torque = 50
-    settle_time = 0.045
+    settle_torque = ZIG_ZAG_SETTLE_TORQUE
+    settle_time = ZIG_ZAG_SETTLE_TIME
 
-    weight_to_accel = 1000
-    coef_of_friction = 0.1
+    weight_to_accel = ZIG_ZAG_WEIGHT_TO_ACCEL
+    coef_of_friction = ZIG_ZAG_COEF_OF_FRICTION
 
     unknown_o_dia = 0
     unknown_i_dia = 0
@@ -333,8 +506,8 @@ def calculate_zig_zag(data: zig_zag_input):
     unknown_qty = 0
     unknown_lbs = 0
 
-    # Ratio calculations
-    ratio = gear_box["ratio"] * zz_42_tooth["drive_sheave"]["o_dia"] / zz_24_tooth["drive_sheave"]["o_dia"]
+    drivetrain = ZIG_ZAG_DRIVETRAIN
+    ratio = drivetrain.ratio
 
     # Max velocity calculations
     max_velocity = max_motor_speed / ratio * screw_lead / 12 / 60
@@ -342,19 +515,7 @@ def calculate_zig_zag(data: zig_zag_input):
     ##########################
     # Material calculations
     ##########################
-    mystery_value = 0
-    # material loop
-    if mystery_value == 12:
-        material_loop = 80
-    elif mystery_value == 18:
-        material_loop = 60
-    elif mystery_value == 24:
-        material_loop = 40
-    else:
-        material_loop = 0
-    
-    # material lbs
-    material_lbs = data.material_width * data.material_thickness * data.material_density * material_loop
+    material_lbs = calculate_material_lbs(data)
 
     # material inertia
     material_inertia = (
@@ -368,10 +529,7 @@ def calculate_zig_zag(data: zig_zag_input):
     loop_torque = ((material_lbs * (data.lead_screw_o_dia * 0.5)) / ratio) / gear_box["efficiency"]
 
     # Weight drag calculations
-    if data.pivot_to_screw == 0:
-        weight_drag = weight_to_accel * coef_of_friction
-    else:
-        weight_drag = coef_of_friction * data.total_load
+    weight_drag = calculate_weight_drag(data.pivot_to_screw, data.total_load, weight_to_accel, coef_of_friction)
 
     # Screw axial load
     if data.pivot_to_screw == 0:
@@ -390,74 +548,8 @@ def calculate_zig_zag(data: zig_zag_input):
         data.lead_screw_density
     )
 
-    ##########################
-    # 42 tooth calculations
-    ##########################
-    # Drive sheave calculations
-    drive_42_lbs, drive_42_inertia, drive_42_refl_inertia = calculate_lbs_inertia(
-        zz_42_tooth["drive_sheave"]["o_dia"], 
-        zz_42_tooth["drive_sheave"]["i_dia"], 
-        zz_42_tooth["drive_sheave"]["length"], 
-        zz_42_tooth["drive_sheave"]["density"]
-    )
-
-    # Bush 1 calculations
-    bush_1_42_lbs, bush_1_42_inertia, bush_1_42_refl_inertia = calculate_lbs_inertia(
-        zz_42_tooth["bush_1"]["o_dia"], 
-        zz_42_tooth["bush_1"]["i_dia"], 
-        zz_42_tooth["bush_1"]["length"], 
-        zz_42_tooth["bush_1"]["density"]
-    )
-
-    # Bush 2 calculations
-    bush_2_42_lbs, bush_2_42_inertia, bush_2_42_refl_inertia = calculate_lbs_inertia(
-        zz_42_tooth["bush_2"]["o_dia"], 
-        zz_42_tooth["bush_2"]["i_dia"], 
-        zz_42_tooth["bush_2"]["length"], 
-        zz_42_tooth["bush_2"]["density"]
-    )
-
-    ##########################
-    # 24 tooth calculations
-    ##########################
-    # Drive sheave calculations
-    drive_24_lbs, drive_24_inertia, drive_24_refl_inertia = calculate_lbs_inertia(
-        zz_24_tooth["drive_sheave"]["o_dia"], 
-        zz_24_tooth["drive_sheave"]["i_dia"], 
-        zz_24_tooth["drive_sheave"]["length"], 
-        zz_24_tooth["drive_sheave"]["density"]
-    )
-
-    # Bush 1 calculations
-    bush_1_24_lbs, bush_1_24_inertia, bush_1_24_refl_inertia = calculate_lbs_inertia(
-        zz_24_tooth["bush_1"]["o_dia"], 
-        zz_24_tooth["bush_1"]["i_dia"], 
-        zz_24_tooth["bush_1"]["length"], 
-        zz_24_tooth["bush_1"]["density"]
-    )
-
-    # Bush 2 calculations
-    bush_2_24_lbs, bush_2_24_inertia, bush_2_24_refl_inertia = calculate_lbs_inertia(
-        zz_24_tooth["bush_2"]["o_dia"], 
-        zz_24_tooth["bush_2"]["i_dia"], 
-        zz_24_tooth["bush_2"]["length"], 
-        zz_24_tooth["bush_2"]["density"]
-    )
-
-    # Gearbox refl inertia
-    g_box_refl_inertia = gear_box["inertia"] * gear_box["qty"]
-
     # Total inertia calculations
-    total_refl_inertia = (
-        lead_screw_refl_inertia + 
-        drive_42_refl_inertia + 
-        bush_1_42_refl_inertia + 
-        bush_2_42_refl_inertia + 
-        drive_24_refl_inertia + 
-        bush_1_24_refl_inertia + 
-        bush_2_24_refl_inertia + 
-        g_box_refl_inertia
-    )
+    total_refl_inertia = lead_screw_refl_inertia + drivetrain.static_refl_inertia
 
     # Match calculations
     match = total_refl_inertia / motor_inertia
@@ -469,14 +561,23 @@ def calculate_zig_zag(data: zig_zag_input):
     init_length = ((max_velocity / max_accel_rate) * max_velocity) * 12
 
     # Calculate table values
-    table_values, torque_to_accel_drag, torque_to_accel_refl_inertia, torque_to_accel_weight, torque_to_accel_motor, \
-        accel_torque, peak_torque, rms_torque, torque_not_used, ln_lb_torque_force_out = calculate_table_values(
-            data.min_length, init_length, data.incriment, max_accel_rate, max_velocity,
-            motor_peak_torque, settle_time, data.feed_angle,
-            data.misc_friction_at_motor, loop_torque, settle_torque, max_motor_speed,
-            ball_screw, screw_lead, weight_drag, ratio, data.efficiency,
-            total_refl_inertia, data.pivot_to_screw, weight_to_accel, motor_inertia
+    table = calculate_table_values(
+        data.min_length, init_length, data.incriment, max_accel_rate, max_velocity,
+        motor_peak_torque, settle_time, data.feed_angle,
+        data.misc_friction_at_motor, loop_torque, settle_torque, max_motor_speed,
+        ball_screw, screw_lead, weight_drag, ratio, data.efficiency,
+        total_refl_inertia, data.pivot_to_screw, weight_to_accel, motor_inertia
     )
+    table_values = table["table_values"]
+    torque_to_accel_drag = table["torque_to_accel_drag"]
+    torque_to_accel_refl_inertia = table["torque_to_accel_refl_inertia"]
+    torque_to_accel_weight = table["torque_to_accel_weight"]
+    torque_to_accel_motor = table["torque_to_accel_motor"]
+    accel_torque = table["accel_torque"]
+    peak_torque = table["peak_torque"]
+    rms_torque = table["rms_torque"]
+    torque_not_used = table["torque_not_used"]
+    ln_lb_torque_force_out = table["ln_lb_torque_force_out"]
 
     return {
         "ratio": ratio,
@@ -516,71 +617,18 @@ def calculate_zig_zag(data: zig_zag_input):
             "qty": data.lead_screw_qty
         },
 
-        "drive_42_sheave": {
-            "lbs": drive_42_lbs,
-            "inertia": drive_42_inertia,
-            "refl_inertia": drive_42_refl_inertia,
-            "o_dia": zz_42_tooth["drive_sheave"]["o_dia"],
-            "i_dia": zz_42_tooth["drive_sheave"]["i_dia"],
-            "length": zz_42_tooth["drive_sheave"]["length"],
-            "density": zz_42_tooth["drive_sheave"]["density"]
-        },
-
-        "bush_1_42": {
-            "lbs": bush_1_42_lbs,
-            "inertia": bush_1_42_inertia,
-            "refl_inertia": bush_1_42_refl_inertia,
-            "o_dia": zz_42_tooth["bush_1"]["o_dia"],
-            "i_dia": zz_42_tooth["bush_1"]["i_dia"],
-            "length": zz_42_tooth["bush_1"]["length"],
-            "density": zz_42_tooth["bush_1"]["density"]
-        },
-
-        "bush_2_42": {
-            "lbs": bush_2_42_lbs,
-            "inertia": bush_2_42_inertia,
-            "refl_inertia": bush_2_42_refl_inertia,
-            "o_dia": zz_42_tooth["bush_2"]["o_dia"],
-            "i_dia": zz_42_tooth["bush_2"]["i_dia"],
-            "length": zz_42_tooth["bush_2"]["length"],
-            "density": zz_42_tooth["bush_2"]["density"]
-        },
-
-        "drive_24_sheave": {
-            "lbs": drive_24_lbs,
-            "inertia": drive_24_inertia,
-            "refl_inertia": drive_24_refl_inertia,
-            "o_dia": zz_24_tooth["drive_sheave"]["o_dia"],
-            "i_dia": zz_24_tooth["drive_sheave"]["i_dia"],
-            "length": zz_24_tooth["drive_sheave"]["length"],
-            "density": zz_24_tooth["drive_sheave"]["density"]
-        },
-
-        "bush_1_24": {
-            "lbs": bush_1_24_lbs,
-            "inertia": bush_1_24_inertia,
-            "refl_inertia": bush_1_24_refl_inertia,
-            "o_dia": zz_24_tooth["bush_1"]["o_dia"],
-            "i_dia": zz_24_tooth["bush_1"]["i_dia"],
-            "length": zz_24_tooth["bush_1"]["length"],
-            "density": zz_24_tooth["bush_1"]["density"]
-        },
-
-        "bush_2_24": {
-            "lbs": bush_2_24_lbs,
-            "inertia": bush_2_24_inertia,
-            "refl_inertia": bush_2_24_refl_inertia,
-            "o_dia": zz_24_tooth["bush_2"]["o_dia"],
-            "i_dia": zz_24_tooth["bush_2"]["i_dia"],
-            "length": zz_24_tooth["bush_2"]["length"],
-            "density": zz_24_tooth["bush_2"]["density"]
-        },
+        "drive_42_sheave": drivetrain.drive_42_sheave.to_dict(),
+        "bush_1_42": drivetrain.bush_1_42.to_dict(),
+        "bush_2_42": drivetrain.bush_2_42.to_dict(),
+        "drive_24_sheave": drivetrain.drive_24_sheave.to_dict(),
+        "bush_1_24": drivetrain.bush_1_24.to_dict(),
+        "bush_2_24": drivetrain.bush_2_24.to_dict(),
 
         "gear_box": {
             "ratio": gear_box["ratio"],
             "inertia": gear_box["inertia"],
             "qty": gear_box["qty"],
-            "refl_inertia": g_box_refl_inertia
+            "refl_inertia": drivetrain.g_box_refl_inertia
         },
 
         "material": {
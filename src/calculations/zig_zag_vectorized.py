@@ -0,0 +1,327 @@
+"""
+Vectorized Zig Zag Motion Table
+
+Array-in/array-out version of the zig-zag motion table. calculate_table_values
+evaluates calculate_values and calculate_common_values one row at a time for
+23 fixed lengths; here accel, run, move, cycle and dwell times, strokes per
+minute, RMS torque and degrees of rotation are computed for any array of
+lengths at once, along with the torque breakdown they share.
+
+calculate_zig_zag_vectorized extends this to the feeder geometry: pivot to
+screw, feed angle and the lead screw may be arrays, with the drivetrain taken
+from ZIG_ZAG_DRIVETRAIN instead of being recomputed for every design.
+"""
+
+import numpy as np
+
+from models import zig_zag_input
+from utils.vectorized import power
+from utils.shared import (
+    ZIG_ZAG_MAX_MOTOR_SPEED, ZIG_ZAG_MOTOR_INERTIA, ZIG_ZAG_MOTOR_PEAK_TORQUE, ZIG_ZAG_MAX_ACCEL_RATE,
+    ZIG_ZAG_SCREW_LEAD, ZIG_ZAG_BALL_SCREW, ZIG_ZAG_SETTLE_TORQUE, ZIG_ZAG_SETTLE_TIME, ZIG_ZAG_WEIGHT_TO_ACCEL
+)
+from calculations.zig_zag import (
+    ZIG_ZAG_DRIVETRAIN, gear_box, calculate_lbs_inertia, calculate_move_time, calculate_cycle_time,
+    calculate_rms_torque, calculate_deg_of_rotation, calculate_torque_values, calculate_init_values,
+    calculate_weight_drag, calculate_material_lbs
+)
+
+TABLE_ROWS = 23
+
+# --- Calculations ---
+def calc_lbs_inertia_masked(o_dia, i_dia, length, density):
+    """
+    calculate_lbs_inertia over arrays; returns (lbs, inertia, refl_inertia). The
+    solid or hollow branch runs once per distinct inner diameter.
+    """
+    o_dia, i_dia, length = np.broadcast_arrays(*(np.asarray(value, dtype=float) for value in (o_dia, i_dia, length)))
+    lbs, inertia, refl_inertia = (np.empty(o_dia.shape) for _ in range(3))
+    for value in np.unique(i_dia):
+        rows = i_dia == value
+        lbs[rows], inertia[rows], refl_inertia[rows] = calculate_lbs_inertia(
+            o_dia[rows], float(value), length[rows], density, power=power
+        )
+    return lbs, inertia, refl_inertia
+
+def calc_weight_drag_masked(pivot_to_screw, total_load):
+    """calculate_weight_drag over arrays; the slide and pivot branches run once each."""
+    return np.where(
+        pivot_to_screw == 0, calculate_weight_drag(0, total_load), calculate_weight_drag(1, total_load)
+    )
+
+def calc_torque_values_masked(init_accel_time, max_accel_rate, friction_at_motor, loop_torque, max_motor_speed,
+                              ball_screw, screw_lead, weight_drag, ratio, efficiency, refl_inertia, pivot_to_screw,
+                              weight_to_accel, motor_inertia):
+    """
+    calculate_torque_values over arrays; loop torque, weight drag, reflected
+    inertia and pivot to screw may be arrays that broadcast together. An array
+    pivot to screw runs the slide and pivot branches once each and picks per
+    element.
+    """
+    def torque_values(pivot):
+        return calculate_torque_values(
+            init_accel_time, max_accel_rate, friction_at_motor, loop_torque, max_motor_speed, ball_screw, screw_lead,
+            weight_drag, ratio, efficiency, refl_inertia, pivot, weight_to_accel, motor_inertia
+        )
+
+    if np.ndim(pivot_to_screw) == 0:
+        return torque_values(pivot_to_screw)
+    slide, pivoted = torque_values(0), torque_values(1)
+    on_slide = np.asarray(pivot_to_screw) == 0
+    return {key: np.where(on_slide, slide[key], pivoted[key]) for key in slide}
+
+def calc_motion_times(length, init_length, max_velocity, max_accel_rate, init_accel_time):
+    """
+    calculate_values over a length array: moves longer than init_length reach
+    max velocity and run the rest, shorter ones are a triangular move.
+    """
+    long_move = length > init_length
+    with np.errstate(invalid="ignore"):
+        accel_time = np.where(long_move, init_accel_time, np.sqrt((length / 12) / max_accel_rate))
+    run_time = np.where(long_move, ((length - init_length) / 12) / max_velocity, 0.0)
+    return accel_time, run_time
+
+def calc_cycle_time_masked(move_time, feed_angle):
+    """calculate_cycle_time over arrays; the branch runs once per distinct feed angle."""
+    move_time, feed_angle = np.broadcast_arrays(*(np.asarray(value, dtype=float) for value in (move_time, feed_angle)))
+    cycle_time = np.full(move_time.shape, np.nan)
+    for value in np.unique(feed_angle):
+        rows = feed_angle == value
+        cycle_time[rows] = calculate_cycle_time(move_time[rows], float(value))
+    return cycle_time
+
+def calc_cycle_values(accel_time, run_time, length, settle_time, feed_angle, torques, friction_at_motor, loop_torque,
+                      setttle_torque, pivot_to_screw):
+    """
+    calculate_common_values over arrays. Feed angle, pivot to screw and the
+    torques may be arrays that broadcast with the times. np.arctan can differ
+    from math.atan in the last bit, so deg_of_rotation agrees with the scalar
+    table to within an ulp.
+    """
+    move_time = calculate_move_time(accel_time, run_time, settle_time)
+    cycle_time = calc_cycle_time_masked(move_time, feed_angle)
+    strokes_per_minute = 60 / cycle_time
+    dwell_time = cycle_time - move_time
+
+    rms_torque = calculate_rms_torque(
+        accel_time, run_time, settle_time, dwell_time, cycle_time, torques["peak_torque"], torques["accel_torque"],
+        torques["torque_to_accel_drag"], friction_at_motor, loop_torque, setttle_torque, power=power, sqrt=np.sqrt
+    )
+
+    pivot_to_screw = np.asarray(pivot_to_screw, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        deg_of_rotation = np.where(
+            pivot_to_screw > 0, calculate_deg_of_rotation(length, pivot_to_screw, atan=np.arctan), 0.0
+        )
+
+    return {
+        "move_time": move_time,
+        "cycle_time": cycle_time,
+        "strokes_per_minute": strokes_per_minute,
+        "dwell_time": dwell_time,
+        "rms_torque": rms_torque,
+        "deg_of_rotation": deg_of_rotation,
+    }
+
+# --- Main Calculation ---
+def calculate_zig_zag_motion(lengths, init_length, max_accel_rate, max_velocity, settle_time, feed_angle,
+                             friction_at_motor, loop_torque, setttle_torque, max_motor_speed, ball_screw, screw_lead,
+                             weight_drag, ratio, efficiency, refl_inertia, pivot_to_screw, weight_to_accel,
+                             motor_inertia):
+    """
+    Motion table values for an array of lengths (inches), with the arguments of
+    calculate_table_values.
+
+    Returns a dict of arrays shaped like lengths: "length", "accel_time",
+    "run_time", "move_time", "cycle_time", "strokes_per_minute", "dwell_time",
+    "rms_torque" and "deg_of_rotation", plus the torque breakdown of
+    calculate_torque_values, which is the same for every length.
+    """
+    length = np.asarray(lengths, dtype=float)
+    init_accel_time = max_velocity / max_accel_rate
+
+    torques = calc_torque_values_masked(
+        init_accel_time, max_accel_rate, friction_at_motor, loop_torque, max_motor_speed, ball_screw, screw_lead,
+        weight_drag, ratio, efficiency, refl_inertia, pivot_to_screw, weight_to_accel, motor_inertia
+    )
+    accel_time, run_time = calc_motion_times(length, init_length, max_velocity, max_accel_rate, init_accel_time)
+    values = calc_cycle_values(
+        accel_time, run_time, length, settle_time, feed_angle, torques, friction_at_motor, loop_torque,
+        setttle_torque, pivot_to_screw
+    )
+    return {"length": length, "accel_time": accel_time, "run_time": run_time, **values, **torques}
+
+def calculate_table_values_vectorized(min_length, init_length, incriment, max_accel_rate, max_velocity,
+                                      motor_peak_torque, settle_time, feed_angle, friction_at_motor, loop_torque,
+                                      setttle_torque, max_motor_speed, ball_screw, screw_lead, weight_drag, ratio,
+                                      efficiency, refl_inertia, pivot_to_screw, weight_to_accel, motor_inertia):
+    """
+    Drop-in for calculate_table_values: the same arguments and the same dict of
+    table rows and torques, with every row computed in one array pass.
+    """
+    init_accel_time, init_run_time = calculate_init_values(min_length, motor_peak_torque, max_accel_rate, max_velocity)
+    torques = calc_torque_values_masked(
+        init_accel_time, max_accel_rate, friction_at_motor, loop_torque, max_motor_speed, ball_screw, screw_lead,
+        weight_drag, ratio, efficiency, refl_inertia, pivot_to_screw, weight_to_accel, motor_inertia
+    )
+    torques = {key: float(value) for key, value in torques.items()}
+
+    # Row 0 is the initial move at init_length; the rest step up from min_length
+    lengths = [init_length] + [min_length + (incriment * i) for i in range(1, TABLE_ROWS)]
+    length = np.array(lengths, dtype=float)
+    accel_time, run_time = calc_motion_times(length[1:], init_length, max_velocity, max_accel_rate, init_accel_time)
+    accel_time = np.concatenate(([init_accel_time], accel_time))
+    run_time = np.concatenate(([init_run_time], run_time))
+    values = calc_cycle_values(
+        accel_time, run_time, length, settle_time, feed_angle, torques, friction_at_motor, loop_torque,
+        setttle_torque, pivot_to_screw
+    )
+
+    # The scalar table reports no run and no rotation as int 0
+    run_times = [init_run_time] + [
+        float(time) if long_move else 0 for time, long_move in zip(run_time[1:], length[1:] > init_length)
+    ]
+    table_values = [{
+        "index": i,
+        "length": lengths[i],
+        "accel_time": float(accel_time[i]),
+        "run_time": run_times[i],
+        "move_time": float(values["move_time"][i]),
+        "cycle_time": float(values["cycle_time"][i]),
+        "strokes_per_minute": float(values["strokes_per_minute"][i]),
+        "dwell_time": float(values["dwell_time"][i]),
+        "rms_torque": float(values["rms_torque"][i]),
+        # math.atan per row keeps the degrees bit-identical to the scalar table
+        "deg_of_rotation": calculate_deg_of_rotation(lengths[i], pivot_to_screw) if pivot_to_screw > 0 else 0,
+    } for i in range(TABLE_ROWS)]
+
+    init_row = table_values[0]
+    rms_torque = np.sqrt(((power(motor_peak_torque, 2) * init_accel_time) + (power(torques["accel_torque"], 2) * init_accel_time) +
+                          (power(setttle_torque, 2) * settle_time) + (power(loop_torque, 2) * init_row["dwell_time"])) /
+                         init_row["cycle_time"])
+
+    return {
+        "table_values": table_values,
+        "torque_to_accel_drag": torques["torque_to_accel_drag"],
+        "torque_to_accel_refl_inertia": torques["torque_to_accel_refl_inertia"],
+        "torque_to_accel_weight": torques["torque_to_accel_weight"],
+        "torque_to_accel_motor": torques["torque_to_accel_motor"],
+        "accel_torque": torques["accel_torque"],
+        "peak_torque": torques["peak_torque"],
+        "rms_torque": float(rms_torque),
+        "torque_not_used": torques["torque_not_used"],
+        "ln_lb_torque_force_out": torques["ln_lb_torque_force_out"],
+    }
+
+def calculate_zig_zag_vectorized(data: zig_zag_input, pivot_to_screw=None, feed_angle=None, lead_screw_o_dia=None,
+                                 lead_screw_i_dia=None, lead_screw_length=None, total_load=None):
+    """
+    Evaluate calculate_zig_zag over arrays of pivot to screw, feed angle, lead
+    screw outer and inner diameter, lead screw length and total load.
+
+    Any array left as None falls back to the scalar value in data. Returns a
+    dict of arrays at the broadcast shape: the lead screw weight and inertias,
+    "refl_inertia", "match", "loop_torque", "weight_drag", the torque breakdown
+    and "rms_torque", keyed like calculate_zig_zag. The table lengths are
+    shared, so "length" is a 1-D array of the 23 table rows and
+    "table_rms_torque" and "deg_of_rotation" carry them as a trailing axis.
+    """
+    pivot_to_screw, feed_angle, lead_screw_o_dia, lead_screw_i_dia, lead_screw_length, total_load = (
+        np.asarray(data_value if value is None else value, dtype=float)
+        for value, data_value in (
+            (pivot_to_screw, data.pivot_to_screw), (feed_angle, data.feed_angle),
+            (lead_screw_o_dia, data.lead_screw_o_dia), (lead_screw_i_dia, data.lead_screw_i_dia),
+            (lead_screw_length, data.lead_screw_length), (total_load, data.total_load),
+        )
+    )
+    shape = np.broadcast_shapes(
+        pivot_to_screw.shape, feed_angle.shape, lead_screw_o_dia.shape, lead_screw_i_dia.shape,
+        lead_screw_length.shape, total_load.shape
+    )
+
+    # Terms that do not depend on the swept fields
+    ratio = ZIG_ZAG_DRIVETRAIN.ratio
+    max_velocity = ZIG_ZAG_MAX_MOTOR_SPEED / ratio * ZIG_ZAG_SCREW_LEAD / 12 / 60
+    init_length = ((max_velocity / ZIG_ZAG_MAX_ACCEL_RATE) * max_velocity) * 12
+    init_accel_time, init_run_time = calculate_init_values(
+        data.min_length, ZIG_ZAG_MOTOR_PEAK_TORQUE, ZIG_ZAG_MAX_ACCEL_RATE, max_velocity
+    )
+    lengths = [init_length] + [data.min_length + (data.incriment * i) for i in range(1, TABLE_ROWS)]
+    length = np.array(lengths, dtype=float)
+    accel_time, run_time = calc_motion_times(length[1:], init_length, max_velocity, ZIG_ZAG_MAX_ACCEL_RATE, init_accel_time)
+    accel_time = np.concatenate(([init_accel_time], accel_time))
+    run_time = np.concatenate(([init_run_time], run_time))
+
+    lead_screw_lbs, lead_screw_inertia, lead_screw_refl_inertia = calc_lbs_inertia_masked(
+        lead_screw_o_dia, lead_screw_i_dia, lead_screw_length, data.lead_screw_density
+    )
+    refl_inertia = lead_screw_refl_inertia + ZIG_ZAG_DRIVETRAIN.static_refl_inertia
+    loop_torque = ((calculate_material_lbs(data) * (lead_screw_o_dia * 0.5)) / ratio) / gear_box["efficiency"]
+    weight_drag = calc_weight_drag_masked(pivot_to_screw, total_load)
+
+    torques = calc_torque_values_masked(
+        init_accel_time, ZIG_ZAG_MAX_ACCEL_RATE, data.misc_friction_at_motor, loop_torque, ZIG_ZAG_MAX_MOTOR_SPEED,
+        ZIG_ZAG_BALL_SCREW, ZIG_ZAG_SCREW_LEAD, weight_drag, ratio, data.efficiency, refl_inertia, pivot_to_screw,
+        ZIG_ZAG_WEIGHT_TO_ACCEL, ZIG_ZAG_MOTOR_INERTIA
+    )
+
+    # Table rows run along a trailing axis
+    with np.errstate(divide="ignore", invalid="ignore"):
+        values = calc_cycle_values(
+            accel_time, run_time, length, ZIG_ZAG_SETTLE_TIME, feed_angle[..., None],
+            {key: np.asarray(value)[..., None] for key, value in torques.items()},
+            data.misc_friction_at_motor, loop_torque[..., None], ZIG_ZAG_SETTLE_TORQUE, pivot_to_screw[..., None]
+        )
+        rms_torque = np.sqrt(
+            ((power(ZIG_ZAG_MOTOR_PEAK_TORQUE, 2) * init_accel_time) + (power(torques["accel_torque"], 2) * init_accel_time) +
+             (power(ZIG_ZAG_SETTLE_TORQUE, 2) * ZIG_ZAG_SETTLE_TIME) + (power(loop_torque, 2) * values["dwell_time"][..., 0])) /
+            values["cycle_time"][..., 0]
+        )
+
+    results = {
+        "lead_screw_lbs": lead_screw_lbs,
+        "lead_screw_inertia": lead_screw_inertia,
+        "lead_screw_refl_inertia": lead_screw_refl_inertia,
+        "refl_inertia": refl_inertia,
+        "match": refl_inertia / ZIG_ZAG_MOTOR_INERTIA,
+        "loop_torque": loop_torque,
+        "weight_drag": weight_drag,
+        "torque_to_accel_drag": torques["torque_to_accel_drag"],
+        "torque_to_accel_refl_inertia": torques["torque_to_accel_refl_inertia"],
+        "torque_to_accel_weight": torques["torque_to_accel_weight"],
+        "torque_to_accel_motor": torques["torque_to_accel_motor"],
+        "accel_torque": torques["accel_torque"],
+        "peak_torque": torques["peak_torque"],
+        "rms_torque": rms_torque,
+        "torque_not_used": torques["torque_not_used"],
+        "table_rms_torque": values["rms_torque"],
+        "deg_of_rotation": values["deg_of_rotation"],
+    }
+    # Outputs of fewer inputs (e.g. match) come back as read-only views at the full shape
+    results = {
+        key: np.broadcast_to(value, shape + (TABLE_ROWS,) if key in ("table_rms_torque", "deg_of_rotation") else shape)
+        for key, value in results.items()
+    }
+    results["length"] = length
+    return results
+
+def calculate_zig_zag_grid(data: zig_zag_input, pivot_to_screws=None, feed_angles=None, lead_screw_o_dias=None,
+                           lead_screw_lengths=None):
+    """
+    Evaluate calculate_zig_zag_vectorized over the Cartesian grid of the given
+    axes (None keeps the value in data); output arrays are shaped (pivot to
+    screws, feed angles, lead screw outer diameters, lead screw lengths), with
+    the table rows trailing where they apply.
+    """
+    axes = (
+        (pivot_to_screws, data.pivot_to_screw), (feed_angles, data.feed_angle),
+        (lead_screw_o_dias, data.lead_screw_o_dia), (lead_screw_lengths, data.lead_screw_length),
+    )
+    pivot_to_screw, feed_angle, lead_screw_o_dia, lead_screw_length = np.meshgrid(
+        *(np.atleast_1d(np.asarray(data_value if axis is None else axis, dtype=float)) for axis, data_value in axes),
+        indexing="ij", sparse=True
+    )
+    return calculate_zig_zag_vectorized(
+        data, pivot_to_screw=pivot_to_screw, feed_angle=feed_angle, lead_screw_o_dia=lead_screw_o_dia,
+        lead_screw_length=lead_screw_length
+    )
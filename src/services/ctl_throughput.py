@@ -0,0 +1,103 @@
+"""
+Cut to Length Throughput Service
+
+Parts per minute and FPM over part length for a feed followed by a hydraulic
+shear. The feed indexes a part while the blade is up, then waits while the
+shear strokes and dwells, so a part takes the feed index time plus the shear
+cycle time. The straightener can also cap throughput at its maximum speed.
+
+The feed timing invariants (calculate_init_values) and the shear cycle are
+computed once; only the index time is evaluated per length, over an array.
+"""
+
+import numpy as np
+
+from models import time_input, hyd_shear_input
+from utils.physics.time import calculate_init_values
+from services.hyd_shear_calculations import calc_parts_per_minute
+
+BOTTLENECKS = ("feed", "shear", "straightener")
+
+# --- Calculations ---
+def get_chart_lengths(data: time_input, points=23):
+    """The part lengths calculate_time charts: min_length, then increment steps."""
+    return data.min_length + data.increment * np.arange(points)
+
+def calc_index_time(data: time_input, init_values, length):
+    """
+    Feed index time for each length, as calculate_values computes it: full
+    acceleration plus a run at velocity beyond init_length, a shorter
+    triangular move below it.
+    """
+    long_move = length > init_values["init_length"]
+    acceleration_time = np.where(long_move, init_values["init_acceleration_time"], np.sqrt((length / 12) / data.acceleration))
+    runtime = np.where(long_move, ((length - init_values["init_length"]) / 12) / data.velocity, 0.0)
+    return (acceleration_time * 2) + runtime + data.settle_time
+
+def calc_shear_cycle_time(shear: hyd_shear_input):
+    """Down and up stroke plus dwell, the cycle calc_parts_per_minute rates."""
+    return shear.time_for_down_stroke * 2 + shear.dwell_time
+
+def calc_straightener_parts_per_minute(data: time_input, length):
+    """Parts per minute at the straightener's maximum speed; unlimited (inf) when it has none."""
+    if data.str_max_sp_inch <= 0:
+        return np.full(length.shape, np.inf)
+    return data.str_max_sp_inch / length
+
+# --- Main Calculation ---
+def calculate_ctl_throughput(data: time_input, shear: hyd_shear_input, lengths=None):
+    """
+    Throughput of a cut to length line over part lengths (inches).
+
+    lengths defaults to the calculate_time chart lengths. Returns arrays over
+    length: feed index time, line cycle time, the parts per minute each machine
+    allows on its own, the line's parts per minute, parts per hour and FPM, and
+    "bottleneck", the machine that limits each length (one of BOTTLENECKS).
+    The shear cycle is a scalar. "max_fpm" and "max_fpm_length" give the
+    fastest length.
+    """
+    if data.application.lower() == "press feed":
+        return "ERROR: Throughput is only modeled for Cut to Length lines."
+    if calc_shear_cycle_time(shear) <= 0:
+        return "ERROR: Shear cycle time must be positive."
+
+    length = get_chart_lengths(data) if lengths is None else np.asarray(lengths, dtype=float)
+    if length.size == 0 or np.any(length <= 0):
+        return "ERROR: Part lengths must be positive."
+
+    try:
+        # The feed angle only enters the cycle values, which are not used here
+        init_values = calculate_init_values(data, data.feed_angle_1)
+    except (ValueError, ZeroDivisionError) as e:
+        return f"ERROR: Feed time calculation failed: {e}"
+
+    index_time = calc_index_time(data, init_values, length)
+    shear_cycle_time = calc_shear_cycle_time(shear)
+    cycle_time = index_time + shear_cycle_time
+
+    feed_parts_per_minute = 60 / index_time
+    shear_parts_per_minute = calc_parts_per_minute(shear.time_for_down_stroke, shear.dwell_time)
+    straightener_parts_per_minute = calc_straightener_parts_per_minute(data, length)
+    parts_per_minute = np.minimum(60 / cycle_time, straightener_parts_per_minute)
+    fpm = parts_per_minute * length / 12
+
+    bottleneck = np.where(
+        straightener_parts_per_minute < 60 / cycle_time, "straightener",
+        np.where(index_time >= shear_cycle_time, "feed", "shear")
+    )
+    fastest = int(np.argmax(fpm))
+    return {
+        "length": length,
+        "index_time": index_time,
+        "shear_cycle_time": shear_cycle_time,
+        "cycle_time": cycle_time,
+        "feed_parts_per_minute": feed_parts_per_minute,
+        "shear_parts_per_minute": shear_parts_per_minute,
+        "straightener_parts_per_minute": straightener_parts_per_minute,
+        "parts_per_minute": parts_per_minute,
+        "parts_per_hour": parts_per_minute * 60,
+        "fpm": fpm,
+        "bottleneck": bottleneck,
+        "max_fpm": float(fpm[fastest]),
+        "max_fpm_length": float(length[fastest]),
+    }
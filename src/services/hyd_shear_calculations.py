@@ -4,6 +4,7 @@ Hydraulic Shear Calculations Service
 
 from models import hyd_shear_input
 from math import pi, atan, tan, radians
+from utils.shared import HYD_SHEAR_SAFETY_MARGIN
 
 def calc_shear_strength(material_tensile):
     return material_tensile * 0.75
@@ -32,8 +33,9 @@ def calc_actual_opening_above_max_material(coil_width, angle_of_blade, overlap,
     else:
         return stroke - min_stroke_for_blade
 
-def calc_cylinder_area(bore_size, rod_dia):
-    return ((bore_size / 2) ** 2) * pi - ((rod_dia / 2) ** 2) * pi
+def calc_cylinder_area(bore_size, rod_dia, power=pow):
+    """Pass utils.vectorized.power for power to match pow over arrays."""
+    return power(bore_size / 2, 2) * pi - power(rod_dia / 2, 2) * pi
 
 def calc_cylinder_volume(cylinder_area, stroke):
     return cylinder_area * stroke
@@ -71,13 +73,17 @@ def calc_averaged_gallons_per_minute_req(instant_gallons_per_minute_req, parts_p
 def calc_fluid_velocity(instant_gallons_per_minute_req, cylinder_area):
     return instant_gallons_per_minute_req / (3.117 * cylinder_area)
 
-def calc_force_req_to_shear_check(total_force_applied_lbs, force_req_to_shear):
-    if total_force_applied_lbs > (force_req_to_shear * 1.15):
+def check_force_req_to_shear(total_force_applied_lbs, force_req_to_shear, safety_margin=HYD_SHEAR_SAFETY_MARGIN):
+    """True where the applied force clears the force to shear by the safety margin; works on arrays."""
+    return total_force_applied_lbs > (force_req_to_shear * safety_margin)
+
+def calc_force_req_to_shear_check(total_force_applied_lbs, force_req_to_shear, safety_margin=HYD_SHEAR_SAFETY_MARGIN):
+    if check_force_req_to_shear(total_force_applied_lbs, force_req_to_shear, safety_margin):
         return "OK"
     else:
         return "NOT OK"
 
-def calculate_hyd_shear(data: hyd_shear_input, spec_type: str = "single_rake"):
+def calculate_hyd_shear(data: hyd_shear_input, spec_type: str = "single_rake", safety_margin=HYD_SHEAR_SAFETY_MARGIN):
     shear_strength = calc_shear_strength(data.material_tensile)
     angle_of_blade = calc_angle_of_blade(data.rake_of_blade)
     length_of_init_cut = calc_length_of_init_cut(data.material_thickness, angle_of_blade)
@@ -102,7 +108,7 @@ def calculate_hyd_shear(data: hyd_shear_input, spec_type: str = "single_rake"):
         instant_gallons_per_minute_req, parts_per_minute, shear_strokes_per_minute
     )
     fluid_velocity = calc_fluid_velocity(instant_gallons_per_minute_req, cylinder_area)
-    force_req_to_shear_check = calc_force_req_to_shear_check(total_force_applied_lbs, force_req_to_shear)
+    force_req_to_shear_check = calc_force_req_to_shear_check(total_force_applied_lbs, force_req_to_shear, safety_margin)
 
     return {
         "shear_strength": shear_strength,
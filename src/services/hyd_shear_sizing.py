@@ -0,0 +1,145 @@
+"""
+Hydraulic Shear Cylinder Sizing Service
+
+Finds the smallest standard cylinder and pressure that shear the material with
+the required safety margin. The force formulas in hyd_shear_calculations are
+inverted for the cylinder area each pressure needs, and the sorted catalog is
+searched for it instead of trying every bore, rod and pressure.
+"""
+
+import numpy as np
+from math import pi
+
+from models import hyd_shear_input
+from utils.shared import HYD_SHEAR_SAFETY_MARGIN, HYD_PRESSURE_OPTIONS, HYD_CYLINDER_RODS
+from services.hyd_shear_calculations import (
+    calculate_hyd_shear, calc_shear_strength, calc_angle_of_blade, calc_length_of_init_cut, calc_area_of_cut,
+    calc_cylinder_area, calc_cylinder_volume, calc_force_per_cylinder, calc_total_force_applied_lbs,
+    calc_force_req_to_shear, calc_instant_gallons_per_minute_req, calc_fluid_velocity, check_force_req_to_shear
+)
+
+# --- Catalog ---
+def get_cylinder_catalog(cylinder_rods=HYD_CYLINDER_RODS):
+    """
+    Bores in ascending order with their rods in ascending order, and the largest
+    area each bore offers (smallest rod) as a running maximum so it can be
+    searched with np.searchsorted.
+    """
+    bores = sorted(cylinder_rods)
+    rods = [sorted(cylinder_rods[bore]) for bore in bores]
+    max_areas = np.maximum.accumulate([calc_cylinder_area(bore, bore_rods[0]) for bore, bore_rods in zip(bores, rods)])
+    return bores, rods, max_areas
+
+# --- Calculations ---
+def calc_force_req_to_shear_for(data: hyd_shear_input, spec_type):
+    """Force required to shear, which depends only on the material and blade."""
+    angle_of_blade = calc_angle_of_blade(data.rake_of_blade)
+    length_of_init_cut = calc_length_of_init_cut(data.material_thickness, angle_of_blade)
+    area_of_cut = calc_area_of_cut(data.material_thickness, length_of_init_cut, spec_type)
+    return calc_force_req_to_shear(area_of_cut, calc_shear_strength(data.material_tensile), data.percent_of_penetration)
+
+def calc_required_cylinder_area(force_req_to_shear, pressure, safety_margin):
+    """
+    Inverse of the applied force: total_force_applied_lbs is cylinder_area *
+    pressure, so the area must exceed force_req_to_shear * safety_margin / pressure.
+    """
+    return force_req_to_shear * safety_margin / pressure
+
+def passes_force(cylinder_area, pressure, force_req_to_shear, safety_margin):
+    total_force_applied_lbs = calc_total_force_applied_lbs(calc_force_per_cylinder(cylinder_area, pressure))
+    return check_force_req_to_shear(total_force_applied_lbs, force_req_to_shear, safety_margin)
+
+def find_cylinder(catalog, required_area, pressure, force_req_to_shear, safety_margin):
+    """
+    Smallest bore whose largest area exceeds required_area, with the largest rod
+    that still does (least oil per stroke). Returns (bore, rod, area) or None.
+    """
+    bores, rods, max_areas = catalog
+    start = int(np.searchsorted(max_areas, required_area, side="right"))
+    for bore, bore_rods in zip(bores[start:], rods[start:]):
+        # Rod area falls as the rod grows, so rods up to sqrt(bore^2 - 4 * area / pi) qualify;
+        # one more is tried in case the bound sits an ulp off the exact check
+        max_rod = np.sqrt(max(bore ** 2 - 4 * required_area / pi, 0))
+        count = int(np.searchsorted(bore_rods, max_rod, side="right"))
+        for rod in reversed(bore_rods[:count + 1]):
+            cylinder_area = calc_cylinder_area(bore, rod)
+            if passes_force(cylinder_area, pressure, force_req_to_shear, safety_margin):
+                return bore, rod, cylinder_area
+    return None
+
+def calc_down_stroke_time(data: hyd_shear_input, cylinder_area, max_fluid_velocity=None, max_gpm=None):
+    """
+    Down stroke time: data.time_for_down_stroke, slowed where needed so the
+    instant fluid velocity and GPM (calc_fluid_velocity,
+    calc_instant_gallons_per_minute_req) stay within the limits given.
+    """
+    # Both scale with 1 / down stroke time, so take them for a 1 second stroke and divide by the limit
+    gpm_at_one_second = calc_instant_gallons_per_minute_req(calc_cylinder_volume(cylinder_area, data.stroke), 1)
+    times = [data.time_for_down_stroke]
+    if max_fluid_velocity is not None:
+        times.append(calc_fluid_velocity(gpm_at_one_second, cylinder_area) / max_fluid_velocity)
+    if max_gpm is not None:
+        times.append(gpm_at_one_second / max_gpm)
+    return max(times)
+
+# --- Main Calculation ---
+def size_hyd_shear_cylinder(data: hyd_shear_input, spec_type: str = "single_rake", safety_margin=HYD_SHEAR_SAFETY_MARGIN,
+                            max_fluid_velocity=None, max_gpm=None, pressures=HYD_PRESSURE_OPTIONS,
+                            cylinder_rods=HYD_CYLINDER_RODS):
+    """
+    Smallest standard cylinder that shears the material in data (bore, rod and
+    pressure in data are ignored).
+
+    For each pressure the smallest bore that reaches the required force is
+    chosen, with its largest passing rod. The recommendation is the smallest
+    bore overall at the lowest pressure that allows it. Each option carries the
+    down stroke time allowed by the velocity and GPM limits and the resulting
+    calculate_hyd_shear results, including parts per minute, with the force
+    check taken at safety_margin.
+    """
+    if safety_margin <= 0:
+        return "ERROR: Safety margin must be positive."
+    if (max_fluid_velocity is not None and max_fluid_velocity <= 0) or (max_gpm is not None and max_gpm <= 0):
+        return "ERROR: Fluid velocity and GPM limits must be positive."
+    if data.stroke <= 0:
+        return "ERROR: Cylinder stroke must be positive."
+    if data.time_for_down_stroke <= 0 and max_fluid_velocity is None and max_gpm is None:
+        return "ERROR: Time for down stroke must be positive without a fluid velocity or GPM limit."
+
+    try:
+        force_req_to_shear = calc_force_req_to_shear_for(data, spec_type)
+    except (ValueError, ZeroDivisionError) as e:
+        return f"ERROR: Hyd shear force calculation failed: {e}"
+
+    catalog = get_cylinder_catalog(cylinder_rods)
+    options = []
+    for pressure in sorted(pressures):
+        required_area = calc_required_cylinder_area(force_req_to_shear, pressure, safety_margin)
+        cylinder = find_cylinder(catalog, required_area, pressure, force_req_to_shear, safety_margin)
+        if cylinder is None:
+            continue
+        bore, rod, cylinder_area = cylinder
+        time_for_down_stroke = calc_down_stroke_time(data, cylinder_area, max_fluid_velocity, max_gpm)
+        shear = calculate_hyd_shear(data.copy(update={
+            "bore_size": bore, "rod_dia": rod, "pressure": pressure, "time_for_down_stroke": time_for_down_stroke,
+        }), spec_type, safety_margin)
+        options.append({
+            "bore_size": bore,
+            "rod_dia": rod,
+            "pressure": pressure,
+            "required_cylinder_area": required_area,
+            "time_for_down_stroke": time_for_down_stroke,
+            "parts_per_minute": shear["parts_per_minute"],
+            "shear": shear,
+        })
+
+    if not options:
+        return "ERROR: No standard cylinder reaches the force required to shear."
+
+    recommended = min(options, key=lambda option: (option["bore_size"], option["pressure"]))
+    return {
+        "force_req_to_shear": force_req_to_shear,
+        "safety_margin": safety_margin,
+        "recommended": recommended,
+        "options": options,
+    }
@@ -0,0 +1,150 @@
+"""
+Vectorized Hydraulic Shear Calculations Service
+
+Array-in/array-out version of calculate_hyd_shear for sizing a single rake or
+bow tie shear. Material and blade settings come from the scalar input; bore
+size, rod diameter, pressure, stroke, rake of blade and time for down stroke
+may be NumPy arrays that broadcast together.
+"""
+
+import numpy as np
+
+from models import hyd_shear_input
+from utils.vectorized import power
+from services.hyd_shear_calculations import (
+    calc_shear_strength, calc_angle_of_blade, calc_length_of_init_cut, calc_area_of_cut, calc_min_stroke_for_blade,
+    calc_min_stroke_req_for_opening, calc_actual_opening_above_max_material, calc_cylinder_area, calc_cylinder_volume,
+    calc_force_per_cylinder, calc_total_force_applied_lbs, calc_force_req_to_shear, calc_total_force_applied_tons,
+    calc_safety_factor, calc_instant_gallons_per_minute_req, calc_shear_strokes_per_minute, calc_parts_per_minute,
+    calc_parts_per_hour, calc_averaged_gallons_per_minute_req, calc_fluid_velocity, check_force_req_to_shear
+)
+
+SPEC_TYPES = ("single_rake", "bow_tie")
+
+# --- Calculations ---
+def calc_blade_terms(data: hyd_shear_input, rake_of_blade, spec_type):
+    """
+    Blade angle, initial cut, cut area and minimum stroke for each rake. They
+    only depend on the rake, so the scalar functions run once per distinct rake.
+    """
+    rakes, inverse = np.unique(rake_of_blade, return_inverse=True)
+    columns = []
+    for rake in rakes:
+        angle_of_blade = calc_angle_of_blade(float(rake))
+        length_of_init_cut = calc_length_of_init_cut(data.material_thickness, angle_of_blade)
+        min_stroke_for_blade = calc_min_stroke_for_blade(data.coil_width, angle_of_blade, data.material_thickness, data.overlap)
+        columns.append((
+            angle_of_blade,
+            length_of_init_cut,
+            calc_area_of_cut(data.material_thickness, length_of_init_cut, spec_type),
+            min_stroke_for_blade,
+            # Bow tie openings do not depend on the stroke
+            calc_actual_opening_above_max_material(data.coil_width, angle_of_blade, data.overlap, 0.0, min_stroke_for_blade, spec_type),
+        ))
+    values = np.array(columns)[inverse.reshape(rake_of_blade.shape)]
+    return {
+        "angle_of_blade": values[..., 0],
+        "length_of_init_cut": values[..., 1],
+        "area_of_cut": values[..., 2],
+        "min_stroke_for_blade": values[..., 3],
+        "bow_tie_opening": values[..., 4],
+    }
+
+# --- Main Calculation ---
+def calculate_hyd_shear_vectorized(data: hyd_shear_input, spec_type: str = "single_rake", bore_size=None, rod_dia=None,
+                                   pressure=None, stroke=None, rake_of_blade=None, time_for_down_stroke=None):
+    """
+    Evaluate calculate_hyd_shear over arrays of bore size, rod diameter,
+    pressure, stroke, rake of blade and time for down stroke.
+
+    Any array left as None falls back to the scalar value in data. Returns a dict
+    of unrounded float arrays keyed like calculate_hyd_shear, with
+    "force_req_to_shear_check" as a boolean mask. "valid" is False where the
+    scalar function divides by zero (no cylinder area, force to shear or down
+    stroke time).
+    """
+    bore_size, rod_dia, pressure, stroke, rake_of_blade, time_for_down_stroke = (
+        np.asarray(data_value if value is None else value, dtype=float)
+        for value, data_value in (
+            (bore_size, data.bore_size), (rod_dia, data.rod_dia), (pressure, data.pressure), (stroke, data.stroke),
+            (rake_of_blade, data.rake_of_blade), (time_for_down_stroke, data.time_for_down_stroke),
+        )
+    )
+    shape = np.broadcast_shapes(
+        bore_size.shape, rod_dia.shape, pressure.shape, stroke.shape, rake_of_blade.shape, time_for_down_stroke.shape
+    )
+
+    # Blade terms are resolved on the rake array before it is broadcast
+    try:
+        blade = calc_blade_terms(data, rake_of_blade, spec_type)
+    except (ValueError, ZeroDivisionError) as e:
+        return f"ERROR: Hyd shear blade calculation failed: {e}"
+
+    shear_strength = calc_shear_strength(data.material_tensile)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        min_stroke_req_for_opening = calc_min_stroke_req_for_opening(blade["min_stroke_for_blade"], data.blade_opening)
+        if spec_type == "bow_tie":
+            actual_opening_above_max_material = blade["bow_tie_opening"]
+        else:
+            actual_opening_above_max_material = stroke - blade["min_stroke_for_blade"]
+        cylinder_area = calc_cylinder_area(bore_size, rod_dia, power=power)
+        cylinder_volume = calc_cylinder_volume(cylinder_area, stroke)
+        force_per_cylinder = calc_force_per_cylinder(cylinder_area, pressure)
+        total_force_applied_lbs = calc_total_force_applied_lbs(force_per_cylinder)
+        force_req_to_shear = calc_force_req_to_shear(blade["area_of_cut"], shear_strength, data.percent_of_penetration)
+        total_force_applied_tons = calc_total_force_applied_tons(total_force_applied_lbs)
+        safety_factor = calc_safety_factor(total_force_applied_lbs, force_req_to_shear)
+        instant_gallons_per_minute_req = calc_instant_gallons_per_minute_req(cylinder_volume, time_for_down_stroke)
+        shear_strokes_per_minute = calc_shear_strokes_per_minute(time_for_down_stroke)
+        parts_per_minute = calc_parts_per_minute(time_for_down_stroke, data.dwell_time)
+        parts_per_hour = calc_parts_per_hour(parts_per_minute)
+        averaged_gallons_per_minute_req = calc_averaged_gallons_per_minute_req(
+            instant_gallons_per_minute_req, parts_per_minute, shear_strokes_per_minute
+        )
+        fluid_velocity = calc_fluid_velocity(instant_gallons_per_minute_req, cylinder_area)
+
+    valid = (cylinder_area != 0) & (force_req_to_shear != 0) & (time_for_down_stroke != 0)
+    force_req_to_shear_check = valid & check_force_req_to_shear(total_force_applied_lbs, force_req_to_shear)
+
+    results = {
+        "shear_strength": shear_strength,
+        "angle_of_blade": blade["angle_of_blade"],
+        "length_of_init_cut": blade["length_of_init_cut"],
+        "area_of_cut": blade["area_of_cut"],
+        "min_stroke_for_blade": blade["min_stroke_for_blade"],
+        "min_stroke_req_for_opening": min_stroke_req_for_opening,
+        "actual_opening_above_max_material": actual_opening_above_max_material,
+        "cylinder_area": cylinder_area,
+        "cylinder_volume": cylinder_volume,
+        "fluid_velocity": fluid_velocity,
+        "force_per_cylinder": force_per_cylinder,
+        "total_force_applied_lbs": total_force_applied_lbs,
+        "force_req_to_shear": force_req_to_shear,
+        "force_req_to_shear_check": force_req_to_shear_check,
+        "total_force_applied_tons": total_force_applied_tons,
+        "safety_factor": safety_factor,
+        "instant_gallons_per_minute_req": instant_gallons_per_minute_req,
+        "averaged_gallons_per_minute_req": averaged_gallons_per_minute_req,
+        "shear_strokes_per_minute": shear_strokes_per_minute,
+        "parts_per_minute": parts_per_minute,
+        "parts_per_hour": parts_per_hour,
+        "valid": valid,
+    }
+    # Outputs of fewer inputs (e.g. parts per minute) come back as read-only views at the full shape
+    return {key: value if key == "shear_strength" else np.broadcast_to(value, shape) for key, value in results.items()}
+
+def calculate_hyd_shear_grid(data: hyd_shear_input, spec_type: str, bore_sizes, rod_dias, pressures, strokes,
+                             rakes_of_blade, down_stroke_times):
+    """
+    Evaluate calculate_hyd_shear_vectorized over the Cartesian grid of the given
+    axes; output arrays are shaped (bore sizes, rod diameters, pressures,
+    strokes, rakes, down stroke times).
+    """
+    bore_size, rod_dia, pressure, stroke, rake_of_blade, time_for_down_stroke = np.meshgrid(
+        *(np.asarray(axis, dtype=float) for axis in (bore_sizes, rod_dias, pressures, strokes, rakes_of_blade, down_stroke_times)),
+        indexing="ij", sparse=True
+    )
+    return calculate_hyd_shear_vectorized(
+        data, spec_type, bore_size=bore_size, rod_dia=rod_dia, pressure=pressure, stroke=stroke,
+        rake_of_blade=rake_of_blade, time_for_down_stroke=time_for_down_stroke
+    )
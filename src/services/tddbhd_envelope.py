@@ -0,0 +1,122 @@
+"""
+TDDBHD Feasibility Envelope Service
+
+Maps where a reel model and holddown assembly pass every TDDBHD check over a
+width x thickness x yield grid, and extracts the boundary of that region.
+"""
+
+from collections import OrderedDict
+from threading import Lock
+
+import numpy as np
+
+from models import tddbhd_input
+from calculations.tddbhd_vectorized import calculate_tbdbhd_vectorized
+from utils.lookup_tables import LOOKUP_TABLE_VERSION
+
+# Default grid axes
+ENVELOPE_WIDTHS = np.arange(1.0, 73.0, 1.0)
+ENVELOPE_THICKNESSES = np.round(np.arange(0.01, 1.005, 0.01), 3)
+ENVELOPE_YIELDS = np.arange(10000.0, 120001.0, 10000.0)
+
+# Envelopes kept, least recently used first out
+ENVELOPE_CACHE_SIZE = 64
+
+# Envelopes keyed by (reel_model, hold_down_assy, cylinder, material_type, table version, ...)
+_envelope_cache = OrderedDict()
+# Guards _envelope_cache; envelopes are computed outside it
+_envelope_cache_lock = Lock()
+
+def clear_envelope_cache():
+    """Drop every cached envelope."""
+    with _envelope_cache_lock:
+        _envelope_cache.clear()
+
+def get_cache_key(data: tddbhd_input, widths, thicknesses, yields):
+    """
+    Build the cache key for an envelope. The leading fields identify the machine
+    and material; the remaining inputs and the grid axes follow so two requests
+    only share an entry when their results are identical.
+    """
+    other_inputs = data.dict(exclude={
+        "reel_model", "hold_down_assy", "cylinder", "material_type", "width", "thickness", "yield_strength"
+    })
+    return (
+        data.reel_model, data.hold_down_assy, data.cylinder, data.material_type, LOOKUP_TABLE_VERSION,
+        tuple(sorted(other_inputs.items())),
+        widths.tobytes(), thicknesses.tobytes(), yields.tobytes(),
+    )
+
+# --- Boundary ---
+def get_axis_max(feasible, values, axis):
+    """Largest value along axis that is feasible, or NaN where none is."""
+    flipped = np.flip(feasible, axis=axis)
+    last_index = feasible.shape[axis] - 1 - np.argmax(flipped, axis=axis)
+    return np.where(feasible.any(axis=axis), values[last_index], np.nan)
+
+def get_boundary(feasible, widths, thicknesses):
+    """
+    Boundary curves of the feasible region for each yield strength: the thickest
+    passing coil at each width and the widest passing coil at each thickness.
+    """
+    return {
+        "max_thickness": get_axis_max(feasible, thicknesses, axis=1),
+        "max_width": get_axis_max(feasible, widths, axis=0),
+    }
+
+# --- Main Calculation ---
+def calculate_tddbhd_envelope(data: tddbhd_input, widths=None, thicknesses=None, yields=None):
+    """
+    Compute the TDDBHD feasibility envelope for the configuration in data.
+
+    The coil OD/ID, brake, drive and air pressure come from data; width, thickness
+    and yield strength are swept over the grid axes. Returns a dict with the axes,
+    a boolean feasible array of shape (widths, thicknesses, yields) using the
+    finder's pass criterion, and the boundary curves ("max_thickness" is shaped
+    (widths, yields), "max_width" is shaped (thicknesses, yields)). Results are
+    cached; each call gets its own dict of the shared read-only arrays.
+    """
+    widths = np.array(ENVELOPE_WIDTHS if widths is None else widths, dtype=float)
+    thicknesses = np.array(ENVELOPE_THICKNESSES if thicknesses is None else thicknesses, dtype=float)
+    yields = np.array(ENVELOPE_YIELDS if yields is None else yields, dtype=float)
+
+    key = get_cache_key(data, widths, thicknesses, yields)
+    with _envelope_cache_lock:
+        envelope = _envelope_cache.get(key)
+        if envelope is not None:
+            _envelope_cache.move_to_end(key)
+            return dict(envelope)
+
+    width_grid, thickness_grid, yield_grid = np.meshgrid(widths, thicknesses, yields, indexing="ij")
+    result = calculate_tbdbhd_vectorized(
+        data, width=width_grid, thickness=thickness_grid, yield_strength=yield_grid
+    )
+    if isinstance(result, str):
+        return result
+
+    feasible = result["all_checks"] & result["valid"]
+    boundary = get_boundary(feasible, widths, thicknesses)
+
+    for array in (widths, thicknesses, yields, feasible, *boundary.values()):
+        array.flags.writeable = False
+
+    envelope = {
+        "reel_model": data.reel_model,
+        "hold_down_assy": data.hold_down_assy,
+        "cylinder": data.cylinder,
+        "material_type": data.material_type,
+        "table_version": LOOKUP_TABLE_VERSION,
+        "reel_type": result["reel_type"],
+        "widths": widths,
+        "thicknesses": thicknesses,
+        "yield_strengths": yields,
+        "feasible": feasible,
+        "max_thickness": boundary["max_thickness"],
+        "max_width": boundary["max_width"],
+    }
+    with _envelope_cache_lock:
+        _envelope_cache[key] = envelope
+        _envelope_cache.move_to_end(key)
+        if len(_envelope_cache) > ENVELOPE_CACHE_SIZE:
+            _envelope_cache.popitem(last=False)
+    return dict(envelope)
@@ -1,4 +1,9 @@
-from sqlalchemy import create_engine, Column, String, JSON, DateTime
+from sqlalchemy import (
+    create_engine, Column, String, JSON, DateTime, Index, cast, delete, func, inspect, insert, select, text, update
+)
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import declarative_base, sessionmaker
 import uuid
 from datetime import datetime
@@ -8,6 +13,17 @@ from typing import Optional, Type, TypeVar, Dict, Any
 
 Base = declarative_base()
 
+# Connection pool settings; the pool is shared by every operation on a repository
+POOL_SIZE = 10
+MAX_OVERFLOW = 20
+POOL_TIMEOUT = 30
+POOL_RECYCLE = 1800
+
+# Sheets written per transaction by upsert_many
+UPSERT_BATCH_SIZE = 1000
+
+REFERENCE_NUMBER_INDEX = 'ix_performance_sheets_referenceNumber'
+
 class PerformanceSheet(Base):
     __tablename__ = 'performance_sheets'
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
@@ -16,60 +32,239 @@ class PerformanceSheet(Base):
     createdAt = Column(DateTime, default=datetime.now)
     updatedAt = Column(DateTime, default=datetime.now, onupdate=datetime.now)
 
+    # Reference numbers are the repository's key: unique and indexed for lookups
+    __table_args__ = (Index(REFERENCE_NUMBER_INDEX, 'referenceNumber', unique=True),)
+
 T = TypeVar('T', bound=BaseModel)
 
+def create_db_engine(url, pool_size=POOL_SIZE, max_overflow=MAX_OVERFLOW, pool_timeout=POOL_TIMEOUT,
+                     pool_recycle=POOL_RECYCLE):
+    """
+    Engine with a bounded connection pool. pool_pre_ping replaces connections
+    the server has dropped instead of failing the next operation on them.
+    """
+    url = make_url(url)
+    options = {"pool_pre_ping": True}
+    if url.get_backend_name() == "sqlite":
+        # The local stand-in database: share the file across threads
+        options["connect_args"] = {"check_same_thread": False}
+        if url.database in (None, "", ":memory:"):
+            return create_engine(url, **options)
+    options.update(pool_size=pool_size, max_overflow=max_overflow, pool_timeout=pool_timeout, pool_recycle=pool_recycle)
+    return create_engine(url, **options)
+
+def has_unique_reference_number(engine) -> bool:
+    """True if the performance_sheets table has a unique index or constraint on referenceNumber alone."""
+    inspector = inspect(engine)
+    table = PerformanceSheet.__tablename__
+    indexes = [index for index in inspector.get_indexes(table) if index["unique"]]
+    indexes += inspector.get_unique_constraints(table)
+    return any(index["column_names"] == ["referenceNumber"] for index in indexes)
+
+def migrate_reference_number_index(engine, concurrently: bool = True) -> bool:
+    """
+    Add the unique referenceNumber index to a performance_sheets table created
+    before it existed. Returns False if the table already has one. Raises
+    ValueError listing duplicate reference numbers, which must be merged or
+    removed first. On postgres the index is built CONCURRENTLY by default so
+    reads and writes continue; if that build fails it leaves an invalid index
+    that must be dropped before running this again. Also raises ValueError if
+    an index with the same name exists that is not the unique referenceNumber
+    index, since IF NOT EXISTS leaves it in place.
+    """
+    if has_unique_reference_number(engine):
+        return False
+
+    column = PerformanceSheet.__table__.c.referenceNumber
+    with engine.connect() as connection:
+        duplicates = connection.execute(
+            select(column).group_by(column).having(func.count() > 1).limit(10)
+        ).scalars().all()
+    if duplicates:
+        raise ValueError(f"Duplicate reference numbers must be resolved first: {', '.join(map(str, duplicates))}")
+
+    postgres = engine.dialect.name == "postgresql"
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        connection.execute(text(
+            f'CREATE UNIQUE INDEX {"CONCURRENTLY " if postgres and concurrently else ""}IF NOT EXISTS '
+            f'"{REFERENCE_NUMBER_INDEX}" ON {PerformanceSheet.__tablename__} ("referenceNumber")'
+        ))
+    if not has_unique_reference_number(engine):
+        raise ValueError(
+            f'Index "{REFERENCE_NUMBER_INDEX}" exists but is not unique on referenceNumber; drop it and migrate again.'
+        )
+    return True
+
 class PerformanceSheetRepository:
     """
     Repository for CRUD operations on PerformanceSheet using reference number as the main key.
     Accepts and returns Pydantic models or dicts.
     """
-    def __init__(self, host, database, user, password):
-        engine = create_engine(f'postgresql://{user}:{password}@{host}/{database}')
-        Base.metadata.create_all(engine)
-        Session = sessionmaker(bind=engine)
-        self.session = Session()
+    def __init__(self, host=None, database=None, user=None, password=None, url=None, pool_size=POOL_SIZE,
+                 max_overflow=MAX_OVERFLOW, pool_timeout=POOL_TIMEOUT, pool_recycle=POOL_RECYCLE):
+        """
+        Connect to postgresql at host, or to url when given. Each operation runs
+        in its own short-lived session on a pooled connection, so one repository
+        can be shared across threads. The schema is not created here; call
+        create_schema() once at startup.
+        """
+        if url is None:
+            url = f'postgresql://{user}:{password}@{host}/{database}'
+        self.engine = create_db_engine(url, pool_size, max_overflow, pool_timeout, pool_recycle)
+        # Records are returned after commit, so keep their loaded attributes
+        self.Session = sessionmaker(bind=self.engine, expire_on_commit=False)
+        self._unique_index = None
+        self._on_conflict = None
+
+    def create_schema(self):
+        """
+        Create the performance_sheets table if it does not exist. An existing
+        table is left as is; see migrate().
+        """
+        Base.metadata.create_all(self.engine)
+
+    def migrate(self, concurrently: bool = True) -> bool:
+        """Add the unique referenceNumber index to an existing table (migrate_reference_number_index)."""
+        migrated = migrate_reference_number_index(self.engine, concurrently)
+        self._unique_index = None
+        self._on_conflict = None
+        return migrated
+
+    def dispose(self):
+        """Close every pooled connection."""
+        self.engine.dispose()
 
     def create(self, reference_number: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Create a new record. Raises ValueError if reference_number already exists.
         Returns the created record as a dict.
         """
-        existing = self.get(reference_number)
-        if existing:
-            raise ValueError(f"Reference number {reference_number} already exists.")
+        # A single INSERT; the unique index rejects an existing reference number. Tables
+        # created before the index (see migrate()) still need the lookup first.
         record = PerformanceSheet(referenceNumber=reference_number, data=data)
-        self.session.add(record)
-        self.session.commit()
+        try:
+            with self.Session.begin() as session:
+                if not self._has_unique_index() and session.query(PerformanceSheet.id).filter_by(
+                    referenceNumber=reference_number
+                ).first():
+                    raise ValueError(f"Reference number {reference_number} already exists.")
+                session.add(record)
+        except IntegrityError:
+            raise ValueError(f"Reference number {reference_number} already exists.") from None
         return self._to_dict(record)
 
     def upsert(self, reference_number: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Create or update a record by reference_number. Returns the upserted record as a dict.
         """
-        existing = self.session.query(PerformanceSheet).filter_by(referenceNumber=reference_number).first()
-        if existing:
-            updated = False
-            for k, v in data.items():
-                if k not in existing.data or existing.data[k] != v:
-                    existing.data[k] = v
-                    updated = True
-            if updated:
-                flag_modified(existing, "data")
-                self.session.commit()
-            return self._to_dict(existing)
-        else:
-            record = PerformanceSheet(referenceNumber=reference_number, data=data)
-            self.session.add(record)
-            self.session.commit()
-            return self._to_dict(record)
+        try:
+            return self._upsert(reference_number, data)
+        except IntegrityError:
+            # A concurrent upsert inserted the reference number after the lookup; update that record
+            return self._upsert(reference_number, data)
+
+    def _upsert(self, reference_number: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Look up the record, then update it or insert a new one (one attempt of upsert)."""
+        with self.Session.begin() as session:
+            existing = session.query(PerformanceSheet).filter_by(referenceNumber=reference_number).first()
+            if existing:
+                updated = False
+                for k, v in data.items():
+                    if k not in existing.data or existing.data[k] != v:
+                        existing.data[k] = v
+                        updated = True
+                if updated:
+                    flag_modified(existing, "data")
+                record = existing
+            else:
+                record = PerformanceSheet(referenceNumber=reference_number, data=data)
+                session.add(record)
+        return self._to_dict(record)
+
+    def upsert_many(self, records, batch_size: int = UPSERT_BATCH_SIZE) -> int:
+        """
+        Create or update many records, merging data into existing records as upsert does.
+        records is a dict of reference_number to data, or (reference_number, data) pairs;
+        repeated reference numbers are merged in order. Each batch of batch_size sheets is
+        written in one transaction. Returns the number of sheets written.
+        """
+        merged = {}
+        for reference_number, data in (records.items() if isinstance(records, dict) else records):
+            merged[reference_number] = {**merged.get(reference_number, {}), **data}
+        items = list(merged.items())
+
+        upsert_batch = self._upsert_batch_on_conflict if self._supports_on_conflict() else self._upsert_batch_merge
+        for start in range(0, len(items), batch_size):
+            with self.Session.begin() as session:
+                upsert_batch(session, items[start:start + batch_size])
+        return len(items)
+
+    def _has_unique_index(self) -> bool:
+        """has_unique_reference_number for the repository's table, checked once until migrate()."""
+        if self._unique_index is None:
+            self._unique_index = has_unique_reference_number(self.engine)
+        return self._unique_index
+
+    def _supports_on_conflict(self) -> bool:
+        """
+        ON CONFLICT (referenceNumber) needs a unique index on referenceNumber, and the JSON
+        merge is done with postgres jsonb ||. Other tables and databases use the merge fallback.
+        """
+        if self._on_conflict is None:
+            self._on_conflict = self.engine.dialect.name == "postgresql" and self._has_unique_index()
+        return self._on_conflict
+
+    def _upsert_batch_on_conflict(self, session, batch):
+        """
+        One INSERT ... ON CONFLICT (referenceNumber) DO UPDATE for the batch; postgres merges
+        the data. Rows the merge leaves unchanged are not rewritten and keep their updatedAt.
+        """
+        table = PerformanceSheet.__table__
+        now = datetime.now()
+        statement = postgresql.insert(table).values([
+            {"id": str(uuid.uuid4()), "referenceNumber": reference_number, "data": data, "createdAt": now, "updatedAt": now}
+            for reference_number, data in batch
+        ])
+        existing_data = cast(table.c.data, postgresql.JSONB)
+        merged_data = existing_data.op("||")(cast(statement.excluded.data, postgresql.JSONB))
+        session.execute(statement.on_conflict_do_update(
+            index_elements=[table.c.referenceNumber],
+            set_={"data": cast(merged_data, JSON), "updatedAt": statement.excluded.updatedAt},
+            where=existing_data.is_distinct_from(merged_data),
+        ))
+
+    def _upsert_batch_merge(self, session, batch):
+        """
+        Fallback for SQLite and tables without the unique index: one SELECT for the batch,
+        the merge in Python, then one bulk INSERT and one bulk UPDATE.
+        """
+        existing = {
+            record.referenceNumber: record
+            for record in session.query(PerformanceSheet.id, PerformanceSheet.referenceNumber, PerformanceSheet.data)
+            .filter(PerformanceSheet.referenceNumber.in_([reference_number for reference_number, _ in batch]))
+        }
+        now = datetime.now()
+        inserts, updates = [], []
+        for reference_number, data in batch:
+            record = existing.get(reference_number)
+            if record is None:
+                inserts.append({"referenceNumber": reference_number, "data": data})
+            elif any(k not in record.data or record.data[k] != v for k, v in data.items()):
+                updates.append({"id": record.id, "data": {**record.data, **data}, "updatedAt": now})
+        if inserts:
+            session.execute(insert(PerformanceSheet), inserts)
+        if updates:
+            session.execute(update(PerformanceSheet), updates)
 
     def get(self, reference_number: str) -> Optional[Dict[str, Any]]:
         """
         Get a record by reference_number. Returns dict or None.
         """
-        record = self.session.query(PerformanceSheet).filter_by(referenceNumber=reference_number).first()
-        if record:
-            return self._to_dict(record)
+        with self.Session() as session:
+            record = session.query(PerformanceSheet).filter_by(referenceNumber=reference_number).first()
+            if record:
+                return self._to_dict(record)
         return None
 
     def update(self, reference_number: str, data_updates: Dict[str, Any]) -> Dict[str, Any]:
@@ -77,29 +272,26 @@ class PerformanceSheetRepository:
         Update fields for a record by reference_number. Raises ValueError if not found.
         Returns the updated record as a dict.
         """
-        record = self.session.query(PerformanceSheet).filter_by(referenceNumber=reference_number).first()
-        if not record:
-            raise ValueError(f"Reference number {reference_number} not found.")
-        updated = False
-        for k, v in data_updates.items():
-            if k not in record.data or record.data[k] != v:
-                record.data[k] = v
-                updated = True
-        if updated:
-            flag_modified(record, "data")
-            self.session.commit()
+        with self.Session.begin() as session:
+            record = session.query(PerformanceSheet).filter_by(referenceNumber=reference_number).first()
+            if not record:
+                raise ValueError(f"Reference number {reference_number} not found.")
+            updated = False
+            for k, v in data_updates.items():
+                if k not in record.data or record.data[k] != v:
+                    record.data[k] = v
+                    updated = True
+            if updated:
+                flag_modified(record, "data")
         return self._to_dict(record)
 
     def delete(self, reference_number: str) -> bool:
         """
         Delete a record by reference_number. Returns True if deleted, False if not found.
         """
-        record = self.session.query(PerformanceSheet).filter_by(referenceNumber=reference_number).first()
-        if record:
-            self.session.delete(record)
-            self.session.commit()
-            return True
-        return False
+        with self.Session.begin() as session:
+            result = session.execute(delete(PerformanceSheet).where(PerformanceSheet.referenceNumber == reference_number))
+        return result.rowcount > 0
 
     def _to_dict(self, record: PerformanceSheet) -> Dict[str, Any]:
         return {
@@ -125,6 +317,7 @@ def get_default_repository():
             user="cpec",
             password="password"
         )
+        _repo_instance.create_schema()
     return _repo_instance
 
 # For backward compatibility
@@ -1,24 +1,248 @@
+"""
+Straightener Utility Input Finder
+
+Searches the straightener option space (model, width, horsepower and feed rate)
+for the smallest configuration that passes every straightener utility check.
+"""
+
+from math import pi
+
 from models import str_utility_input
-from calculations.str_utility import calculate_str_utility
-from shared import (
-    STATIC_FRICTION, PAYOFF_OPTIONS, STR_MODEL_OPTIONS, STR_WIDTH_OPTIONS,
-    STR_HORSEPOWER_OPTIONS, STR_FEED_RATE_OPTIONS, YES_NO_OPTIONS
+from calculations.str_utility import (
+    calculate_str_utility,
+    str_utility_output,
+    get_horsepower_string, get_str_model_lookups,
+    calc_k_cons, calc_ult_tensile_strength, calc_required_force, calc_coil_od, calc_roll_inertia, calc_ratio,
+    calc_refl_inertia, calc_mat_length_inertia, calc_od_inertia, calc_od_ratio, calc_total_inertia,
+    calc_str_torque, calc_coil_brake_torque, calc_brake_torque, calc_accel_torque, calc_pk_torque,
+    calc_gear_values, calc_rated_torque, calc_req_torque, calc_str_roll_req_torque,
+    check_value, check_fpm
+)
+from utils.lookup_tables import get_material_density, get_material_modulus, get_motor_inertia
+from utils.shared import (
+    MOTOR_RPM, EFFICIENCY, PINCH_ROLL_QTY, MAT_LENGTH, FEED_RATE_BUFFER, LEWIS_FACTORS,
+    STR_MODEL_OPTIONS, STR_WIDTH_OPTIONS, STR_HORSEPOWER_OPTIONS, STR_FEED_RATE_OPTIONS
 )
 
 def passes_checks(candidate):
     result = calculate_str_utility(str_utility_input(**candidate))
-    if isinstance(result, dict):
+    if isinstance(result, str_utility_output):
         checks = [
-            result.get("required_force_check"),
-            result.get("horsepower_check"),
-            result.get("fpm_check"),
-            result.get("pinch_roll_check"),
-            result.get("str_roll_check"),
-            result.get("feed_rate_check"),
-            result.get("str_utility_check"),
+            result.required_force_check,
+            result.horsepower_check,
+            result.pinch_roll_check,
+            result.str_roll_check,
+            result.feed_rate_check,
         ]
-        return all(c == "PASS" or c == "OK" for c in checks)
+        return all(c == "PASS" or c == "OK" for c in checks) and result.fpm_check == "FPM SUFFICIENT"
     return False
 
+# --- Search order ---
+def parse_option(option):
+    """Numeric value of an option label such as '24"', "20 HP" or "80 FPM"."""
+    return float(option.split()[0].rstrip('"'))
+
+def get_width_options(coil_width):
+    """Straightener widths, smallest first, that are at least as wide as the coil."""
+    return [width for width in map(parse_option, STR_WIDTH_OPTIONS) if width >= coil_width]
+
+def make_candidate(user_entries, str_model, str_width, horsepower, feed_rate):
+    candidate = dict(user_entries)
+    candidate.update({
+        "str_model": str_model,
+        "str_width": str_width,
+        "horsepower": horsepower,
+        "feed_rate": feed_rate,
+    })
+    return candidate
+
+# --- Exhaustive search ---
+def get_str_utility_inputs_exhaustive(user_entries):
+    """
+    Reference search: evaluates every candidate with the full straightener
+    utility calculation and returns the first one that passes all checks.
+    """
+    for str_model in STR_MODEL_OPTIONS:
+        for str_width in get_width_options(user_entries["coil_width"]):
+            for horsepower in map(parse_option, STR_HORSEPOWER_OPTIONS):
+                for feed_rate in map(parse_option, STR_FEED_RATE_OPTIONS):
+                    candidate = make_candidate(user_entries, str_model, str_width, horsepower, feed_rate)
+                    if passes_checks(candidate):
+                        return str_utility_input(**candidate)
+    return None
+
+# --- Pruned search ---
+def get_user_terms(data: str_utility_input):
+    """
+    Evaluate the lookups and calculations that only depend on the user entries.
+    Returns None if any of them fail or no candidate can pass the feed rate
+    check (backbend yield not met or an invalid brake compensation option).
+    """
+    if data.yield_met != "OK" or data.auto_brake_compensation.lower() not in ("yes", "no"):
+        return None
+    try:
+        density = get_material_density(data.material_type)
+        get_material_modulus(data.material_type)
+    except ValueError:
+        return None
+
+    motor_inertias = {}
+    for horsepower in map(parse_option, STR_HORSEPOWER_OPTIONS):
+        try:
+            motor_inertias[horsepower] = get_motor_inertia(get_horsepower_string(horsepower))
+        except ValueError:
+            continue
+
+    coil_od = calc_coil_od(data.coil_id, data.max_coil_weight, density, data.coil_width, data.coil_od)
+    _, max_od_inertia = calc_od_inertia(coil_od, data.coil_width, density)
+    _, min_od_inertia = calc_od_inertia(data.coil_id, data.coil_width, density)
+
+    return {
+        "density": density,
+        "motor_inertias": motor_inertias,
+        "k_cons": calc_k_cons(data.num_str_rolls),
+        "coil_od": coil_od,
+        "max_od_inertia": max_od_inertia,
+        "min_od_inertia": min_od_inertia,
+        "use_max_od": data.auto_brake_compensation.lower() == "yes",
+    }
+
+def get_model_terms(data: str_utility_input, terms, str_model):
+    """
+    Resolve the model lookups once per model. Returns None if a lookup fails or
+    the required force check fails, since neither depends on width, horsepower
+    or feed rate.
+    """
+    try:
+        model = get_str_model_lookups(str_model)
+        lewis_factor_pinch = LEWIS_FACTORS[model["pinch_roll_teeth"]]
+        lewis_factor_str = LEWIS_FACTORS[model["str_roll_teeth"]]
+    except (ValueError, KeyError):
+        return None
+    required_force = calc_required_force(data.yield_strength, data.coil_width, data.material_thickness, model["center_dist"])
+    if check_value(model["jack_force_available"], required_force) != "OK":
+        return None
+
+    _, mat_length_inertia = calc_mat_length_inertia(
+        data.material_thickness, data.coil_width, terms["density"], MAT_LENGTH, model["pinch_roll_dia"]
+    )
+    model.update({
+        "lewis_factor_pinch": lewis_factor_pinch,
+        "lewis_factor_str": lewis_factor_str,
+        "safe_working_stress": calc_ult_tensile_strength(str_model) / 3,
+        "mat_length_inertia": mat_length_inertia,
+    })
+    return model
+
+def get_feed_terms(data: str_utility_input, terms, model, str_width, feed_rate):
+    """
+    Evaluate everything that depends on width and feed rate but not on
+    horsepower. Returns None when the pinch roll or straightener roll gear
+    check fails, since neither depends on horsepower.
+    """
+    accel_time = (feed_rate / 60) / data.acceleration
+    _, pinch_roll_inertia = calc_roll_inertia(model["pinch_roll_dia"], str_width + 2, PINCH_ROLL_QTY)
+    pinch_ratio = calc_ratio(MOTOR_RPM, feed_rate, model["pinch_roll_dia"])
+    pinch_roll_refl_inertia = calc_refl_inertia(pinch_roll_inertia, pinch_ratio)
+    _, str_roll_inertia = calc_roll_inertia(model["str_roll_dia"], str_width + 2, data.num_str_rolls)
+    str_ratio = calc_ratio(MOTOR_RPM, feed_rate, model["str_roll_dia"])
+    str_roll_refl_inertia = calc_refl_inertia(str_roll_inertia, str_ratio)
+    mat_length_refl_inertia = calc_refl_inertia(model["mat_length_inertia"], pinch_ratio)
+
+    coil_od = terms["coil_od"]
+    max_od_refl_inertia = calc_refl_inertia(terms["max_od_inertia"], calc_od_ratio(coil_od, model["pinch_roll_dia"], pinch_ratio))
+    min_od_refl_inertia = calc_refl_inertia(terms["min_od_inertia"], calc_od_ratio(data.coil_id, model["pinch_roll_dia"], pinch_ratio))
+    max_od_total_inertia = calc_total_inertia(pinch_roll_refl_inertia, str_roll_refl_inertia, mat_length_refl_inertia, max_od_refl_inertia)
+    min_od_total_inertia = calc_total_inertia(pinch_roll_refl_inertia, str_roll_refl_inertia, mat_length_refl_inertia, min_od_refl_inertia)
+
+    str_torque = calc_str_torque(
+        data.yield_strength, data.coil_width, data.material_thickness, model["center_dist"], feed_rate,
+        terms["k_cons"], MOTOR_RPM, EFFICIENCY
+    )
+    coil_brake_torque = calc_coil_brake_torque(coil_od, data.coil_width, terms["density"], feed_rate, accel_time)
+    max_od_brake_torque = calc_brake_torque(coil_brake_torque, coil_od, model["pinch_roll_dia"], pinch_ratio, EFFICIENCY)
+    min_od_brake_torque = calc_brake_torque(coil_brake_torque, data.coil_id, model["pinch_roll_dia"], pinch_ratio, EFFICIENCY)
+
+    rpm_at_roller_pinch = (feed_rate * 12) / (pi * model["pinch_roll_dia"])
+    _, _, _, horsepower_rated_pinch = calc_gear_values(
+        model["pinch_roll_teeth"], model["pinch_roll_dp"], model["face_width"],
+        model["safe_working_stress"], model["lewis_factor_pinch"], rpm_at_roller_pinch, model["pinch_roll_dia"]
+    )
+    pinch_roll_req_torque = calc_req_torque(
+        str_torque, pinch_ratio, model["str_gear_torque"], min_od_brake_torque, max_od_total_inertia,
+        MOTOR_RPM, accel_time, EFFICIENCY
+    )
+    if check_value(calc_rated_torque(horsepower_rated_pinch, rpm_at_roller_pinch), pinch_roll_req_torque) != "OK":
+        return None
+
+    rpm_at_roller_str = (feed_rate * 12) / (pi * model["str_roll_dia"])
+    _, _, _, horsepower_rated_str = calc_gear_values(
+        model["str_roll_teeth"], model["str_roll_dp"], model["face_width"],
+        model["safe_working_stress"], model["lewis_factor_str"], rpm_at_roller_str, model["str_roll_dia"]
+    )
+    str_roll_req_torque = calc_str_roll_req_torque(
+        str_torque, str_ratio, model["str_gear_torque"], max_od_total_inertia, MOTOR_RPM, accel_time, EFFICIENCY
+    )
+    if check_value(calc_rated_torque(horsepower_rated_str, rpm_at_roller_str), str_roll_req_torque) != "OK":
+        return None
+
+    use_max_od = terms["use_max_od"]
+    return {
+        "accel_time": accel_time,
+        "str_torque": str_torque,
+        "total_inertia": max_od_total_inertia if use_max_od else min_od_total_inertia,
+        "brake_torque": max_od_brake_torque if use_max_od else min_od_brake_torque,
+    }
+
+def horsepower_passes(feed, horsepower, motor_inertia):
+    """Evaluate the horsepower check, the only check that depends on horsepower."""
+    accel_torque = calc_accel_torque(feed["total_inertia"], MOTOR_RPM, feed["accel_time"], EFFICIENCY, motor_inertia)
+    pk_torque = calc_pk_torque(feed["str_torque"], accel_torque, feed["brake_torque"])
+    horsepower_required = (pk_torque * MOTOR_RPM) / 63000
+    return check_value(horsepower, horsepower_required) == "OK"
+
+def get_str_utility_inputs(user_entries):
+    """
+    Pruned search returning the same configuration as get_str_utility_inputs_exhaustive.
+
+    Lookups are resolved once per level, models are skipped when the required
+    force exceeds the jack force, feed rates are filtered on the FPM check, and
+    the gear checks are evaluated once per width and feed rate rather than once
+    per horsepower.
+    """
+    data = str_utility_input(**make_candidate(
+        user_entries, STR_MODEL_OPTIONS[0], parse_option(STR_WIDTH_OPTIONS[0]),
+        parse_option(STR_HORSEPOWER_OPTIONS[0]), parse_option(STR_FEED_RATE_OPTIONS[0])
+    ))
+    terms = get_user_terms(data)
+    if terms is None:
+        return None
+
+    feed_rates = [
+        feed_rate for feed_rate in map(parse_option, STR_FEED_RATE_OPTIONS)
+        if check_fpm(feed_rate, data.max_feed_rate, FEED_RATE_BUFFER) == "FPM SUFFICIENT"
+    ]
+    if not feed_rates:
+        return None
+    horsepowers = [horsepower for horsepower in map(parse_option, STR_HORSEPOWER_OPTIONS) if horsepower in terms["motor_inertias"]]
+
+    for str_model in STR_MODEL_OPTIONS:
+        model = get_model_terms(data, terms, str_model)
+        if model is None:
+            continue
+        for str_width in get_width_options(data.coil_width):
+            feeds = [(feed_rate, get_feed_terms(data, terms, model, str_width, feed_rate)) for feed_rate in feed_rates]
+            feeds = [(feed_rate, feed) for feed_rate, feed in feeds if feed is not None]
+            for horsepower in horsepowers:
+                for feed_rate, feed in feeds:
+                    if horsepower_passes(feed, horsepower, terms["motor_inertias"][horsepower]):
+                        return str_utility_input(**make_candidate(user_entries, str_model, str_width, horsepower, feed_rate))
+    return None
+
 def get_min_str_utility_inputs(user_entries):
-    pass
\ No newline at end of file
+    """
+    Smallest passing straightener (model, then width, horsepower and feed rate)
+    for the user entries. max_feed_rate is the line speed the straightener must
+    cover; only widths at least as wide as the coil are considered.
+    """
+    return get_str_utility_inputs(user_entries)
@@ -1,9 +1,35 @@
+"""
+TDDBHD Input Finder
+
+Searches the reel option space (reel, backplate, holddown, cylinder, brake model,
+brake quantity, threading drive and air pressure) for the first configuration
+that passes every TDDBHD check.
+"""
+
+from concurrent.futures import ProcessPoolExecutor, as_completed, wait
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import Array
+from queue import Queue
+from threading import Lock
+
 from models import tddbhd_input
-from calculations.tddbhd import calculate_tbdbhd
-from shared import (
+from calculations.tddbhd import (
+    calculate_tbdbhd,
+    tddbhd_output,
+    lookup_density, lookup_max_weight, lookup_modulus, lookup_cylinder_bore, lookup_holddown_matrix_key,
+    lookup_holddown_pressure, lookup_hold_down_force, lookup_min_material_width, lookup_reel_type,
+    lookup_drive_key, lookup_drive_torque,
+    calc_M, calc_My, calc_y, calc_web_tension_psi, calc_web_tension_lbs, calc_coil_weight, calc_coil_od,
+    calc_disp_reel_mtr, calc_torque_at_mandrel, calc_rewind_torque, calc_hold_down_denominator,
+    calc_hold_down_force_req, calc_torque_required, calc_brake_press_required, calc_failsafe_holding_force,
+    check_min_material_width, check_air_pressure, check_rewind_torque, check_hold_down_force,
+    check_brake_press, check_torque_required, check_tddbhd
+)
+from utils.shared import (
     REEL_MODEL_OPTIONS, REEL_WIDTH_OPTIONS, BACKPLATE_DIAMETER_OPTIONS,
     BRAKE_QUANTITY_OPTIONS, BRAKE_MODEL_OPTIONS, HYDRAULIC_THREADING_DRIVE_OPTIONS,
-    HOLD_DOWN_CYLINDER_OPTIONS, HOLD_DOWN_ASSY_OPTIONS
+    HOLD_DOWN_CYLINDER_OPTIONS, HOLD_DOWN_ASSY_OPTIONS,
+    NUM_BRAKEPADS, BRAKE_DISTANCE, CYLINDER_ROD, STATIC_FRICTION
 )
 
 # Define all options
@@ -12,69 +38,393 @@ air_pressures = range(1, 121)
 # Helper to check candidate
 def passes_checks(candidate):
     result = calculate_tbdbhd(tddbhd_input(**candidate))
-    if isinstance(result, dict):
+    if isinstance(result, tddbhd_output):
         checks = [
-            result.get("min_material_width_check"),
-            result.get("air_pressure_check"),
-            result.get("rewind_torque_check"),
-            result.get("hold_down_force_check"),
-            result.get("brake_press_check"),
-            result.get("torque_required_check"),
-            result.get("tddbhd_check"),
+            result.min_material_width_check,
+            result.air_pressure_check,
+            result.rewind_torque_check,
+            result.hold_down_force_check,
+            result.brake_press_check,
+            result.torque_required_check,
+            result.tddbhd_check,
         ]
         return all(c == "PASS" or c == "OK" or c == "USE MOTORIZED" for c in checks)
     return False
 
-def get_min_tddbhd_inputs(user_entries):
-    # Efficient single-level search for minimum valid combination
-    for reel_model, reel_width in zip(REEL_MODEL_OPTIONS, REEL_WIDTH_OPTIONS):
-        for backplate_diameter in BACKPLATE_DIAMETER_OPTIONS:
-            for hold_down_assy in HOLD_DOWN_ASSY_OPTIONS:
-                for cylinder in HOLD_DOWN_CYLINDER_OPTIONS:
-                    for brake_model in BRAKE_MODEL_OPTIONS:
-                        for brake_qty in BRAKE_QUANTITY_OPTIONS:
-                            for hyd_threading_drive in HYDRAULIC_THREADING_DRIVE_OPTIONS:
-                                for air_pressure in air_pressures:
-                                    candidate = dict(user_entries)
-                                    candidate.update({
-                                        "reel_model": reel_model,
-                                        "reel_width": reel_width,
-                                        "backplate_diameter": backplate_diameter,
-                                        "air_pressure": air_pressure,
-                                        "brake_qty": brake_qty,
-                                        "brake_model": brake_model,
-                                        "hyd_threading_drive": hyd_threading_drive,
-                                        "cylinder": cylinder,
-                                        "hold_down_assy": hold_down_assy,
-                                    })
-                                    # Early exit: check candidate
-                                    if passes_checks(candidate):
-                                        return tddbhd_input(**candidate)
+# --- Search order ---
+def ordered(options, reverse=False):
+    """Return the options in search order (reversed for the maximum search)."""
+    return list(options[::-1]) if reverse else list(options)
+
+def get_reel_order(reverse=False):
+    """Return the (reel_model, reel_width) pairs in search order."""
+    return list(zip(ordered(REEL_MODEL_OPTIONS, reverse), ordered(REEL_WIDTH_OPTIONS, reverse)))
+
+def make_candidate(user_entries, reel_model, reel_width, backplate_diameter, hold_down_assy, cylinder,
+                   brake_model, brake_qty, hyd_threading_drive, air_pressure):
+    candidate = dict(user_entries)
+    candidate.update({
+        "reel_model": reel_model,
+        "reel_width": reel_width,
+        "backplate_diameter": backplate_diameter,
+        "air_pressure": air_pressure,
+        "brake_qty": brake_qty,
+        "brake_model": brake_model,
+        "hyd_threading_drive": hyd_threading_drive,
+        "cylinder": cylinder,
+        "hold_down_assy": hold_down_assy,
+    })
+    return candidate
+
+# --- Exhaustive search ---
+def search_reel_subtree_exhaustive(user_entries, reel_model, reel_width, reverse=False, should_stop=None):
+    """
+    Reference search of one reel model's subtree: evaluates every candidate with
+    the full TDDBHD calculation and returns the first passing candidate dict.
+    should_stop is polled between holddown assemblies to abandon the subtree.
+    """
+    for backplate_diameter in ordered(BACKPLATE_DIAMETER_OPTIONS, reverse):
+        for hold_down_assy in ordered(HOLD_DOWN_ASSY_OPTIONS, reverse):
+            if should_stop is not None and should_stop():
+                return None
+            for cylinder in ordered(HOLD_DOWN_CYLINDER_OPTIONS, reverse):
+                for brake_model in ordered(BRAKE_MODEL_OPTIONS, reverse):
+                    for brake_qty in ordered(BRAKE_QUANTITY_OPTIONS, reverse):
+                        for hyd_threading_drive in ordered(HYDRAULIC_THREADING_DRIVE_OPTIONS, reverse):
+                            for air_pressure in ordered(air_pressures, reverse):
+                                candidate = make_candidate(
+                                    user_entries, reel_model, reel_width, backplate_diameter, hold_down_assy,
+                                    cylinder, brake_model, brake_qty, hyd_threading_drive, air_pressure
+                                )
+                                # Early exit: check candidate
+                                if passes_checks(candidate):
+                                    return candidate
+    return None
+
+def get_tddbhd_inputs_exhaustive(user_entries, reverse=False):
+    """
+    Reference search: evaluates every candidate with the full TDDBHD calculation
+    and returns the first one that passes all checks.
+    """
+    for reel_model, reel_width in get_reel_order(reverse):
+        candidate = search_reel_subtree_exhaustive(user_entries, reel_model, reel_width, reverse)
+        if candidate is not None:
+            return tddbhd_input(**candidate)
+    return None
+
+# --- Parallel search ---
+# Searches that can share the pool at once; each one owns a slot in the stop ranks.
+SEARCH_SLOTS = 8
+
+_executor = None
+_executor_lock = Lock()
+_stop_ranks = Array("i", SEARCH_SLOTS, lock=False)
+_free_slots = Queue()
+for _slot in range(SEARCH_SLOTS):
+    _free_slots.put(_slot)
+
+# Stop ranks as seen from a pool worker.
+_worker_stop_ranks = None
+
+def init_search_worker(stop_ranks):
+    global _worker_stop_ranks
+    _worker_stop_ranks = stop_ranks
+
+def get_search_executor():
+    """Return the process pool shared by every exhaustive search, starting it on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(initializer=init_search_worker, initargs=(_stop_ranks,))
+        return _executor
+
+def reset_search_executor(executor):
+    """Drop a broken pool so the next search starts a new one."""
+    global _executor
+    with _executor_lock:
+        if _executor is executor:
+            _executor = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+def search_reel_task(user_entries, slot, rank, reel_model, reel_width, reverse):
+    """
+    Pool task searching one reel subtree. The task abandons its subtree once
+    a subtree ranked ahead of it has produced the outcome.
+    """
+    return search_reel_subtree_exhaustive(
+        user_entries, reel_model, reel_width, reverse,
+        should_stop=lambda: _worker_stop_ranks[slot] < rank
+    )
+
+def get_tddbhd_inputs_parallel(user_entries, reverse=False):
+    """
+    get_tddbhd_inputs_exhaustive with one pool task per reel model.
+
+    Outcomes are reduced in reel order, so the first match (or the first error)
+    is the same as the serial search. Once a subtree produces an outcome, later
+    ranked tasks are cancelled or told to stop.
+    """
+    reels = get_reel_order(reverse)
+    slot = _free_slots.get()
+    executor = get_search_executor()
+    futures = {}
+    try:
+        _stop_ranks[slot] = len(reels)
+        for rank, (reel_model, reel_width) in enumerate(reels):
+            future = executor.submit(search_reel_task, user_entries, slot, rank, reel_model, reel_width, reverse)
+            futures[future] = rank
+
+        done = {}
+        next_rank = 0
+        for future in as_completed(futures):
+            if future.cancelled():
+                continue
+            rank = futures[future]
+            done[rank] = future
+            if (future.exception() is not None or future.result() is not None) and rank < _stop_ranks[slot]:
+                _stop_ranks[slot] = rank
+                for other, other_rank in futures.items():
+                    if other_rank > rank:
+                        other.cancel()
+
+            # Resolve every outcome that is no longer waiting on an earlier reel.
+            while next_rank in done:
+                candidate = done[next_rank].result()
+                if candidate is not None:
+                    return tddbhd_input(**candidate)
+                next_rank += 1
+        return None
+    except BrokenProcessPool:
+        reset_search_executor(executor)
+        return get_tddbhd_inputs_exhaustive(user_entries, reverse)
+    finally:
+        # Stop the remaining tasks before the slot is handed to another search.
+        _stop_ranks[slot] = -1
+        for future in futures:
+            future.cancel()
+        wait(futures)
+        _free_slots.put(slot)
+
+# --- Pruned search ---
+def get_user_terms(data: tddbhd_input):
+    """
+    Evaluate the lookups and calculations that only depend on the user entries.
+    Returns None if any of them fail, in which case no candidate can pass.
+    """
+    try:
+        density = lookup_density(data.material_type)
+        modulus = lookup_modulus(data.material_type)
+        reel_type = lookup_reel_type(data.type_of_line)
+    except Exception:
+        return None
+
+    try:
+        M = calc_M(modulus, data.width, data.thickness, data.coil_id)
+        My = calc_My(data.width, data.thickness, data.yield_strength)
+        y = calc_y(data.thickness, data.coil_id, modulus, data.yield_strength)
+        web_tension_psi = calc_web_tension_psi(data.yield_strength)
+        web_tension_lbs = calc_web_tension_lbs(data.thickness, data.width, web_tension_psi)
+        hold_down_denominator = calc_hold_down_denominator(STATIC_FRICTION, data.coil_id)
+        hold_down_force_req = calc_hold_down_force_req(M, My, data.width, data.thickness, data.yield_strength, y, hold_down_denominator)
+    except Exception:
+        return None
+
+    return {
+        "density": density,
+        "reel_type": reel_type,
+        "air_clutch": "Yes" if data.air_clutch else "No",
+        "web_tension_lbs": web_tension_lbs,
+        "hold_down_force_req": hold_down_force_req,
+    }
+
+def get_reel_terms(data: tddbhd_input, terms, reel_model):
+    """
+    Evaluate the reel-dependent terms. Rewind torque and torque required only
+    depend on the reel (through the max coil weight), not on brake or holddown.
+    """
+    try:
+        max_weight = lookup_max_weight(reel_model)
+        coil_weight = calc_coil_weight(data.coil_od, data.coil_id, data.width, terms["density"], max_weight)
+        coil_od = calc_coil_od(coil_weight, terms["density"], data.width, data.coil_id, data.coil_od)
+        rewind_torque = calc_rewind_torque(terms["web_tension_lbs"], coil_od)
+        torque_required = calc_torque_required(data.decel, coil_weight, coil_od, data.coil_id, rewind_torque)
+    except Exception:
+        return None
+    return {"rewind_torque": rewind_torque, "torque_required": torque_required}
+
+def get_passing_drives(data: tddbhd_input, terms, reel, reel_model, reverse=False):
+    """Return the threading drives, in search order, that pass the rewind torque check."""
+    drives = []
+    for hyd_threading_drive in ordered(HYDRAULIC_THREADING_DRIVE_OPTIONS, reverse):
+        try:
+            drive_torque = lookup_drive_torque(lookup_drive_key(reel_model, terms["air_clutch"], hyd_threading_drive))
+            calc_disp_reel_mtr(hyd_threading_drive)
+            torque_at_mandrel = calc_torque_at_mandrel(terms["reel_type"], drive_torque, data.reel_drive_tqempty)
+        except Exception:
+            continue
+        if check_rewind_torque(reel["rewind_torque"], torque_at_mandrel) == "PASS":
+            drives.append(hyd_threading_drive)
+    return drives
+
+def get_brake_terms(data: tddbhd_input, reel, brake_model, brake_qty):
+    """
+    Evaluate the brake press required for a brake model and quantity.
+    Returns None if the calculation fails or the torque required check fails.
+    """
+    try:
+        cylinder_bore = lookup_cylinder_bore(brake_model)
+        brake_press_required = calc_brake_press_required(
+            reel["torque_required"], data.friction, BRAKE_DISTANCE, NUM_BRAKEPADS,
+            brake_model, cylinder_bore, CYLINDER_ROD, brake_qty
+        )
+        failsafe_holding_force = calc_failsafe_holding_force(
+            brake_model, data.friction, NUM_BRAKEPADS, BRAKE_DISTANCE, brake_qty
+        )
+    except Exception:
+        return None
+    if check_torque_required(reel["torque_required"], failsafe_holding_force) != "PASS":
+        return None
+    return brake_press_required
+
+def pressure_passes(data: tddbhd_input, terms, matrix_key, brake_press_required, air_pressure):
+    """Evaluate the air pressure dependent checks for one pressure."""
+    air_pressure = float(air_pressure)
+    holddown_pressure = lookup_holddown_pressure(matrix_key, air_pressure)
+    hold_down_force_available = lookup_hold_down_force(matrix_key, holddown_pressure)
+    hold_down_force_check = check_hold_down_force(terms["hold_down_force_req"], hold_down_force_available)
+    brake_press_check = check_brake_press(brake_press_required, air_pressure)
+    tddbhd_check = check_tddbhd(
+        terms["reel_type"], "PASS", data.confirmed_min_width, "PASS",
+        hold_down_force_check, brake_press_check, "PASS", hold_down_force_available
+    )
+    return (
+        check_air_pressure(air_pressure) == "PASS" and
+        hold_down_force_check == "PASS" and
+        brake_press_check == "PASS" and
+        tddbhd_check in ("OK", "USE MOTORIZED")
+    )
+
+def find_first_pressure(passes, pressures, reverse=False):
+    """
+    Return the first passing pressure in search order.
+
+    Every pressure dependent check only gets easier as the pressure rises
+    (holddown force available grows, brake press required is fixed), so the
+    passing pressures form an upper range. Ascending searches bisect for its
+    lower end; descending searches only need to test the highest pressure.
+    """
+    pressures = sorted(pressures)
+    if not pressures or not passes(pressures[-1]):
+        return None
+    if reverse:
+        return pressures[-1]
+    lo, hi = 0, len(pressures) - 1
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if passes(pressures[mid]):
+            hi = mid
+        else:
+            lo = mid + 1
+    return pressures[lo]
+
+def search_reel_subtree(user_entries, data: tddbhd_input, terms, reel_model, reel_width, reverse=False):
+    """
+    Search one reel model's subtree and return the first passing candidate
+    dict in search order, or None.
+    """
+    reel = get_reel_terms(data, terms, reel_model)
+    if reel is None:
+        return None
+
+    drives = get_passing_drives(data, terms, reel, reel_model, reverse)
+    if not drives:
+        return None
+
+    max_pressure = max(air_pressures)
+    brakes = []
+    for brake_model in ordered(BRAKE_MODEL_OPTIONS, reverse):
+        for brake_qty in ordered(BRAKE_QUANTITY_OPTIONS, reverse):
+            brake_press_required = get_brake_terms(data, reel, brake_model, int(brake_qty))
+            if brake_press_required is None:
+                continue
+            if check_brake_press(brake_press_required, max_pressure) != "PASS":
+                continue
+            brakes.append((brake_model, brake_qty, brake_press_required))
+    if not brakes:
+        return None
+
+    for hold_down_assy in ordered(HOLD_DOWN_ASSY_OPTIONS, reverse):
+        for cylinder in ordered(HOLD_DOWN_CYLINDER_OPTIONS, reverse):
+            try:
+                matrix_key = lookup_holddown_matrix_key(reel_model, hold_down_assy, cylinder)
+                min_material_width = lookup_min_material_width(matrix_key)
+            except Exception:
+                continue
+            if check_min_material_width(min_material_width, data.width) != "PASS":
+                continue
+            hold_down_force_max = lookup_hold_down_force(matrix_key, lookup_holddown_pressure(matrix_key, float(max_pressure)))
+            if check_hold_down_force(terms["hold_down_force_req"], hold_down_force_max) != "PASS":
+                continue
+
+            for brake_model, brake_qty, brake_press_required in brakes:
+                air_pressure = find_first_pressure(
+                    lambda p: pressure_passes(data, terms, matrix_key, brake_press_required, p),
+                    air_pressures, reverse
+                )
+                if air_pressure is None:
+                    continue
+                # Nothing depends on the backplate, so the first one in order wins.
+                return make_candidate(
+                    user_entries, reel_model, reel_width, ordered(BACKPLATE_DIAMETER_OPTIONS, reverse)[0],
+                    hold_down_assy, cylinder, brake_model, brake_qty, drives[0], air_pressure
+                )
     return None
 
+def prepare_search(user_entries, reverse=False):
+    """
+    Validate the user entries and evaluate the user-only terms.
+
+    Returns (data, terms, use_exhaustive). use_exhaustive is set when the rewind
+    torque check cannot be compared (motorized reel without an empty-reel torque),
+    so the reference search reproduces its error.
+    """
+    reel_model, reel_width = get_reel_order(reverse)[0]
+    data = tddbhd_input(**make_candidate(
+        user_entries, reel_model, reel_width, ordered(BACKPLATE_DIAMETER_OPTIONS, reverse)[0],
+        ordered(HOLD_DOWN_ASSY_OPTIONS, reverse)[0], ordered(HOLD_DOWN_CYLINDER_OPTIONS, reverse)[0],
+        ordered(BRAKE_MODEL_OPTIONS, reverse)[0], ordered(BRAKE_QUANTITY_OPTIONS, reverse)[0],
+        ordered(HYDRAULIC_THREADING_DRIVE_OPTIONS, reverse)[0], ordered(air_pressures, reverse)[0]
+    ))
+    terms = get_user_terms(data)
+    use_exhaustive = (
+        terms is not None and
+        terms["reel_type"].upper() != "PULLOFF" and
+        data.reel_drive_tqempty is None
+    )
+    return data, terms, use_exhaustive
+
+def get_tddbhd_inputs(user_entries, reverse=False):
+    """
+    Pruned search returning the same configuration as get_tddbhd_inputs_exhaustive.
+
+    Invariant lookups are resolved once per level, subtrees are skipped as soon
+    as a check that does not depend on the inner loop variables fails, and the
+    air pressure is bisected instead of stepped.
+    """
+    data, terms, use_exhaustive = prepare_search(user_entries, reverse)
+    if use_exhaustive:
+        return get_tddbhd_inputs_parallel(user_entries, reverse)
+    if terms is None:
+        return None
+
+    for reel_model, reel_width in get_reel_order(reverse):
+        candidate = search_reel_subtree(user_entries, data, terms, reel_model, reel_width, reverse)
+        if candidate is not None:
+            return tddbhd_input(**candidate)
+    return None
+
+def get_min_tddbhd_inputs(user_entries):
+    return get_tddbhd_inputs(user_entries, reverse=False)
+
 def get_max_tddbhd_inputs(user_entries):
-    # Efficient single-level search for maximum valid combination
-    for reel_model, reel_width in zip(REEL_MODEL_OPTIONS[::-1], REEL_WIDTH_OPTIONS[::-1]):
-        for backplate_diameter in BACKPLATE_DIAMETER_OPTIONS[::-1]:
-            for hold_down_assy in HOLD_DOWN_ASSY_OPTIONS[::-1]:
-                for cylinder in HOLD_DOWN_CYLINDER_OPTIONS[::-1]:
-                    for brake_model in BRAKE_MODEL_OPTIONS[::-1]:
-                        for brake_qty in BRAKE_QUANTITY_OPTIONS[::-1]:
-                            for hyd_threading_drive in HYDRAULIC_THREADING_DRIVE_OPTIONS[::-1]:
-                                for air_pressure in reversed(air_pressures):
-                                    candidate = dict(user_entries)
-                                    candidate.update({
-                                        "reel_model": reel_model,
-                                        "reel_width": reel_width,
-                                        "backplate_diameter": backplate_diameter,
-                                        "air_pressure": air_pressure,
-                                        "brake_qty": brake_qty,
-                                        "brake_model": brake_model,
-                                        "hyd_threading_drive": hyd_threading_drive,
-                                        "cylinder": cylinder,
-                                        "hold_down_assy": hold_down_assy,
-                                    })
-                                    # Early exit: check candidate
-                                    if passes_checks(candidate):
-                                        return tddbhd_input(**candidate)
-    return None
\ No newline at end of file
+    return get_tddbhd_inputs(user_entries, reverse=True)
@@ -0,0 +1,217 @@
+"""
+TDDBHD Pareto Search
+
+Enumerates the reel option space (reel, holddown, cylinder, brake model, brake
+quantity and threading drive) and returns the passing configurations that are
+not dominated under a pluggable cost function, with each one's margin on every
+check.
+"""
+
+import numpy as np
+
+from models import tddbhd_input
+from calculations.tddbhd import (
+    lookup_cylinder_bore, lookup_holddown_matrix_key, lookup_holddown_pressure, lookup_hold_down_force,
+    lookup_min_material_width, lookup_drive_key, lookup_drive_torque,
+    calc_disp_reel_mtr, calc_torque_at_mandrel, calc_brake_press_required, calc_failsafe_holding_force,
+    check_min_material_width, check_rewind_torque, check_torque_required
+)
+from utils.initial.tddbhd_input_finder import (
+    air_pressures, get_reel_order, make_candidate, prepare_search, get_reel_terms
+)
+from utils.shared import (
+    BACKPLATE_DIAMETER_OPTIONS, BRAKE_QUANTITY_OPTIONS, BRAKE_MODEL_OPTIONS, HYDRAULIC_THREADING_DRIVE_OPTIONS,
+    HOLD_DOWN_CYLINDER_OPTIONS, HOLD_DOWN_ASSY_OPTIONS, REEL_MODEL_OPTIONS,
+    NUM_BRAKEPADS, BRAKE_DISTANCE, CYLINDER_ROD
+)
+
+BRAKE_STAGES = {
+    "Single Stage": 1,
+    "Double Stage": 2,
+    "Triple Stage": 3,
+    "Failsafe - Single Stage": 1,
+    "Failsafe - Double Stage": 2,
+}
+
+MAX_AIR_PRESSURE = 120
+
+# --- Cost ---
+def default_cost(config):
+    """
+    Objectives to minimize: reel size, holddown size, threading drive size,
+    brake stage count, brake quantity and air pressure.
+    """
+    return (
+        REEL_MODEL_OPTIONS.index(config["reel_model"]),
+        HOLD_DOWN_ASSY_OPTIONS.index(config["hold_down_assy"]),
+        HYDRAULIC_THREADING_DRIVE_OPTIONS.index(config["hyd_threading_drive"]),
+        BRAKE_STAGES[config["brake_model"]],
+        config["brake_qty"],
+        config["air_pressure"],
+    )
+
+def get_non_dominated(costs, chunk_size=512):
+    """
+    Mask of rows in costs (configurations x objectives) that no other row
+    dominates, i.e. is no worse on every objective and better on at least one.
+    """
+    costs = np.asarray(costs, dtype=float)
+    keep = np.ones(len(costs), dtype=bool)
+    for start in range(0, len(costs), chunk_size):
+        rows = costs[start:start + chunk_size, None, :]
+        no_worse = (costs[None, :, :] <= rows).all(axis=2)
+        better = (costs[None, :, :] < rows).any(axis=2)
+        keep[start:start + chunk_size] = ~(no_worse & better).any(axis=1)
+    return keep
+
+# --- Option space ---
+def get_pressure_force_table(matrix_key, pressures):
+    """Holddown force available at every air pressure for one holddown matrix entry."""
+    return np.array([
+        lookup_hold_down_force(matrix_key, lookup_holddown_pressure(matrix_key, float(p))) for p in pressures
+    ], dtype=float)
+
+def get_drive_options(data: tddbhd_input, terms, reel, reel_model):
+    """Threading drives that pass the rewind torque check, with their margins."""
+    drives = []
+    for hyd_threading_drive in HYDRAULIC_THREADING_DRIVE_OPTIONS:
+        try:
+            drive_torque = lookup_drive_torque(lookup_drive_key(reel_model, terms["air_clutch"], hyd_threading_drive))
+            calc_disp_reel_mtr(hyd_threading_drive)
+            torque_at_mandrel = calc_torque_at_mandrel(terms["reel_type"], drive_torque, data.reel_drive_tqempty)
+        except Exception:
+            continue
+        if check_rewind_torque(reel["rewind_torque"], torque_at_mandrel) == "PASS":
+            drives.append((hyd_threading_drive, torque_at_mandrel - reel["rewind_torque"]))
+    return drives
+
+def get_brake_options(data: tddbhd_input, reel):
+    """Brake models and quantities that pass the torque required check, with their terms."""
+    brakes = []
+    for brake_model in BRAKE_MODEL_OPTIONS:
+        for brake_qty in BRAKE_QUANTITY_OPTIONS:
+            brake_qty = int(brake_qty)
+            try:
+                cylinder_bore = lookup_cylinder_bore(brake_model)
+                brake_press_required = calc_brake_press_required(
+                    reel["torque_required"], data.friction, BRAKE_DISTANCE, NUM_BRAKEPADS,
+                    brake_model, cylinder_bore, CYLINDER_ROD, brake_qty
+                )
+                failsafe_holding_force = calc_failsafe_holding_force(
+                    brake_model, data.friction, NUM_BRAKEPADS, BRAKE_DISTANCE, brake_qty
+                )
+            except Exception:
+                continue
+            if check_torque_required(reel["torque_required"], failsafe_holding_force) != "PASS":
+                continue
+            torque_margin = failsafe_holding_force - reel["torque_required"] if failsafe_holding_force != 0 else float("inf")
+            brakes.append((brake_model, brake_qty, brake_press_required, torque_margin))
+    return brakes
+
+def get_reel_configurations(data: tddbhd_input, terms, reel_model, pressures):
+    """
+    Every passing configuration for one reel model at its lowest passing air
+    pressure. Each holddown's force table is evaluated once and the pressure
+    checks are resolved for all brakes at once.
+    """
+    reel = get_reel_terms(data, terms, reel_model)
+    if reel is None:
+        return []
+    drives = get_drive_options(data, terms, reel, reel_model)
+    brakes = get_brake_options(data, reel)
+    if not drives or not brakes:
+        return []
+
+    brake_press_required = np.array([brake[2] for brake in brakes])
+    brake_ok = brake_press_required[:, None] < pressures[None, :]
+
+    configurations = []
+    for hold_down_assy in HOLD_DOWN_ASSY_OPTIONS:
+        for cylinder in HOLD_DOWN_CYLINDER_OPTIONS:
+            try:
+                matrix_key = lookup_holddown_matrix_key(reel_model, hold_down_assy, cylinder)
+                min_material_width = lookup_min_material_width(matrix_key)
+                force_available = get_pressure_force_table(matrix_key, pressures)
+            except Exception:
+                continue
+            if check_min_material_width(min_material_width, data.width) != "PASS":
+                continue
+
+            passing = brake_ok & (terms["hold_down_force_req"] < force_available)[None, :]
+            has_pressure = passing.any(axis=1)
+            first_pressure = passing.argmax(axis=1)
+
+            for (brake_model, brake_qty, press_required, torque_margin), ok, index in zip(brakes, has_pressure, first_pressure):
+                if not ok:
+                    continue
+                air_pressure = float(pressures[index])
+                for hyd_threading_drive, rewind_margin in drives:
+                    configurations.append({
+                        "reel_model": reel_model,
+                        "hold_down_assy": hold_down_assy,
+                        "cylinder": cylinder,
+                        "brake_model": brake_model,
+                        "brake_qty": brake_qty,
+                        "hyd_threading_drive": hyd_threading_drive,
+                        "air_pressure": air_pressure,
+                        "margins": {
+                            "min_material_width": data.width - min_material_width,
+                            "air_pressure": MAX_AIR_PRESSURE - air_pressure,
+                            "rewind_torque": rewind_margin,
+                            "hold_down_force": float(force_available[index]) - terms["hold_down_force_req"],
+                            "brake_press": air_pressure - press_required,
+                            "torque_required": torque_margin,
+                        },
+                    })
+    return configurations
+
+# --- Main Search ---
+def get_tddbhd_pareto_set(user_entries, cost=default_cost):
+    """
+    Return the non-dominated passing TDDBHD configurations for the user entries.
+
+    cost maps a configuration dict (option fields, air_pressure and margins) to a
+    number or a sequence (tuple, list or array) of numbers to minimize. Each
+    configuration uses the lowest air pressure that passes. Returns a list of
+    dicts with the tddbhd_input, the cost, its objectives as a tuple of floats
+    and the margin on every check, sorted by objectives.
+    """
+    data, terms, use_exhaustive = prepare_search(user_entries)
+    if use_exhaustive:
+        return "ERROR: Reel drive empty torque is required to check rewind torque on a motorized reel."
+    if terms is None:
+        return []
+
+    pressures = np.array([p for p in air_pressures if p <= MAX_AIR_PRESSURE], dtype=float)
+    configurations = []
+    reel_widths = {}
+    for reel_model, reel_width in get_reel_order():
+        reel_widths[reel_model] = reel_width
+        configurations.extend(get_reel_configurations(data, terms, reel_model, pressures))
+    if not configurations:
+        return []
+
+    costs = [cost(config) for config in configurations]
+    # A number, tuple, list or array of numbers becomes one row of objectives
+    objectives = [tuple(float(value) for value in np.atleast_1d(c)) for c in costs]
+    if len({len(objective) for objective in objectives}) != 1:
+        return "ERROR: Cost function must return the same number of objectives for every configuration."
+    keep = get_non_dominated(objectives)
+
+    pareto_set = []
+    for config, config_cost, objective, kept in zip(configurations, costs, objectives, keep):
+        if not kept:
+            continue
+        candidate = make_candidate(
+            user_entries, config["reel_model"], reel_widths[config["reel_model"]], BACKPLATE_DIAMETER_OPTIONS[0],
+            config["hold_down_assy"], config["cylinder"], config["brake_model"], config["brake_qty"],
+            config["hyd_threading_drive"], config["air_pressure"]
+        )
+        pareto_set.append({
+            "inputs": tddbhd_input(**candidate),
+            "cost": config_cost,
+            "margins": config["margins"],
+            "objectives": objective,
+        })
+    pareto_set.sort(key=lambda entry: entry["objectives"])
+    return pareto_set
@@ -3,6 +3,7 @@ Lookup tables for various calculations.
 
 """
 
+import hashlib
 import json
 import os
 
@@ -11,8 +12,12 @@ _BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 _JSON_FILE = os.path.join(_BASE_DIR, "lookup_tables.json")
 
 # Load the JSON file only once at module load time.
-with open(_JSON_FILE, "r") as f:
-    LOOKUP_DATA = json.load(f)
+with open(_JSON_FILE, "rb") as f:
+    _JSON_BYTES = f.read()
+LOOKUP_DATA = json.loads(_JSON_BYTES)
+
+# Changes whenever lookup_tables.json changes; used to key cached results.
+LOOKUP_TABLE_VERSION = hashlib.sha1(_JSON_BYTES).hexdigest()[:12]
 
 # Now extract the individual lookup dictionaries
 #####
@@ -3,23 +3,28 @@ Shared utility functions and constants for RFQ calculations.
 
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 ### File Path for json files
 JSON_FILE_PATH = "./outputs/"
 
 ### Shared States
 @dataclass
-class RFQState:
+class RollStrBackbendState:
     """
-    State for RFQ calculations.
+    State roll str backbend hands to the straightener utility.
     """
-    reference: str = "0000"
-    version: str = "1.0"
-    customer: str = "Default Company"
-    date: str = "2023-01-01"
+    calc_const: float = 10205.2064976266
+    percent_material_yielded: float = 0
+    confirm_check: bool = False
 
-rfq_state = RFQState()
+@dataclass
+class EvaluationContext:
+    """
+    Per-evaluation state carried through the calculation pipeline. Each sheet
+    gets its own context, so sheets can be evaluated concurrently.
+    """
+    roll_str_backbend: RollStrBackbendState = field(default_factory=RollStrBackbendState)
 
 ### CENTRALIZED DEFAULT VALUES ###
 DEFAULTS = {   
@@ -124,6 +129,23 @@ DEFAULTS = {
         'time_for_downward_stroke': 0.0,
         'dwell_time': 0.0,
     },
+
+    # Zig zag defaults
+    'zig_zag': {
+        'material_length_flat': 40.0,
+        'pivot_to_screw': 0.0,
+        'total_load': 750.0,
+        'efficiency': 0.85,
+        'feed_angle': 180.0,
+        'misc_friction_at_motor': 15.0,
+        'lead_screw_o_dia': 2.25,
+        'lead_screw_i_dia': 0.0,
+        'lead_screw_length': 27.0,
+        'lead_screw_density': 0.283,
+        'lead_screw_qty': 1,
+        'min_length': 1.0,
+        'increment': 1.0,
+    },
 }
 
 ### LOOKUPS
@@ -172,6 +194,34 @@ STATIC_FRICTION = 0.5
 # ROLL_STR_BACKBEND
 CREEP_FACTOR = 0.33
 RADIUS_OFF_COIL = -60
+# Straightener roll counts the backbend optimizer and batch evaluate
+ROLL_COUNTS = (7, 9, 11)
+
+# HYD_SHEAR
+# Applied force must exceed the force required to shear by this factor
+HYD_SHEAR_SAFETY_MARGIN = 1.15
+HYD_PRESSURE_OPTIONS = (1000, 1500, 2000, 2500, 3000)
+
+# Standard cylinder bores and the rod diameters offered with each
+HYD_CYLINDER_RODS = {
+        1.5 : (0.625, 1), 2 : (1, 1.375), 2.5 : (1, 1.375, 1.75), 3.25 : (1.375, 1.75, 2),
+        4 : (1.75, 2, 2.5), 5 : (2, 2.5, 3, 3.5), 6 : (2.5, 3, 3.5, 4), 7 : (3, 3.5, 4, 4.5, 5),
+        8 : (3.5, 4, 4.5, 5, 5.5), 10 : (4.5, 5, 5.5), 12 : (5.5, 7), 14 : (7, 8)
+    }
+
+# ZIG_ZAG
+# Servo motor and lead screw the zig-zag feeder is built with
+ZIG_ZAG_MAX_MOTOR_SPEED = 2000
+ZIG_ZAG_MOTOR_INERTIA = 0.0062
+ZIG_ZAG_MOTOR_PEAK_TORQUE = 240
+ZIG_ZAG_MOTOR_RMS_TORQUE = 87
+ZIG_ZAG_MAX_ACCEL_RATE = 7
+ZIG_ZAG_SCREW_LEAD = 1
+ZIG_ZAG_BALL_SCREW = 0
+ZIG_ZAG_SETTLE_TORQUE = 50
+ZIG_ZAG_SETTLE_TIME = 0.045
+ZIG_ZAG_WEIGHT_TO_ACCEL = 1000
+ZIG_ZAG_COEF_OF_FRICTION = 0.1
 
 # REEL_DRIVE
 CHAIN_RATIO = 4
@@ -182,14 +232,6 @@ REDUCER_BACKDRIVING = 0.5
 REDUCER_INERTIA = 0.1
 ACCEL_RATE = 1
 
-### Shared values
-# roll_str_backbend
-roll_str_backbend_state = {
-    "calc_const": 10205.2064976266,
-    "percent_material_yielded": 0,
-    "confirm_check": False
-}
-
 ###
 # Options
 ###
@@ -0,0 +1,12 @@
+"""
+Vectorized Calculation Helpers
+
+Shared by the array versions of the calculations, which must reproduce the
+scalar functions exactly.
+"""
+
+import numpy as np
+
+# np.float_power matches Python's float ** bit for bit; the ** operator on
+# arrays does not, which would shift results away from the scalar functions.
+power = np.float_power